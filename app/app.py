@@ -1,9 +1,181 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import sqlite3
+import pydeck as pdk
+import altair as alt
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from logistics.auth import SessionStore, authenticate, has_permission, session_key
+from logistics.bulk_import import TABLE_COLUMNS, import_records, read_chunks
+from logistics.cache import ReadCache, table_version
+from logistics.changes import latest_seq, refresh_frame
+from logistics.clustering import DETAIL_ZOOM, ClusterIndex, supply_position
+from logistics.domain import (
+    CLEARANCE_LEVELS,
+    LOCATION_KINDS,
+    PERSONNEL_CLASSES,
+    PERSONNEL_STATUSES,
+    SUPPLY_CLASSES,
+    SUPPLY_PRIORITIES,
+    SUPPLY_STATUSES,
+    SUPPLY_TYPES,
+    SUPPLY_UNITS,
+)
+from logistics.events import ChangeBroker
+from logistics.export import EXPORT_FORMATS, export_to_tempfile
+from logistics.forecast import STOCKOUT_HORIZONS, ConsumptionForecast, forecast_metrics, stockout_view
+from logistics.geo import (
+    MAP_REGIONS,
+    MAX_MAP_POINTS,
+    fetch_points,
+    map_version,
+    save_location,
+    viewport_bounds,
+)
+from logistics.history import GRANULARITIES, quantity_trend, utc_now
+from logistics.metrics import SupplyMetrics, breakdown, count_by, supply_metrics
+from logistics.pool import log_pool_event
+from logistics.queries import Page, fetch_page
+from logistics.readiness import READINESS_MEASURES, readiness_cube, readiness_grid
+from logistics.repository import LogisticsRepository, station_unit
+from logistics.schema import SEARCH_COLUMNS, current_version
+from logistics.search import search
+from logistics.snapshot import SnapshotStore, database_id
+from logistics.upsert import UNCHANGED, upsert_record
+from logistics.validation import validate_record
+from logistics.write_queue import WriteQueue, log_write_event
+
+# Longest a form waits for its queued write to commit
+WRITE_TIMEOUT_SECONDS = 30
+
+# How often each open page checks, in memory, for saves it has not drawn yet
+LIVE_REFRESH_SECONDS = 2
+
+# Map marker colors (RGB) by supply status
+STATUS_COLORS = {
+    'Available': [46, 160, 67],
+    'Low Stock': [255, 193, 7],
+    'Out of Stock': [220, 53, 69],
+    'Reserved': [108, 117, 125],
+}
+NO_STOCK_COLOR = [0, 123, 255]
+
+
+@st.cache_resource
+def get_repository():
+    """
+    Return the process-wide repository over the logistics database.
+
+    Personnel and supply share one file, found at ``$LOGISTICS_DB`` or
+    ``logistics.db`` in the app directory (the former personnel.db and
+    supply.db are imported into it on first start).
+    """
+    return LogisticsRepository(metrics_hook=log_pool_event)
+
+
+def get_connection_pool():
+    """Return the logistics database's connection pool."""
+    return get_repository().pool
+
+
+@st.cache_resource
+def get_write_queue():
+    """Return the process-wide group-commit write queue for the logistics database."""
+    return WriteQueue(get_connection_pool(), metrics_hook=log_write_event)
+
+
+def submit_write(fn):
+    """Run ``fn(conn)`` on the database's writer thread and wait for it to commit."""
+    return get_write_queue().submit(fn).result(timeout=WRITE_TIMEOUT_SECONDS)
+
+
+@st.cache_resource
+def get_read_cache():
+    """Return the process-wide cache of table query results."""
+    return ReadCache(max_entries=64)
+
+
+@st.cache_resource
+def get_snapshot_store():
+    """Return the process-wide store of columnar table snapshots."""
+    init_schema()
+    repository = get_repository()
+    with repository.connection() as conn:
+        return SnapshotStore(repository.snapshot_dir, database_id(conn), current_version(conn))
+
+
+@st.cache_resource
+def get_consumption_forecast():
+    """Return the process-wide per-line consumption forecasts."""
+    return ConsumptionForecast()
+
+
+@st.cache_resource
+def get_cluster_index():
+    """Return the process-wide map cluster index."""
+    return ClusterIndex()
+
+
+@st.cache_resource
+def get_change_broker():
+    """Return the process-wide broker of table change events."""
+    return ChangeBroker()
+
+
+def get_subscription():
+    """Return this session's subscription to table change events."""
+    if 'live_subscription' not in st.session_state:
+        st.session_state.live_subscription = get_change_broker().subscribe()
+    return st.session_state.live_subscription
+
+
+# Topics drawn only by the fragment that saves them. A save reruns just that
+# fragment, so for any other topic this session is told too and reruns the
+# map and readiness fragments that also draw it.
+FRAGMENT_LOCAL_TOPICS = frozenset({'readiness'})
+
+
+def publish_change(topic):
+    """Tell open sessions that ``topic`` changed, this one too unless its saving fragment shows it all."""
+    origin = get_subscription().token if topic in FRAGMENT_LOCAL_TOPICS else None
+    get_change_broker().publish(topic, origin=origin)
+
+
+@st.cache_resource
+def get_session_store():
+    """Return the process-wide cache of signed-in sessions."""
+    init_schema()
+    with get_repository().connection() as conn:
+        return SessionStore(session_key(conn))
+
+
+def current_session():
+    """Return this session's signed-in user, or None for a viewer."""
+    token = st.session_state.get('session_token')
+    if not token:
+        return None
+    store = get_session_store()
+    # One primary-key lookup: drops sessions of accounts saved since the last check
+    with get_connection_pool().connection() as conn:
+        store.sync(conn)
+    session = store.resolve(token)
+    if session is None:
+        # Expired, revoked or the account changed: fall back to viewing
+        del st.session_state['session_token']
+    return session
+
+
+def authorized(permission):
+    """Return whether the signed-in user holds ``permission`` (see ``logistics.auth.PERMISSIONS``)."""
+    return has_permission(current_session(), permission)
+
+
+@st.cache_resource
+def init_schema():
+    """Bring the logistics database to the current schema version, once per process."""
+    get_repository().migrate()
+
 
 def main():
     st.set_page_config(
@@ -12,6 +184,17 @@ def main():
         layout="wide"
     )
     
+    # Apply schema migrations (cached: runs once per process)
+    init_schema()
+    
+    # A full run renders everything fresh, so earlier change events are moot
+    get_subscription().catch_up()
+    updated_topics = st.session_state.pop('live_updated_topics', None)
+    if updated_topics:
+        st.toast(f"🔄 Refreshed with the latest changes to {', '.join(sorted(updated_topics))}")
+    
+    render_sign_in()
+    
     # Main header with system purpose
     st.title("🚛 Logistics Common Operating Picture")
     st.markdown("---")
@@ -34,52 +217,217 @@ def main():
     st.header("📍 Logistics Map")
     st.write("View tactical logistics information on the interactive map below.")
     
-    # Create sample logistics data
-    logistics_data = pd.DataFrame({
-        'lat': [40.7128, 34.0522, 41.8781, 29.7604, 33.4484],  # Sample coordinates
-        'lon': [-74.0060, -118.2437, -87.6298, -95.3698, -112.0740],
-        'location': ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix'],
-        'supply_type': ['Ammunition', 'Fuel', 'Medical', 'Food', 'Equipment'],
-        'status': ['Available', 'Low Stock', 'Available', 'Critical', 'Available'],
-        'priority': ['High', 'Medium', 'High', 'Critical', 'Low']
-    })
+    map_fragment()
+    
+    st.markdown("---")
+    
+    # Personnel Update Section
+    st.header("👥 Personnel Management")
+    st.write("Update personnel class information and manage personnel records.")
+    
+    personnel_fragment()
+    
+    st.markdown("---")
+    
+    # Supply Management Section
+    st.header("📦 Supply Management")
+    st.write("Update supply class information and manage supply inventory.")
+    
+    supply_fragment()
+    
+    st.markdown("---")
+    
+    # Readiness Section
+    st.header("🎯 Unit Readiness")
+    st.write("Personnel strength per unit alongside the stock at the location it draws from.")
+    
+    readiness_fragment()
+    
+    render_diagnostics()
+    live_updates_fragment()
+
+def render_sign_in():
+    """Render the sidebar sign-in form, or who is signed in with a sign-out button."""
+    session = current_session()
+    with st.sidebar:
+        if session is not None:
+            st.caption(f"👤 Signed in as **{session.username}** ({session.role})")
+            if st.button("Sign out", key="sign_out"):
+                get_session_store().revoke(st.session_state.pop('session_token'))
+                st.rerun()
+            return
+        
+        with st.form("sign_in_form"):
+            st.caption("Viewing only. Logisticians and admins sign in to make changes.")
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            if st.form_submit_button("Sign in"):
+                # The one password check of the session; later reruns use the cached token
+                with get_connection_pool().connection() as conn:
+                    account = authenticate(conn, username, password)
+                if account is None:
+                    st.error("Invalid username or password")
+                else:
+                    st.session_state['session_token'] = get_session_store().issue(username, *account)
+                    st.rerun()
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_updates_fragment():
+    """Rerun the page once saves, this session's included, have settled; renders nothing."""
+    # Reads only in-memory counters: idle pages never touch the database
+    topics = get_subscription().poll()
+    if topics:
+        st.session_state.live_updated_topics = topics
+        st.rerun()
+
+@st.fragment
+def map_fragment():
+    """Render the logistics map, table and tiles; reruns on its own."""
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        region = st.selectbox("Region", list(MAP_REGIONS), key="map_region")
+    center_lat, center_lon, default_zoom = MAP_REGIONS[region]
+    with col2:
+        zoom = st.slider("Zoom", min_value=1, max_value=12, value=default_zoom, key=f"map_zoom_{region}")
+    
+    # Only points inside the visible area are fetched and rendered
+    viewport = viewport_bounds(center_lat, center_lon, zoom)
+    logistics_data, truncated = get_map_points(viewport)
+    
+    # Zoomed out, draw one marker per grid cluster instead of one per supply line
+    if zoom < DETAIL_ZOOM:
+        clusters = get_map_clusters(zoom, viewport)
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=clusters.assign(color=marker_colors(clusters['worst_status'])),
+            get_position='[lon, lat]',
+            get_fill_color='color',
+            get_radius='items',
+            radius_scale=2000 / zoom,
+            radius_min_pixels=6,
+            radius_max_pixels=40,
+            pickable=True,
+        )
+        tooltip = {"text": "{locations} locations, {items} items\nWorst status: {worst_status}"}
+    else:
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=logistics_data.assign(color=marker_colors(logistics_data['status'])),
+            get_position='[lon, lat]',
+            get_fill_color='color',
+            get_radius=20000 / zoom,
+            radius_min_pixels=4,
+            pickable=True,
+        )
+        tooltip = {"text": "{location} ({kind})\n{supply_type}: {status}"}
     
     # Display the map
-    st.map(
-        logistics_data,
-        latitude='lat',
-        longitude='lon',
-        size=20,
-        color='#FF6B6B'
-    )
+    st.pydeck_chart(pdk.Deck(
+        map_style=None,
+        initial_view_state=pdk.ViewState(latitude=center_lat, longitude=center_lon, zoom=zoom),
+        layers=[layer],
+        tooltip=tooltip,
+    ))
+    if truncated:
+        st.caption(f"Showing the first {MAX_MAP_POINTS:,} points in view. Zoom in to see the rest.")
     
     # Display logistics data table
     st.subheader("Logistics Data")
-    st.dataframe(logistics_data, use_container_width=True)
+    st.dataframe(logistics_data.head(1000), use_container_width=True)
     
     # Add some logistics-specific information
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Locations", len(logistics_data))
+        st.metric("Total Locations", logistics_data['location'].nunique())
+    
+    # Count every value in one pass rather than filtering once per tile
+    status_counts = count_by(logistics_data, 'status')
+    priority_counts = count_by(logistics_data, 'priority')
     
     with col2:
-        available_count = len(logistics_data[logistics_data['status'] == 'Available'])
+        available_count = status_counts.get('Available', 0)
         st.metric("Available Supplies", available_count)
     
     with col3:
-        critical_count = len(logistics_data[logistics_data['status'] == 'Critical'])
+        critical_count = priority_counts.get('Critical', 0)
         st.metric("Critical Alerts", critical_count, delta=f"-{critical_count}" if critical_count > 0 else "0")
     
-    st.markdown("---")
-    
-    # Personnel Update Section
-    st.header("👥 Personnel Management")
-    st.write("Update personnel class information and manage personnel records.")
-    
-    # Initialize database
-    init_database()
+    if authorized('edit_base_info'):
+        render_location_form()
+
+def render_location_form():
+    """Render a small form for adding or moving a depot, cache or convoy."""
+    with st.expander("📌 Add or move a location"):
+        with st.form("location_form"):
+            col1, col2, col3, col4 = st.columns(4)
+            name = col1.text_input("Location Name", help="Matches the supply Storage Location")
+            kind = col2.selectbox("Kind", LOCATION_KINDS)
+            lat = col3.number_input("Latitude", min_value=-90.0, max_value=90.0, value=0.0, format="%.4f")
+            lon = col4.number_input("Longitude", min_value=-180.0, max_value=180.0, value=0.0, format="%.4f")
+            if st.form_submit_button("Save Location"):
+                if not name.strip():
+                    st.error("⚠️ Location Name is required")
+                elif not authorized('edit_base_info'):
+                    st.error("🔒 Only an Admin can change locations")
+                else:
+                    try:
+                        submit_write(lambda conn: save_location(conn, name.strip(), lat, lon, kind))
+                        publish_change('locations')
+                        st.success(f"✅ Saved {name.strip()}")
+                    except Exception as e:
+                        st.error(f"Supply database error: {str(e)}")
+
+def marker_colors(statuses):
+    """Map a series of supply statuses to marker RGB colors."""
+    return statuses.map(STATUS_COLORS).apply(
+        lambda color: color if isinstance(color, list) else NO_STOCK_COLOR
+    )
+
+def get_map_clusters(zoom, viewport):
+    """Return the map clusters inside the viewport, rebuilt only when the data changed elsewhere."""
+    try:
+        index = get_cluster_index()
+        with get_connection_pool().connection() as conn:
+            index.refresh(conn)
+        return index.clusters(zoom, viewport)
+    except Exception as e:
+        st.error(f"Supply database error: {str(e)}")
+        return pd.DataFrame(columns=['lat', 'lon', 'locations', 'items', 'worst_status'])
+
+def get_map_points(viewport):
+    """Retrieve supply points inside the viewport, cached until supply or locations change."""
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                'locations', ('viewport', viewport), map_version(conn),
+                lambda: fetch_points(conn, viewport)
+            )
+    except Exception as e:
+        st.error(f"Supply database error: {str(e)}")
+        return pd.DataFrame(columns=['lat', 'lon', 'location', 'kind', 'supply_type', 'status', 'priority']), False
+
+@st.fragment
+def personnel_fragment():
+    """Render the personnel form and records; a save reruns only this fragment."""
+    if authorized('edit_records'):
+        render_personnel_form()
+        render_bulk_import('personnel')
+    else:
+        st.warning("🔒 Sign in as a Logistician or Admin to add or update personnel records.")
     
+    # Display existing personnel data, one page at a time
+    st.subheader("Current Personnel Records")
+    render_paginated_grid('personnel', {
+        'personnel_class': ("Class", PERSONNEL_CLASSES),
+        'status': ("Status", PERSONNEL_STATUSES),
+        'unit': ("Unit", None),
+    }, "No personnel records found. Add some personnel data using the form above.")
+    render_export('personnel')
+    render_breakdown('personnel', 'personnel_class', "Class")
+
+def render_personnel_form():
+    """Render the personnel form and save a valid submission."""
     # Personnel form
     with st.form("personnel_form"):
         st.subheader("Update Personnel Class")
@@ -91,32 +439,36 @@ def main():
             first_name = st.text_input("First Name", placeholder="Enter first name", help="Required field")
             last_name = st.text_input("Last Name", placeholder="Enter last name", help="Required field")
             personnel_class = st.selectbox("Personnel Class", 
-                                         ["Officer", "Enlisted", "Civilian", "Contractor"], 
+                                         PERSONNEL_CLASSES, 
                                          help="Select personnel class")
         
         with col2:
             rank = st.text_input("Rank", placeholder="Enter rank")
             unit = st.text_input("Unit", placeholder="Enter unit assignment")
             clearance_level = st.selectbox("Clearance Level", 
-                                         ["Unclassified", "Confidential", "Secret", "Top Secret"], 
+                                         CLEARANCE_LEVELS, 
                                          help="Select clearance level")
             status = st.selectbox("Status", 
-                                ["Active", "Inactive", "Reserve", "Retired"], 
+                                PERSONNEL_STATUSES, 
                                 help="Select personnel status")
         
         # Additional information
         notes = st.text_area("Notes", placeholder="Enter additional notes or comments")
         
-        # Form validation
-        validation_errors = []
+        personnel_record = {
+            'personnel_id': personnel_id,
+            'first_name': first_name,
+            'last_name': last_name,
+            'personnel_class': personnel_class,
+            'rank': rank,
+            'unit': unit,
+            'clearance_level': clearance_level,
+            'status': status,
+            'notes': notes,
+        }
         
-        # Required field validation
-        if not personnel_id:
-            validation_errors.append("Personnel ID is required")
-        if not first_name:
-            validation_errors.append("First Name is required")
-        if not last_name:
-            validation_errors.append("Last Name is required")
+        # Form validation (same rules as bulk import)
+        validation_errors = validate_record('personnel', personnel_record)
         
         # Display validation errors
         if validation_errors:
@@ -130,44 +482,48 @@ def main():
             if not validation_errors:
                 # Save to database
                 success = save_personnel_data({
-                    'personnel_id': personnel_id,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'personnel_class': personnel_class,
-                    'rank': rank,
-                    'unit': unit,
-                    'clearance_level': clearance_level,
-                    'status': status,
-                    'notes': notes,
+                    **personnel_record,
                     'updated_at': datetime.now().isoformat()
                 })
                 
-                if success:
+                if success == UNCHANGED:
+                    st.info("ℹ️ No changes to save: the stored personnel record is identical.")
+                elif success:
+                    # The records below render after the save in this same
+                    # fragment run; the map and readiness follow via live updates
                     st.success("✅ Personnel data saved successfully!")
-                    st.rerun()
                 else:
                     st.error("❌ Failed to save personnel data. Please try again.")
             else:
                 st.warning("Please fix the validation errors before submitting.")
-    
-    # Display existing personnel data
-    st.subheader("Current Personnel Records")
-    personnel_data = get_personnel_data()
-    
-    if not personnel_data.empty:
-        st.dataframe(personnel_data, use_container_width=True)
+
+@st.fragment
+def supply_fragment():
+    """Render the supply form, inventory and metrics; a save reruns only this fragment."""
+    if authorized('edit_records'):
+        render_supply_form()
+        render_bulk_import('supply')
     else:
-        st.info("No personnel records found. Add some personnel data using the form above.")
+        st.warning("🔒 Sign in as a Logistician or Admin to add or update supply records.")
     
-    st.markdown("---")
-    
-    # Supply Management Section
-    st.header("📦 Supply Management")
-    st.write("Update supply class information and manage supply inventory.")
-    
-    # Initialize supply database
-    init_supply_database()
+    # Display existing supply data, one page at a time
+    st.subheader("Current Supply Inventory")
+    render_paginated_grid('supply', {
+        'supply_class': ("Class", SUPPLY_CLASSES),
+        'status': ("Status", SUPPLY_STATUSES),
+        'priority': ("Priority", SUPPLY_PRIORITIES),
+        'unit': ("Unit", SUPPLY_UNITS),
+        'location': ("Location", None),
+    }, "No supply records found. Add some supply data using the form above.")
+    render_export('supply')
+    render_breakdown('supply', 'supply_class', "Class")
     
+    supply_metrics_fragment()
+    forecast_fragment()
+    supply_trends_fragment()
+
+def render_supply_form():
+    """Render the supply form and save a valid submission."""
     # Supply form
     with st.form("supply_form"):
         st.subheader("Update Supply Class")
@@ -178,22 +534,22 @@ def main():
             supply_id = st.text_input("Supply ID", placeholder="Enter supply ID", help="Required field")
             supply_name = st.text_input("Supply Name", placeholder="Enter supply name", help="Required field")
             supply_class = st.selectbox("Supply Class", 
-                                      ["Ammunition", "Fuel", "Medical", "Food", "Equipment", "Clothing"], 
+                                      SUPPLY_CLASSES, 
                                       help="Select supply class")
             supply_type = st.selectbox("Supply Type", 
-                                     ["Consumable", "Durable", "Perishable", "Hazardous"], 
+                                     SUPPLY_TYPES, 
                                      help="Select supply type")
         
         with col2:
             quantity = st.number_input("Quantity", min_value=0, value=0, help="Enter quantity in stock")
             unit = st.selectbox("Unit", 
-                              ["Each", "Box", "Pallet", "Gallon", "Pound", "Kilogram"], 
+                              SUPPLY_UNITS, 
                               help="Select unit of measurement")
             status = st.selectbox("Status", 
-                                ["Available", "Low Stock", "Out of Stock", "Reserved"], 
+                                SUPPLY_STATUSES, 
                                 help="Select supply status")
             priority = st.selectbox("Priority", 
-                                  ["Low", "Medium", "High", "Critical"], 
+                                  SUPPLY_PRIORITIES, 
                                   help="Select supply priority")
         
         # Additional information
@@ -201,18 +557,22 @@ def main():
         supplier = st.text_input("Supplier", placeholder="Enter supplier name")
         notes = st.text_area("Supply Notes", placeholder="Enter additional notes or comments")
         
-        # Form validation
-        supply_validation_errors = []
+        supply_record = {
+            'supply_id': supply_id,
+            'supply_name': supply_name,
+            'supply_class': supply_class,
+            'supply_type': supply_type,
+            'quantity': quantity,
+            'unit': unit,
+            'status': status,
+            'priority': priority,
+            'location': location,
+            'supplier': supplier,
+            'notes': notes,
+        }
         
-        # Required field validation
-        if not supply_id:
-            supply_validation_errors.append("Supply ID is required")
-        if not supply_name:
-            supply_validation_errors.append("Supply Name is required")
-        
-        # Quantity validation
-        if quantity < 0:
-            supply_validation_errors.append("Quantity must be non-negative")
+        # Form validation (same rules as bulk import)
+        supply_validation_errors = validate_record('supply', supply_record)
         
         # Display validation errors
         if supply_validation_errors:
@@ -226,192 +586,526 @@ def main():
             if not supply_validation_errors:
                 # Save to supply database
                 success = save_supply_data({
-                    'supply_id': supply_id,
-                    'supply_name': supply_name,
-                    'supply_class': supply_class,
-                    'supply_type': supply_type,
-                    'quantity': quantity,
-                    'unit': unit,
-                    'status': status,
-                    'priority': priority,
-                    'location': location,
-                    'supplier': supplier,
-                    'notes': notes,
+                    **supply_record,
                     'updated_at': datetime.now().isoformat()
                 })
                 
-                if success:
+                if success == UNCHANGED:
+                    st.info("ℹ️ No changes to save: the stored supply record is identical.")
+                elif success:
+                    # The records below render after the save in this same
+                    # fragment run; the map and readiness follow via live updates
                     st.success("✅ Supply data saved successfully!")
-                    st.rerun()
                 else:
                     st.error("❌ Failed to save supply data. Please try again.")
             else:
                 st.warning("Please fix the validation errors before submitting.")
+
+@st.fragment
+def supply_metrics_fragment():
+    """Render the supply metric tiles."""
+    supply_metrics = get_supply_metrics()
     
-    # Display existing supply data
-    st.subheader("Current Supply Inventory")
-    supply_data = get_supply_data()
-    
-    if not supply_data.empty:
-        st.dataframe(supply_data, use_container_width=True)
-        
+    if supply_metrics.total_items:
         # Supply metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_items = len(supply_data)
-            st.metric("Total Items", total_items)
+            st.metric("Total Items", supply_metrics.total_items)
         
         with col2:
-            low_stock_count = len(supply_data[supply_data['status'] == 'Low Stock'])
+            low_stock_count = supply_metrics.low_stock
             st.metric("Low Stock Items", low_stock_count, delta=f"-{low_stock_count}" if low_stock_count > 0 else "0")
         
         with col3:
-            out_of_stock_count = len(supply_data[supply_data['status'] == 'Out of Stock'])
+            out_of_stock_count = supply_metrics.out_of_stock
             st.metric("Out of Stock", out_of_stock_count, delta=f"-{out_of_stock_count}" if out_of_stock_count > 0 else "0")
         
         with col4:
-            critical_count = len(supply_data[supply_data['priority'] == 'Critical'])
+            critical_count = supply_metrics.critical
             st.metric("Critical Items", critical_count, delta=f"-{critical_count}" if critical_count > 0 else "0")
+
+@st.fragment
+def forecast_fragment():
+    """Render the consumption forecast tiles and the projected stock-outs."""
+    forecast = get_forecast()
+    metrics = forecast_metrics(forecast)
+    week, month = STOCKOUT_HORIZONS
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Lines Consuming", metrics.consuming)
+    col2.metric(f"Stock-out ≤ {week} Days", metrics.within_week,
+                delta=f"-{metrics.within_week}" if metrics.within_week > 0 else "0")
+    col3.metric(f"Stock-out ≤ {month} Days", metrics.within_month)
+    col4.metric("Next Stock-out",
+                metrics.next_stockout.strftime("%Y-%m-%d") if metrics.next_stockout is not None else "None")
+    
+    with st.expander("⏳ Projected stock-outs"):
+        horizon = st.selectbox("Running out within", list(STOCKOUT_HORIZONS), index=1,
+                               format_func=lambda days: f"{days} days", key="stockout_horizon")
+        try:
+            with get_connection_pool().connection() as conn:
+                soon = stockout_view(conn, forecast, horizon)
+        except Exception as e:
+            st.error(f"Supply database error: {str(e)}")
+            return
+        if soon.empty:
+            st.info(f"No supply line is projected to run out within {horizon} days.")
+        else:
+            st.dataframe(soon, use_container_width=True, hide_index=True, column_config={
+                'burn_rate': st.column_config.NumberColumn("Burn rate / day", format="%.1f"),
+                'days_of_supply': st.column_config.NumberColumn("Days of supply", format="%.1f"),
+                'stockout_date': st.column_config.DateColumn("Projected stock-out"),
+            })
+
+def get_forecast():
+    """Return the per-line forecasts, recomputing only lines whose history moved on."""
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_consumption_forecast().refresh(conn)
+    except Exception as e:
+        st.error(f"Supply database error: {str(e)}")
+        return get_consumption_forecast().frame
+
+@st.fragment
+def supply_trends_fragment():
+    """Render stock consumed and received over time, from the history rollups."""
+    with st.expander("📈 Supply trends"):
+        col1, col2, col3 = st.columns(3)
+        granularity = col1.selectbox("Granularity", list(reversed(GRANULARITIES)), format_func=str.title,
+                                     key="trend_granularity")
+        days = col2.number_input("Days", min_value=1, max_value=366, value=30, key="trend_days")
+        supply_id = col3.text_input("Supply line", placeholder="Supply ID, or blank for all", key="trend_supply_id").strip()
+        
+        trend = get_supply_trend(granularity, int(days), supply_id or None)
+        if trend.empty:
+            st.info("No supply history in this window yet.")
+            return
+        if supply_id:
+            st.line_chart(trend, x='bucket', y='closing_quantity', y_label="Quantity on hand")
+        st.bar_chart(trend, x='bucket', y=['consumed', 'received'], y_label="Quantity")
+
+def get_supply_trend(granularity, days, supply_id):
+    """Return the supply trend for the last ``days`` days, cached until supply changes."""
+    since = utc_now() - timedelta(days=days - 1)
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                'supply', ('trend', granularity, since.date(), supply_id), table_version(conn, 'supply'),
+                lambda: quantity_trend(conn, granularity, since, supply_id)
+            )
+    except Exception as e:
+        st.error(f"Supply database error: {str(e)}")
+        return pd.DataFrame()
+
+@st.fragment
+def readiness_fragment():
+    """Render the unit station form and the unit readiness table."""
+    if authorized('edit_base_info'):
+        render_station_form()
+    
+    # Rendered after the form so a saved station shows in this same run
+    readiness = get_unit_readiness()
+    if readiness.empty:
+        st.info("No units yet. Units appear here once personnel are assigned to them.")
+    else:
+        st.dataframe(readiness, use_container_width=True, hide_index=True)
+    
+    readiness_heatmap()
+
+def render_station_form():
+    """Render a small form for stationing a unit at a location."""
+    repository = get_repository()
+    with st.expander("🏠 Station a unit at a location"):
+        with st.form("unit_station_form"):
+            col1, col2 = st.columns(2)
+            unit = col1.selectbox("Unit", repository.units())
+            location = col2.selectbox("Location", repository.location_names())
+            if st.form_submit_button("Save Station"):
+                if not unit or not location:
+                    st.error("⚠️ Unit and Location are required")
+                elif not authorized('edit_base_info'):
+                    st.error("🔒 Only an Admin can station units")
+                else:
+                    try:
+                        submit_write(lambda conn: station_unit(conn, unit, location))
+                        publish_change('readiness')
+                        st.success(f"✅ {unit} now draws from {location}")
+                    except Exception as e:
+                        st.error(f"Database error: {str(e)}")
+
+def readiness_heatmap():
+    """Render stationed units against supply classes, coloured by the chosen measure."""
+    cube = get_readiness_cube()
+    if cube.empty:
+        st.info("No readiness cube yet. Station a unit at a location that holds supplies.")
+        return
+    col1, col2 = st.columns(2)
+    measure = col1.selectbox("Heatmap measure", list(READINESS_MEASURES), format_func=READINESS_MEASURES.get,
+                             key="readiness_measure")
+    status = None
+    if measure != 'ready':
+        status = col2.selectbox("Supply status", ["All"] + SUPPLY_STATUSES, key="readiness_status")
+        status = None if status == "All" else status
+    
+    grid = readiness_grid(cube, measure, status)
+    if grid.empty:
+        st.info("No supply lines with this status at any unit's station.")
+        return
+    value_format = ".0%" if measure == 'ready' else ",d"
+    heatmap = alt.Chart(grid).mark_rect().encode(
+        x=alt.X('supply_class:N', title="Supply class"),
+        y=alt.Y('unit:N', title="Unit"),
+        color=alt.Color(f'{measure}:Q', title=READINESS_MEASURES[measure],
+                        scale=alt.Scale(scheme='redyellowgreen' if measure == 'ready' else 'blues')),
+        tooltip=[
+            'unit', 'location', 'supply_class',
+            alt.Tooltip(f'{measure}:Q', title=READINESS_MEASURES[measure], format=value_format),
+            'personnel', 'active_personnel',
+        ],
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+
+def get_readiness_cube():
+    """Return the readiness cube, cached until personnel, supply or stations change."""
+    try:
+        with get_connection_pool().connection() as conn:
+            version = tuple(table_version(conn, t) for t in ('personnel', 'supply', 'unit_stations'))
+            return get_read_cache().get_or_load(
+                'readiness', 'cube', version, lambda: readiness_cube(conn)
+            )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def get_unit_readiness():
+    """Return the unit readiness view, cached until personnel, supply or stations change."""
+    try:
+        with get_connection_pool().connection() as conn:
+            version = tuple(table_version(conn, t) for t in ('personnel', 'supply', 'unit_stations'))
+            return get_read_cache().get_or_load(
+                'readiness', 'units', version, get_repository().unit_readiness
+            )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def render_bulk_import(table):
+    """Render a CSV/Parquet uploader that streams records into a table in chunks."""
+    with st.expander(f"📥 Bulk import {table} records"):
+        uploaded = st.file_uploader(
+            "CSV or Parquet file", type=["csv", "parquet"], key=f"{table}_bulk_upload",
+            help=f"Columns: {', '.join(TABLE_COLUMNS[table])} (optional: updated_at)"
+        )
+        if uploaded is None or not st.button("Import", key=f"{table}_bulk_import_button"):
+            return
+        if not authorized('edit_records'):
+            st.error("🔒 Sign in as a Logistician or Admin to import records.")
+            return
+        
+        progress = st.empty()
+        try:
+            report = import_records(
+                get_connection_pool(), table, read_chunks(uploaded),
+                on_chunk=lambda r: progress.caption(f"{r.rows_read:,} rows read...")
+            )
+        except Exception as e:
+            st.error(f"Import failed: {str(e)}")
+            return
+        finally:
+            get_read_cache().invalidate(table)
+        
+        if report.rows_written:
+            publish_change(table)
+        progress.empty()
+        st.success(
+            f"✅ Imported {report.rows_written:,} of {report.rows_read:,} rows "
+            f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+        )
+        if report.rows_rejected:
+            st.warning(f"{report.rows_rejected:,} rows rejected")
+            st.dataframe(report.rejected, use_container_width=True)
+
+def render_export(table):
+    """Render a download button that streams a full table snapshot when clicked."""
+    with st.expander(f"📤 Export {table} records"):
+        file_format = st.selectbox("Format", list(EXPORT_FORMATS), key=f"{table}_export_format",
+                                   format_func=str.upper)
+        mime, extension = EXPORT_FORMATS[file_format]
+        st.download_button(
+            f"Download {table}.{extension}",
+            # Generated only on click, from a chunked cursor into a spooled temp file
+            data=lambda: export_to_tempfile(get_connection_pool(), table, file_format),
+            file_name=f"{table}.{extension}",
+            mime=mime,
+            key=f"{table}_export_download",
+        )
+
+def render_paginated_grid(table, filter_options, empty_message):
+    """Render one keyset page of a table, with filters and sort order applied in SQL."""
+    searchable = ", ".join(column.replace('_', ' ') for column, _ in SEARCH_COLUMNS[table])
+    text = st.text_input("🔎 Search", key=f"{table}_search", placeholder=f"Search {searchable}").strip()
+    if text:
+        render_search_results(table, text)
+        return
+    
+    filter_columns = st.columns(len(filter_options) + 1)
+    filters = {}
+    for col, (column, (label, options)) in zip(filter_columns, filter_options.items()):
+        with col:
+            if options is None:
+                value = st.text_input(label, key=f"{table}_filter_{column}", placeholder="Any")
+            else:
+                value = st.selectbox(label, ["All"] + options, key=f"{table}_filter_{column}")
+        if value and value != "All":
+            filters[column] = value
+    with filter_columns[-1]:
+        order = st.selectbox("Sort", ["Newest first", "Oldest first"], key=f"{table}_sort")
+    descending = order == "Newest first"
+    
+    # Start again from the first page whenever the filters or sort change
+    cursors_key = f"{table}_page_cursors"
+    signature = (tuple(sorted(filters.items())), descending)
+    if st.session_state.get(f"{table}_page_signature") != signature:
+        st.session_state[f"{table}_page_signature"] = signature
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+    
+    page = get_page(table, filters, cursors[-1], descending)
+    
+    if not page.rows.empty:
+        st.dataframe(page.rows, use_container_width=True)
+    elif filters or len(cursors) > 1:
+        st.info("No records match the selected filters.")
     else:
-        st.info("No supply records found. Add some supply data using the form above.")
-
-def init_database():
-    """Initialize the SQLite database for personnel data."""
-    conn = sqlite3.connect('personnel.db')
-    cursor = conn.cursor()
-    
-    # Create personnel table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS personnel (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            personnel_id TEXT UNIQUE NOT NULL,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            personnel_class TEXT NOT NULL,
-            rank TEXT,
-            unit TEXT,
-            clearance_level TEXT,
-            status TEXT,
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        st.info(empty_message)
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        st.button("◀ Previous", key=f"{table}_prev_page", disabled=len(cursors) == 1,
+                  on_click=lambda: cursors.pop())
+    with col2:
+        st.button("Next ▶", key=f"{table}_next_page", disabled=not page.has_more,
+                  on_click=lambda: cursors.append(page.next_cursor))
+    with col3:
+        st.caption(f"Page {len(cursors)}")
+
+def render_breakdown(table, column, title):
+    """Render a table's records per ``column`` (its class), stacked by status."""
+    with st.expander(f"📊 {table.title()} by {title.lower()} and status"):
+        counts = get_breakdown(table)
+        if counts.empty:
+            st.info(f"No {table} records yet.")
+            return
+        chart = alt.Chart(counts).mark_bar().encode(
+            # Domain order, as grouped, rather than alphabetical
+            x=alt.X(f'{column}:N', title=title, sort=None),
+            y=alt.Y('count:Q', title="Records"),
+            color=alt.Color('status:N', title="Status", sort=None),
+            tooltip=[column, 'status', 'count'],
         )
-    ''')
+        st.altair_chart(chart, use_container_width=True)
+
+def get_breakdown(table):
+    """Return a table's class and status counts from its maintained totals, cached until it changes."""
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                table, 'breakdown', table_version(conn, table),
+                lambda: breakdown(conn, table)
+            )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return pd.DataFrame()
+
+def render_search_results(table, text):
+    """Render one page of search hits, best match first, in place of the filtered grid."""
+    # Start again from the first page whenever the search changes
+    page_key = f"{table}_search_page"
+    if st.session_state.get(f"{table}_search_signature") != text:
+        st.session_state[f"{table}_search_signature"] = text
+        st.session_state[page_key] = 0
+    number = st.session_state[page_key]
     
-    conn.commit()
-    conn.close()
+    page = get_search_page(table, text, number)
+    if page.rows.empty:
+        st.info(f"No {table} records match \"{text}\".")
+    else:
+        # Already in rank order; raw scores mean little to a reader
+        st.dataframe(page.rows.drop(columns='score'), use_container_width=True, hide_index=True)
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        st.button("◀ Previous", key=f"{table}_search_prev", disabled=number == 0,
+                  on_click=lambda: st.session_state.update({page_key: number - 1}))
+    with col2:
+        st.button("Next ▶", key=f"{table}_search_next", disabled=not page.has_more,
+                  on_click=lambda: st.session_state.update({page_key: page.next_cursor}))
+    with col3:
+        st.caption(f"Page {number + 1}, best matches first")
 
-def save_personnel_data(personnel_data):
-    """Save personnel data to the database."""
+def get_search_page(table, text, page):
+    """Retrieve one page of search hits, served from the read cache when unchanged."""
     try:
-        conn = sqlite3.connect('personnel.db')
-        cursor = conn.cursor()
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                table, ('search', text, page), table_version(conn, table),
+                lambda: search(conn, table, text, page)
+            )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return Page(rows=pd.DataFrame(), next_cursor=None, has_more=False)
+
+def get_page(table, filters, cursor, descending):
+    """Retrieve one page of a table, served from the read cache when unchanged."""
+    key = ('page', tuple(sorted(filters.items())), cursor, descending)
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                table, key, table_version(conn, table),
+                lambda: fetch_page(conn, table, filters, cursor, descending)
+            )
+    except Exception as e:
+        st.error(f"Database error: {str(e)}")
+        return Page(rows=pd.DataFrame(), next_cursor=None, has_more=False)
+
+def render_diagnostics():
+    """Show read cache and connection pool counters in the sidebar."""
+    with st.sidebar.expander("⚙️ Diagnostics"):
+        cache_stats = get_read_cache().stats()
+        col1, col2 = st.columns(2)
+        col1.metric("Cache Hits", cache_stats.hits)
+        col2.metric("Cache Misses", cache_stats.misses)
+        st.caption(f"{cache_stats.entries} cached queries, {cache_stats.evictions} evicted")
         
+        pool_stats = get_connection_pool().stats()
+        queue_stats = get_write_queue().stats()
+        st.caption(f"Database: {get_repository().path}")
+        st.caption(
+            f"Pool: {pool_stats.hits} hits, {pool_stats.waits} waits, "
+            f"{pool_stats.lock_retries} lock retries"
+        )
+        st.caption(
+            f"Writes: {queue_stats.depth} queued, {queue_stats.committed} committed "
+            f"in {queue_stats.batches} batches (avg {queue_stats.mean_batch:.1f}), "
+            f"commit {queue_stats.mean_commit_seconds * 1000:.1f}ms avg / "
+            f"{queue_stats.max_commit_seconds * 1000:.1f}ms max"
+        )
+        forecast_stats = get_consumption_forecast().stats
+        st.caption(
+            f"Forecast: {forecast_stats.lines} lines, {forecast_stats.recomputed} recomputed"
+            f"{' (full)' if forecast_stats.full else ''} in {forecast_stats.seconds * 1000:.1f}ms"
+        )
+        session_stats = get_session_store().stats()
+        st.caption(
+            f"Sessions: {session_stats.active} active, {session_stats.cache_hits} cached lookups, "
+            f"{session_stats.signature_checks} signature checks"
+        )
+
+def save_personnel_data(personnel_data):
+    """
+    Save personnel data to the database.
+
+    Returns "inserted", "updated" or "unchanged", or None if the save failed.
+    An existing record keeps its id and created_at, and an identical
+    resubmission writes nothing.
+    """
+    if not authorized('edit_records'):
+        st.error("🔒 Sign in as a Logistician or Admin to save personnel records.")
+        return None
+    try:
         # Insert or update personnel data
-        cursor.execute('''
-            INSERT OR REPLACE INTO personnel 
-            (personnel_id, first_name, last_name, personnel_class, rank, unit, clearance_level, status, notes, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            personnel_data['personnel_id'],
-            personnel_data['first_name'],
-            personnel_data['last_name'],
-            personnel_data['personnel_class'],
-            personnel_data['rank'],
-            personnel_data['unit'],
-            personnel_data['clearance_level'],
-            personnel_data['status'],
-            personnel_data['notes'],
-            personnel_data['updated_at']
-        ))
+        # Queued: concurrent submissions from other sessions share one commit
+        outcome = submit_write(lambda conn: upsert_record(conn, 'personnel', personnel_data))
+        if outcome != UNCHANGED:
+            get_read_cache().invalidate('personnel')
+            publish_change('personnel')
         
-        conn.commit()
-        conn.close()
-        return True
+        return outcome
     except Exception as e:
         st.error(f"Database error: {str(e)}")
-        return False
+        return None
+
+def get_live_frame(table):
+    """
+    Return this session's copy of a table, brought up to date with only the
+    rows changed since its last read.
+    """
+    live_frames = st.session_state.setdefault('live_frames', {})
+    with get_connection_pool().connection() as conn:
+        # Start from the newer of this session's copy and the last shared one
+        candidates = [live_frames.get(table), get_read_cache().peek(table, 'live')]
+        previous = max((c for c in candidates if c is not None), key=lambda c: c.seq, default=None)
+        if previous is None:
+            # Cold process: start from the snapshot on disk rather than a full read
+            previous = get_snapshot_store().load(table)
+        # Sessions at the same change log position share one frame
+        live = get_read_cache().get_or_load(
+            table, 'live', latest_seq(conn),
+            lambda: refresh_frame(conn, previous, table)
+        )
+    get_snapshot_store().save_in_background(live)
+    live_frames[table] = live
+    return live
 
 def get_personnel_data():
     """Retrieve all personnel data from the database."""
     try:
-        conn = sqlite3.connect('personnel.db')
-        df = pd.read_sql_query("SELECT * FROM personnel ORDER BY updated_at DESC", conn)
-        conn.close()
-        return df
+        return get_live_frame('personnel').frame
     except Exception as e:
         st.error(f"Database error: {str(e)}")
         return pd.DataFrame()
 
-def init_supply_database():
-    """Initialize the SQLite database for supply data."""
-    conn = sqlite3.connect('supply.db')
-    cursor = conn.cursor()
-    
-    # Create supply table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS supply (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            supply_id TEXT UNIQUE NOT NULL,
-            supply_name TEXT NOT NULL,
-            supply_class TEXT NOT NULL,
-            supply_type TEXT NOT NULL,
-            quantity INTEGER NOT NULL,
-            unit TEXT NOT NULL,
-            status TEXT NOT NULL,
-            priority TEXT NOT NULL,
-            location TEXT,
-            supplier TEXT,
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+def get_supply_metrics():
+    """Retrieve the supply tile counts from the maintained counter table."""
+    try:
+        with get_connection_pool().connection() as conn:
+            return get_read_cache().get_or_load(
+                'supply', 'metrics', table_version(conn, 'supply'),
+                lambda: supply_metrics(conn)
+            )
+    except Exception as e:
+        st.error(f"Supply database error: {str(e)}")
+        return SupplyMetrics()
 
 def save_supply_data(supply_data):
-    """Save supply data to the database."""
+    """
+    Save supply data to the database.
+
+    Returns "inserted", "updated" or "unchanged", or None if the save failed.
+    An existing record keeps its id and created_at, and an identical
+    resubmission writes nothing.
+    """
+    def write(conn):
+        # Note where the line was so the map clusters can be moved, not rebuilt
+        before = map_version(conn)
+        previous = supply_position(conn, supply_data['supply_id'])
+        outcome = upsert_record(conn, 'supply', supply_data)
+        return outcome, before, previous, map_version(conn)
+    
+    if not authorized('edit_records'):
+        st.error("🔒 Sign in as a Logistician or Admin to save supply records.")
+        return None
     try:
-        conn = sqlite3.connect('supply.db')
-        cursor = conn.cursor()
-        
         # Insert or update supply data
-        cursor.execute('''
-            INSERT OR REPLACE INTO supply 
-            (supply_id, supply_name, supply_class, supply_type, quantity, unit, status, priority, location, supplier, notes, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            supply_data['supply_id'],
-            supply_data['supply_name'],
-            supply_data['supply_class'],
-            supply_data['supply_type'],
-            supply_data['quantity'],
-            supply_data['unit'],
-            supply_data['status'],
-            supply_data['priority'],
-            supply_data['location'],
-            supply_data['supplier'],
-            supply_data['notes'],
-            supply_data['updated_at']
-        ))
+        # Queued: concurrent submissions from other sessions share one commit
+        outcome, before, previous, after = submit_write(write)
+        if outcome != UNCHANGED:
+            get_read_cache().invalidate('supply')
+            publish_change('supply')
+            get_cluster_index().record_change(
+                before, after, previous, (supply_data.get('location'), supply_data.get('status'))
+            )
         
-        conn.commit()
-        conn.close()
-        return True
+        return outcome
     except Exception as e:
         st.error(f"Supply database error: {str(e)}")
-        return False
+        return None
 
 def get_supply_data():
     """Retrieve all supply data from the database."""
     try:
-        conn = sqlite3.connect('supply.db')
-        df = pd.read_sql_query("SELECT * FROM supply ORDER BY updated_at DESC", conn)
-        conn.close()
-        return df
+        return get_live_frame('supply').frame
     except Exception as e:
         st.error(f"Supply database error: {str(e)}")
         return pd.DataFrame()
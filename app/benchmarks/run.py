@@ -0,0 +1,285 @@
+"""
+Benchmark the data-access and rendering paths at several dataset sizes.
+
+For each size a fresh database is generated in a temporary
+directory and the app's own functions are timed against it: single-record
+saves, full-table reads (cold, from a snapshot and cached), page reads, metric tiles and a
+complete ``AppTest`` script run. Results are written as JSON so runs from
+different commits can be compared::
+
+    python -m benchmarks.run                       # 1k, 100k and 1M rows
+    python -m benchmarks.run --sizes 1000 --repeat 3
+    python -m benchmarks.run --compare benchmarks/results/<earlier>.json
+
+Run from the ``app`` directory.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import secrets
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+
+def measure(fn, repeat, setup=None):
+    """Call ``fn`` ``repeat`` times and return the wall-clock seconds of each call."""
+    timings = []
+    for i in range(repeat):
+        if setup is not None:
+            setup(i)
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def measure_calls(fn, repeat):
+    """Call ``fn(i)`` for ``i`` in ``range(repeat)`` and return the seconds of each call."""
+    timings = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(timings):
+    """Reduce raw timings to the statistics stored in the results file."""
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max": ordered[-1],
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _supply_record(i, quantity=1):
+    return {
+        "supply_id": f"BENCH-{i}", "supply_name": "Benchmark item", "supply_class": "Fuel",
+        "supply_type": "Consumable", "quantity": quantity, "unit": "Gallon",
+        "status": "Available", "priority": "Medium", "location": "Depot 000",
+        "supplier": "", "notes": "", "updated_at": datetime.now().isoformat(),
+    }
+
+
+def _personnel_record(i, rank="E-4"):
+    return {
+        "personnel_id": f"BENCH-{i}", "first_name": "Bench", "last_name": "Mark",
+        "personnel_class": "Enlisted", "rank": rank, "unit": "Unit 000",
+        "clearance_level": "Secret", "status": "Active", "notes": "",
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def run_size(size, repeat, app_runs):
+    """Generate a dataset of ``size`` rows per table and time every path against it."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import app
+    from benchmarks.datasets import load_frame, personnel_frame, supply_frame
+    from logistics.auth import save_user
+    from logistics.queries import fetch_page
+    from logistics.repository import DB_PATH_ENV, station_unit
+    from logistics.search import search
+
+    results = {}
+    previous_db = os.environ.get(DB_PATH_ENV)
+    with tempfile.TemporaryDirectory() as scratch:
+        # Point the app (and the AppTest run below) at a scratch database
+        os.environ[DB_PATH_ENV] = str(Path(scratch) / "logistics.db")
+        st.cache_resource.clear()
+        try:
+            app.init_schema()
+            pool = app.get_connection_pool()
+            cache = app.get_read_cache()
+            snapshots = app.get_snapshot_store()
+            # After its first write a table is not snapshotted again unless asked
+            snapshots.interval = float("inf")
+            # Saves are only accepted from a signed-in editor with an account
+            app.get_repository().transaction(lambda conn: save_user(conn, "benchmark", secrets.token_hex(16), "Admin"))
+            st.session_state["session_token"] = app.get_session_store().issue("benchmark", "Admin")
+
+            started = time.perf_counter()
+            load_frame(pool, "supply", supply_frame(size))
+            load_frame(pool, "personnel", personnel_frame(size))
+            results["load_dataset"] = summarize([time.perf_counter() - started])
+
+            results["save_supply_data_insert"] = summarize(measure_calls(
+                lambda i: app.save_supply_data(_supply_record(i)), repeat))
+            results["save_supply_data_update"] = summarize(measure_calls(
+                lambda i: app.save_supply_data(_supply_record(0, quantity=i + 2)), repeat))
+            results["save_supply_data_unchanged"] = summarize(measure_calls(
+                lambda i: app.save_supply_data(_supply_record(0, quantity=repeat + 1)), repeat))
+            def burst(i, threads=8, per_thread=10):
+                with ThreadPoolExecutor(threads) as executor:
+                    list(executor.map(
+                        lambda n: app.save_supply_data(_supply_record(f"BURST-{i}-{n}")),
+                        range(threads * per_thread),
+                    ))
+
+            # 80 saves from 8 threads at once: exercises group commit
+            results["save_supply_data_burst_80"] = summarize(measure_calls(burst, max(1, repeat // 4)))
+            results["save_personnel_data_insert"] = summarize(measure_calls(
+                lambda i: app.save_personnel_data(_personnel_record(i)), repeat))
+            # A rejected save is fast too; make sure the timings above are of real writes
+            with pool.connection() as conn:
+                saved = conn.execute(
+                    "SELECT COUNT(*) FROM supply WHERE supply_id LIKE 'BENCH-%' OR supply_id LIKE 'BURST-%'"
+                ).fetchone()[0]
+            expected = repeat + max(1, repeat // 4) * 80
+            if saved != expected:
+                raise RuntimeError(f"Benchmark saves wrote {saved} supply rows, expected {expected}")
+
+            def forget(table, keep_snapshot=False):
+                cache.invalidate(table)
+                st.session_state.setdefault("live_frames", {}).pop(table, None)
+                if not keep_snapshot:
+                    snapshots.flush()
+                    snapshots.path(table).unlink(missing_ok=True)
+
+            results["get_supply_data_cold"] = summarize(measure(
+                app.get_supply_data, repeat, setup=lambda i: forget("supply")))
+            snapshots.save(app.get_live_frame("supply"))
+            results["get_supply_data_snapshot"] = summarize(measure(
+                app.get_supply_data, repeat, setup=lambda i: forget("supply", keep_snapshot=True)))
+            results["get_supply_data_cached"] = summarize(measure(app.get_supply_data, repeat))
+            results["get_supply_data_after_save"] = summarize(measure(
+                app.get_supply_data, repeat,
+                setup=lambda i: app.save_supply_data(_supply_record(0, quantity=repeat + i + 2))))
+            results["get_personnel_data_cold"] = summarize(measure(
+                app.get_personnel_data, repeat, setup=lambda i: forget("personnel")))
+            results["get_personnel_data_cached"] = summarize(measure(app.get_personnel_data, repeat))
+
+            def first_page(filters):
+                with pool.connection() as conn:
+                    return fetch_page(conn, "supply", filters)
+
+            results["supply_page_first"] = summarize(measure(lambda: first_page({}), repeat))
+            results["supply_page_filtered"] = summarize(measure(
+                lambda: first_page({"status": "Low Stock", "priority": "Critical"}), repeat))
+            results["supply_metrics_cold"] = summarize(measure(
+                app.get_supply_metrics, repeat, setup=lambda i: cache.invalidate("supply")))
+            def search_page(text):
+                with pool.connection() as conn:
+                    return search(conn, "supply", text)
+
+            # A word in every row, one in a quarter of them, and one exact line
+            results["supply_search_common"] = summarize(measure(lambda: search_page("item"), repeat))
+            results["supply_search_broad"] = summarize(measure(lambda: search_page("acme depot 04"), repeat))
+            results["supply_search_exact"] = summarize(measure(lambda: search_page("S-0000123"), repeat))
+            pool.transaction(lambda conn: station_unit(conn, "Unit 000", "Depot 000"))
+            results["readiness_cube_cold"] = summarize(measure(
+                app.get_readiness_cube, repeat, setup=lambda i: cache.invalidate("readiness")))
+
+            app_test = AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=600)
+            results["app_run"] = summarize(measure(app_test.run, app_runs))
+            if app_test.exception:
+                raise RuntimeError(f"App raised during benchmark: {app_test.exception}")
+        finally:
+            st.cache_resource.clear()
+            if previous_db is None:
+                os.environ.pop(DB_PATH_ENV, None)
+            else:
+                os.environ[DB_PATH_ENV] = previous_db
+    return results
+
+
+def compare(current, baseline, threshold):
+    """Print median ratios against a baseline; return the regressions beyond ``threshold``."""
+    regressions = []
+    for size, benchmarks in current["results"].items():
+        base_benchmarks = baseline["results"].get(size, {})
+        for name, stats in benchmarks.items():
+            base = base_benchmarks.get(name)
+            if not base or not base["median"]:
+                continue
+            ratio = stats["median"] / base["median"]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((size, name, ratio))
+            print(f"{size:>9} {name:<30} {base['median'] * 1000:10.2f}ms -> "
+                  f"{stats['median'] * 1000:10.2f}ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the Logistics COP data paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per micro-benchmark")
+    parser.add_argument("--app-runs", type=int, default=3, help="Timed full AppTest runs per size")
+    parser.add_argument("-o", "--output", help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Median slowdown counted as a regression (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    # Importing the app outside `streamlit run` logs runtime warnings
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    sys.path.insert(0, str(APP_DIR))
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size:,} rows...", file=sys.stderr)
+        report["results"][str(size)] = run_size(size, args.repeat, args.app_runs)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {output}", file=sys.stderr)
+
+    for size, benchmarks in report["results"].items():
+        for name, stats in benchmarks.items():
+            print(f"{size:>9} {name:<30} median {stats['median'] * 1000:10.2f}ms  "
+                  f"p95 {stats['p95'] * 1000:10.2f}ms")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nCompared with {baseline.get('commit')} ({args.compare}):")
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Data-access and support modules for the Logistics COP Streamlit app."""
@@ -0,0 +1,315 @@
+"""
+User accounts, password hashing and signed, cached sessions.
+
+The README's access matrix has three roles. Anyone may look at the maps,
+grids and charts without signing in, as a Viewer; a Logistician may also
+save personnel and supply records; an Admin may also change base
+information (locations and unit stations). ``PERMISSIONS`` encodes that
+matrix and ``has_permission`` answers it for a session.
+
+Accounts live in the ``users`` table. Passwords are stored as scrypt
+hashes, which cost tens of milliseconds and 16 MiB each by design, so a
+stolen table is slow to attack. ``python -m logistics.auth`` adds an
+account or resets its password and role.
+
+Signing in is the only time a hash is computed. It yields a token holding
+the username, role, expiry and the account's generation, HMAC-signed with
+the database's random ``session_key`` (shared by every replica), which the
+Streamlit session keeps. ``SessionStore`` caches each token it has seen,
+so the many reruns of a session resolve it with one dictionary lookup. A
+token the process has not seen, for instance after a restart or from
+another replica, is checked by its signature. Signing out ends that
+session in this process.
+
+Saving an account bumps its generation, and the ``users`` entry in
+``table_versions`` with it. ``SessionStore.sync`` reads that version (one
+primary-key lookup, done on every rerun) and, when it has moved, reloads
+each account's generation and drops sessions issued for an older one. So
+a password reset or role change made from the command line, in another
+process, ends the account's sessions in every replica on their next
+rerun, and a restarted process does not accept them either.
+"""
+
+import argparse
+import base64
+import getpass
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from logistics.cache import table_version
+from logistics.domain import USER_ROLES
+
+# Permission -> roles holding it, from the README's access matrix
+PERMISSIONS = {
+    "edit_records": ("Logistician", "Admin"),
+    "edit_base_info": ("Admin",),
+}
+
+# scrypt cost: 128 * r * n bytes (16 MiB) of memory per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_MAXMEM = 64 * 1024 * 1024
+
+SESSION_SECONDS = 12 * 60 * 60
+
+SESSION_KEY_QUERY = "SELECT value FROM database_info WHERE key = 'session_key'"
+USER_QUERY = "SELECT password_hash, role, generation FROM users WHERE username = ?"
+GENERATIONS_QUERY = "SELECT username, generation FROM users"
+SAVE_USER_STATEMENT = '''
+    INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)
+    ON CONFLICT (username) DO UPDATE SET
+        password_hash = excluded.password_hash, role = excluded.role,
+        generation = users.generation + 1, updated_at = CURRENT_TIMESTAMP
+'''
+
+
+@dataclass(frozen=True)
+class Session:
+    """A signed-in user, as read from a verified session token."""
+
+    username: str
+    role: str
+    issued_at: float
+    expires_at: float
+    generation: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class SessionStats:
+    """Counters showing how sessions were resolved."""
+
+    active: int = 0
+    cache_hits: int = 0
+    signature_checks: int = 0
+    rejected: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def has_permission(session, permission):
+    """Return whether ``session`` (None when signed out) holds ``permission``."""
+    return session is not None and session.role in PERMISSIONS[permission]
+
+
+def normalize_username(username):
+    """Return the stored form of ``username``: trimmed and lowercase."""
+    return (username or "").strip().lower()
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=SCRYPT_MAXMEM, dklen=32)
+
+
+def hash_password(password):
+    """Return an encoded scrypt hash of ``password`` with a random salt and its cost parameters."""
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, encoded):
+    """Return whether ``password`` matches a hash from ``hash_password``."""
+    try:
+        scheme, n, r, p, salt, digest = encoded.split("$")
+        if scheme != "scrypt":
+            return False
+        candidate = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate, bytes.fromhex(digest))
+
+
+# Checked against when the username is unknown, so a miss takes as long as a hit
+_UNKNOWN_USER_HASH = hash_password(secrets.token_hex(16))
+
+
+def save_user(conn, username, password, role):
+    """Create the account ``username`` or reset its password and role."""
+    username = normalize_username(username)
+    if not username:
+        raise ValueError("Username is required")
+    if role not in USER_ROLES:
+        raise ValueError(f"Unknown role: {role}")
+    if not password:
+        raise ValueError("Password is required")
+    conn.execute(SAVE_USER_STATEMENT, (username, hash_password(password), role))
+    return username
+
+
+def authenticate(conn, username, password):
+    """Return ``(role, generation)`` of ``username`` if ``password`` is theirs, else None."""
+    row = conn.execute(USER_QUERY, (normalize_username(username),)).fetchone()
+    if row is None:
+        verify_password(password or "", _UNKNOWN_USER_HASH)
+        return None
+    return (row[1], row[2]) if verify_password(password or "", row[0]) else None
+
+
+def session_key(conn):
+    """Return the database's session signing key."""
+    return bytes.fromhex(conn.execute(SESSION_KEY_QUERY).fetchone()[0])
+
+
+def _encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SessionStore:
+    """
+    Issues session tokens and resolves them to ``Session`` objects.
+
+    ``key`` signs the tokens; ``clock`` returns the current Unix time.
+    """
+
+    def __init__(self, key, ttl_seconds=SESSION_SECONDS, clock=time.time):
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._sessions = {}
+        self._revoked = {}
+        self._generations = None
+        self._users_version = None
+        self._lock = threading.Lock()
+        self._stats = SessionStats()
+
+    def _sign(self, payload):
+        return _encode(hmac.new(self.key, payload.encode(), hashlib.sha256).digest())
+
+    def sync(self, conn):
+        """
+        Re-check cached sessions against the accounts in ``conn`` if any changed.
+
+        Costs one primary-key lookup when no account was saved since the
+        last call; otherwise reloads every account's generation and drops
+        the sessions issued for an older one, or for a removed account.
+        """
+        version = table_version(conn, "users")
+        with self._lock:
+            if self._generations is not None and version == self._users_version:
+                return
+        generations = dict(conn.execute(GENERATIONS_QUERY).fetchall())
+        with self._lock:
+            self._generations = generations
+            self._users_version = version
+            for token in [t for t, s in self._sessions.items() if not self._current(s)]:
+                del self._sessions[token]
+
+    def _current(self, session):
+        return self._generations is None or self._generations.get(session.username) == session.generation
+
+    def issue(self, username, role, generation=0):
+        """Return a new signed token for ``username`` in ``role`` at account ``generation``."""
+        now = self.clock()
+        session = Session(normalize_username(username), role, now, now + self.ttl_seconds, generation)
+        payload = _encode(json.dumps({
+            "u": session.username, "r": session.role, "iat": session.issued_at,
+            "exp": session.expires_at, "g": session.generation, "n": secrets.token_hex(8),
+        }).encode())
+        token = f"{payload}.{self._sign(payload)}"
+        with self._lock:
+            self._prune(now)
+            self._sessions[token] = session
+        return token
+
+    def resolve(self, token):
+        """Return the ``Session`` for ``token``, or None if it is forged, expired, revoked or stale."""
+        if not token:
+            return None
+        now = self.clock()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None:
+                if session.expires_at > now and self._current(session):
+                    self._stats.cache_hits += 1
+                    return session
+                del self._sessions[token]
+                self._stats.rejected += 1
+                return None
+
+        session = self._verify(token, now)
+        with self._lock:
+            self._stats.signature_checks += 1
+            if session is not None and (token in self._revoked or not self._current(session)):
+                session = None
+            if session is None:
+                self._stats.rejected += 1
+                return None
+            self._sessions[token] = session
+        return session
+
+    def _verify(self, token, now):
+        payload, _, signature = token.partition(".")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            claims = json.loads(_decode(payload))
+            session = Session(claims["u"], claims["r"], claims["iat"], claims["exp"], claims["g"])
+        except (ValueError, KeyError, TypeError):
+            return None
+        return session if session.expires_at > now else None
+
+    def revoke(self, token):
+        """End the session for ``token`` (signing out)."""
+        with self._lock:
+            session = self._sessions.pop(token, None)
+            self._revoked[token] = session.expires_at if session else self.clock() + self.ttl_seconds
+
+    def _prune(self, now):
+        for store, expiry in ((self._sessions, lambda s: s.expires_at), (self._revoked, lambda e: e)):
+            for token in [t for t, value in store.items() if expiry(value) <= now]:
+                del store[token]
+
+    def stats(self):
+        """Return a snapshot of the session counters."""
+        with self._lock:
+            self._stats.active = len(self._sessions)
+            return SessionStats(**self._stats.as_dict())
+
+
+def main(argv=None):
+    """Command line entry point: create an account or reset its password and role."""
+    from logistics.repository import LogisticsRepository
+
+    parser = argparse.ArgumentParser(description="Create a user or reset their password and role.")
+    parser.add_argument("username")
+    parser.add_argument("--role", choices=USER_ROLES, default="Logistician")
+    parser.add_argument("--db", help="Logistics database path or URL (default: $LOGISTICS_DB or app/logistics.db)")
+    args = parser.parse_args(argv)
+
+    if sys.stdin.isatty():
+        password = getpass.getpass("Password: ")
+        if password != getpass.getpass("Repeat password: "):
+            parser.error("passwords do not match")
+    else:
+        password = sys.stdin.readline().rstrip("\n")
+
+    repository = LogisticsRepository(args.db)
+    try:
+        repository.migrate()
+        username = repository.transaction(lambda conn: save_user(conn, args.username, password, args.role))
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        repository.close()
+    print(f"Saved {username} as {args.role}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+What the data modules need from a storage backend, and how it is chosen.
+
+Every reader and writer in ``logistics`` works against a pool with
+``connection()``, ``transaction(fn)``, ``stats()``, ``close()`` and a
+display ``path``, whose connections offer ``execute``, ``executemany`` and
+``in_transaction`` and accept SQLite's ``?``/``:name`` parameter styles.
+Two backends implement that:
+
+* SQLite (``pool.ConnectionPool``): one file on local disk, one app node.
+* PostgreSQL (``postgres.PostgresPool``): one shared server, so several app
+  replicas can run behind a load balancer.
+
+The few operations that differ between engines (loading a DataFrame,
+catalog lookups, streaming a large result, full-text search) go through the
+helpers below. A
+connection that needs its own implementation defines a method of the same
+name, which the helper calls instead of the SQLite default.
+"""
+
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 10000
+
+POSTGRES_SCHEMES = ("postgres://", "postgresql://")
+
+# The newest matches first: FTS5 walks its posting lists in rowid order,
+# so this stops after ``limit`` hits however many rows match
+FULL_TEXT_QUERY = "SELECT rowid FROM {index} WHERE {index} MATCH ? ORDER BY rowid DESC LIMIT ?"
+
+
+def is_database_url(location):
+    """Return True if ``location`` names a PostgreSQL server rather than a file."""
+    return str(location).startswith(POSTGRES_SCHEMES)
+
+
+def read_frame(conn, sql, params=None):
+    """Run a query and return its rows as a DataFrame."""
+    own = getattr(conn, "read_frame", None)
+    if own is not None:
+        return own(sql, params)
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def table_exists(conn, table):
+    """Return True if ``table`` exists."""
+    own = getattr(conn, "table_exists", None)
+    if own is not None:
+        return own(table)
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def table_columns(conn, table):
+    """Return ``[(name, declared_type), ...]`` for ``table`` in column order."""
+    own = getattr(conn, "table_columns", None)
+    if own is not None:
+        return own(table)
+    return [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def serialize_migrations(conn):
+    """
+    Make concurrent ``migrate`` calls take turns, inside the migration's transaction.
+
+    SQLite's ``BEGIN IMMEDIATE`` already admits one writer at a time.
+    """
+    own = getattr(conn, "serialize_migrations", None)
+    if own is not None:
+        own()
+
+
+def stream_rows(conn, sql, params=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield ``(columns, rows)`` for a query in chunks of at most ``chunk_size`` rows.
+
+    Only one chunk is held in memory at a time; on PostgreSQL the rows stay
+    on the server behind a named cursor until fetched.
+    """
+    own = getattr(conn, "stream_rows", None)
+    if own is not None:
+        yield from own(sql, params, chunk_size)
+        return
+    cursor = conn.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield columns, rows
+    finally:
+        cursor.close()
+
+
+def full_text_matches(conn, table, terms, limit):
+    """
+    Return the ids of the newest ``limit`` rows of ``table`` matching every term.
+
+    Every term but the last must match a whole word; the last may be the
+    start of one, so results follow the user as they type. Searches the
+    ``{table}_search`` index (see ``schema.index_full_text``).
+    """
+    own = getattr(conn, "full_text_matches", None)
+    if own is not None:
+        return own(table, terms, limit)
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    expression = " AND ".join(quoted) + "*"
+    sql = FULL_TEXT_QUERY.format(index=f"{table}_search")
+    return [row[0] for row in conn.execute(sql, (expression, limit))]
@@ -0,0 +1,176 @@
+"""
+Bulk import of personnel and supply records from CSV or Parquet.
+
+Files are streamed in chunks: each chunk is validated with the same rules as
+the entry forms (vectorized, see ``validation.validate_frame``) and its valid
+rows are upserted with one ``executemany`` inside one transaction; rows
+identical to what is already stored are counted but not rewritten. Rejected
+rows are counted and a bounded sample is kept for the report.
+
+Command line usage::
+
+    python -m logistics.bulk_import supply inventory.csv --db logistics.db
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+from logistics.domain import PERSONNEL_COLUMNS, SUPPLY_COLUMNS
+from logistics.upsert import upsert_many
+from logistics.validation import validate_frame
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pq = None
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REJECTED_SAMPLE = 1000
+
+TABLE_COLUMNS = {
+    "personnel": PERSONNEL_COLUMNS,
+    "supply": SUPPLY_COLUMNS,
+}
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one bulk import."""
+
+    table: str
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_unchanged: int = 0
+    rows_rejected: int = 0
+    seconds: float = 0.0
+    rejected: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+def read_chunks(source, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield DataFrame chunks from a CSV or Parquet path or file object.
+
+    CSV values are read as text so identifiers keep leading zeros; numbers
+    are converted during validation.
+    """
+    if file_format is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+        file_format = "parquet" if str(name).lower().endswith(".parquet") else "csv"
+
+    if file_format == "csv":
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    elif file_format == "parquet":
+        if pq is None:
+            raise RuntimeError("Parquet import requires pyarrow")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+
+def _records_for_upsert(table, valid, imported_at):
+    frame = pd.DataFrame(index=valid.index)
+    for column in TABLE_COLUMNS[table]:
+        frame[column] = valid[column] if column in valid else None
+    if "quantity" in frame:
+        frame["quantity"] = pd.to_numeric(frame["quantity"]).astype("int64")
+    if "updated_at" in valid:
+        stamps = valid["updated_at"].astype(object)
+        blank = stamps.isna() | (stamps.astype(str).str.strip() == "")
+        frame["updated_at"] = stamps.where(~blank, imported_at).astype(str)
+    else:
+        frame["updated_at"] = imported_at
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict("records")
+
+
+def import_records(pool, table, chunks, on_chunk=None):
+    """
+    Validate and write ``chunks`` of ``table`` records, one transaction per chunk.
+
+    ``on_chunk(report)`` is called after every chunk so callers can show
+    progress. Returns the final ``ImportReport``.
+    """
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+
+    imported_at = datetime.now().isoformat()
+    report = ImportReport(table=table)
+    rejected_samples = []
+    started = time.perf_counter()
+
+    for chunk in chunks:
+        # Keep 1-based data row numbers so rejects can be traced to the file
+        chunk.index = pd.RangeIndex(report.rows_read + 1, report.rows_read + 1 + len(chunk))
+        valid, rejected = validate_frame(table, chunk)
+
+        records = _records_for_upsert(table, valid, imported_at)
+        written = pool.transaction(lambda conn: upsert_many(conn, table, records)) if records else 0
+
+        report.rows_read += len(chunk)
+        report.rows_written += written
+        report.rows_unchanged += len(records) - written
+        report.rows_rejected += len(rejected)
+        kept = sum(len(sample) for sample in rejected_samples)
+        if not rejected.empty and kept < MAX_REJECTED_SAMPLE:
+            rejected_samples.append(rejected.iloc[:MAX_REJECTED_SAMPLE - kept])
+        report.seconds = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(report)
+
+    if rejected_samples:
+        report.rejected = pd.concat(rejected_samples).rename_axis("row_number").reset_index()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None):
+    """Command line entry point."""
+    from logistics.repository import DB_PATH_ENV, LogisticsRepository
+
+    parser = argparse.ArgumentParser(description="Bulk import personnel or supply records.")
+    parser.add_argument("table", choices=sorted(TABLE_COLUMNS))
+    parser.add_argument("path", help="CSV or Parquet file to import")
+    parser.add_argument("--db", help=f"Logistics database file or postgresql:// URL (default: ${DB_PATH_ENV} or app/logistics.db)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Override format detection")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    repository = LogisticsRepository(args.db)
+    repository.migrate()
+
+    def progress(report):
+        print(
+            f"\r{report.rows_read} rows read, {report.rows_rejected} rejected "
+            f"({report.rows_per_second:,.0f} rows/s)",
+            end="", file=sys.stderr,
+        )
+
+    report = import_records(
+        repository.pool, args.table, read_chunks(args.path, args.format, args.chunk_size),
+        on_chunk=progress,
+    )
+    repository.close()
+    print(file=sys.stderr)
+    print(
+        f"Imported {report.rows_written} of {report.rows_read} {args.table} rows in "
+        f"{report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s); "
+        f"{report.rows_unchanged} unchanged, {report.rows_rejected} rejected"
+    )
+    if not report.rejected.empty:
+        print(report.rejected.head(20).to_string(index=False))
+    return 1 if report.rows_rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Version-keyed read cache for table queries.
+
+Query results are cached together with the table version they were read at
+(see ``schema.track_table_version``). A lookup first reads the current version,
+a single primary-key row, and only re-runs the query when the table has
+changed since. Entries are bounded and evicted least-recently-used.
+
+Cached values are shared between sessions and must be treated as read-only.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class CacheStats:
+    """Counters describing read cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+TABLE_VERSION_QUERY = "SELECT version FROM table_versions WHERE table_name = ?"
+
+
+def table_version(conn, table):
+    """Return the change counter for ``table``, or None if it is not tracked."""
+    row = conn.execute(TABLE_VERSION_QUERY, (table,)).fetchone()
+    return row[0] if row else None
+
+
+class ReadCache:
+    """A bounded LRU cache of query results keyed by table, query key and version."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get_or_load(self, table, key, version, loader):
+        """
+        Return the cached result for ``(table, key)`` at ``version``.
+
+        On a miss ``loader()`` is called and its result stored. A ``version``
+        of None disables caching for the call.
+        """
+        cache_key = (table, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and version is not None and entry[0] == version:
+                self._entries.move_to_end(cache_key)
+                self._stats.hits += 1
+                return entry[1]
+            self._stats.misses += 1
+
+        value = loader()
+        if version is None:
+            return value
+
+        with self._lock:
+            self._entries[cache_key] = (version, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return value
+
+    def peek(self, table, key):
+        """Return the cached result for ``(table, key)`` at whatever version it was stored, or None."""
+        with self._lock:
+            entry = self._entries.get((table, key))
+        return entry[1] if entry is not None else None
+
+    def invalidate(self, table=None):
+        """Drop cached results for ``table``, or for every table."""
+        with self._lock:
+            stale = [k for k in self._entries if table is None or k[0] == table]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            self._stats.invalidations += 1
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            snapshot = CacheStats(**self._stats.as_dict())
+            snapshot.entries = len(self._entries)
+        return snapshot
@@ -0,0 +1,118 @@
+"""
+Incremental table reads from the trigger-maintained change log.
+
+``schema.track_changes`` appends the id of every inserted, updated or
+deleted row to ``change_log`` under a monotonic ``seq``. A ``LiveFrame``
+remembers the ``seq`` its rows were read at; refreshing it fetches only the
+log entries after that point and re-reads just those rows by primary key,
+so the database work per refresh is proportional to the number of changes,
+not to the table size.
+
+A full reload happens only on the first read, when the reader has fallen
+behind the log's retention window, or when more than ``max_changes`` rows
+changed (a bulk import), where one sequential read is cheaper.
+
+``get_live_frame`` in ``app.py`` reads whole tables this way for
+``get_personnel_data`` and ``get_supply_data``: after a save, only the saved
+rows are read again. The page itself reads pages and maintained totals.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from logistics.backend import read_frame
+from logistics.frames import apply_dtypes, concat_frames
+from logistics.pool import read_snapshot
+from logistics.queries import all_rows_query
+
+MAX_CHANGES = 5000
+
+LATEST_SEQ_QUERY = "SELECT COALESCE(MAX(seq), 0) FROM change_log"
+OLDEST_SEQ_QUERY = "SELECT MIN(seq) FROM change_log"
+CHANGES_SINCE_QUERY = (
+    "SELECT seq, row_id, op FROM change_log WHERE table_name = ? AND seq > ? ORDER BY seq LIMIT ?"
+)
+
+# Rows re-read per statement, below SQLite's default host parameter limit
+_ID_BATCH = 500
+
+
+@dataclass(frozen=True)
+class LiveFrame:
+    """A table's rows as of change log position ``seq``; ``frame`` is read-only."""
+
+    table: str
+    seq: int
+    frame: pd.DataFrame
+
+
+def latest_seq(conn):
+    """Return the newest change log position, 0 for an empty log."""
+    return conn.execute(LATEST_SEQ_QUERY).fetchone()[0]
+
+
+def rows_by_id_query(table, count):
+    """Return the query re-reading ``count`` rows of ``table`` by id."""
+    return f"SELECT * FROM {table} WHERE id IN ({', '.join('?' * count)})"
+
+
+def load_frame(conn, table):
+    """Read every row of ``table`` together with the log position it reflects."""
+    with read_snapshot(conn):
+        seq = latest_seq(conn)
+        frame = read_frame(conn, all_rows_query(table))
+    return LiveFrame(table, seq, apply_dtypes(frame, table))
+
+
+def _merge(frame, changed_ids, fresh):
+    kept = frame[~frame["id"].isin(changed_ids)] if len(frame) else frame
+    if fresh.empty:
+        return kept.reset_index(drop=True)
+    fresh = fresh.sort_values("updated_at", ascending=False, kind="stable")
+    # Edits normally carry the newest timestamps and belong on top, which
+    # keeps updated_at DESC order without re-sorting the whole frame
+    if kept.empty or fresh["updated_at"].iloc[-1] >= kept["updated_at"].iloc[0]:
+        return concat_frames([fresh, kept])
+    return (
+        concat_frames([fresh, kept])
+        .sort_values("updated_at", ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def refresh_frame(conn, live, table=None, max_changes=MAX_CHANGES):
+    """
+    Bring ``live`` up to the newest change log position.
+
+    Returns ``live`` itself when nothing changed, and a new ``LiveFrame``
+    otherwise; ``live`` may be None for a first read of ``table``.
+    """
+    if live is None:
+        return load_frame(conn, table)
+
+    with read_snapshot(conn):
+        oldest = conn.execute(OLDEST_SEQ_QUERY).fetchone()[0]
+        if oldest is not None and live.seq < oldest - 1:
+            # Entries this reader needs were pruned
+            return load_frame(conn, live.table)
+        changes = conn.execute(
+            CHANGES_SINCE_QUERY, (live.table, live.seq, max_changes + 1)
+        ).fetchall()
+        if not changes:
+            return live
+        if len(changes) > max_changes:
+            return load_frame(conn, live.table)
+
+        seq = latest_seq(conn)
+        changed_ids = list(dict.fromkeys(row_id for _, row_id, _ in changes))
+        batches = [
+            read_frame(conn, rows_by_id_query(live.table, len(batch)), batch)
+            for batch in (
+                changed_ids[i:i + _ID_BATCH] for i in range(0, len(changed_ids), _ID_BATCH)
+            )
+        ]
+    # Deleted rows are simply absent from the re-read
+    fresh = pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+    fresh = apply_dtypes(fresh, live.table)
+    return LiveFrame(live.table, seq, _merge(live.frame, changed_ids, fresh))
@@ -0,0 +1,175 @@
+"""
+Server-side point clustering for the logistics map.
+
+Below ``DETAIL_ZOOM`` the map draws one marker per grid cell instead of one
+per supply line. Locations are snapped to a square grid whose cells are
+about ``CELL_PX`` screen pixels wide at the requested zoom, and each cell
+carries its location count, supply line count per status and the worst
+status present. However many points exist, a viewport therefore holds at
+most a few hundred markers.
+
+``ClusterIndex`` builds each zoom tier on first use with NumPy and keeps it
+in memory, stamped with the ``(supply, locations)`` table versions it was
+built at. A supply save made through the app is applied to every built tier
+as a per-cell delta (see ``record_change``); any other change moves the
+table versions on and the next read rebuilds from the database.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from logistics.backend import read_frame
+from logistics.geo import map_version
+from logistics.pool import read_snapshot
+
+DETAIL_ZOOM = 10
+MIN_ZOOM = 0
+CELL_PX = 64
+
+# Supply statuses from best to worst; a cluster reports the worst it contains
+CLUSTER_STATUSES = ("Available", "Reserved", "Low Stock", "Out of Stock")
+
+LOCATION_COORDS_QUERY = "SELECT name, lat, lon FROM locations"
+# Summed from the trigger-maintained totals (see ``schema.READINESS_TOTALS``):
+# a row per location, class and status rather than per supply line
+LOCATION_STATUS_COUNTS_QUERY = '''
+    SELECT location, status, CAST(SUM(count) AS BIGINT) AS lines
+    FROM supply_totals
+    GROUP BY location, status
+'''
+SUPPLY_POSITION_QUERY = "SELECT location, status FROM supply WHERE supply_id = ?"
+
+# Per-location feature columns: location count, lat sum, lon sum, then one per status
+_STATUS_OFFSET = 3
+
+
+def cell_size(zoom):
+    """Return the grid cell width in degrees for a zoom level."""
+    return 360.0 * CELL_PX / (256 * 2 ** zoom)
+
+
+def grid_cells(lat, lon, size):
+    """Return the grid cell key of each coordinate for cells ``size`` degrees wide."""
+    rows = np.floor((np.asarray(lat, dtype=float) + 90.0) / size).astype(np.int64)
+    cols = np.floor((np.asarray(lon, dtype=float) + 180.0) / size).astype(np.int64)
+    return rows * (int(360.0 / size) + 2) + cols
+
+
+def supply_position(conn, supply_id):
+    """Return the stored ``(location, status)`` of a supply line, or None."""
+    return conn.execute(SUPPLY_POSITION_QUERY, (supply_id,)).fetchone()
+
+
+class ClusterIndex:
+    """Per-zoom grid clusters of the supply locations, updated incrementally."""
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.Lock()
+        self._names = pd.Index([])
+        self._features = np.zeros((0, _STATUS_OFFSET + len(CLUSTER_STATUSES)))
+        self._tiers = {}
+
+    def refresh(self, conn):
+        """Rebuild from ``conn`` unless the index is already at the current table versions."""
+        with read_snapshot(conn):
+            version = map_version(conn)
+            if version == self.version:
+                return
+            locations = read_frame(conn, LOCATION_COORDS_QUERY)
+            counts = read_frame(conn, LOCATION_STATUS_COUNTS_QUERY)
+        self._load(version, locations, counts)
+
+    def _load(self, version, locations, counts):
+        names = pd.Index(locations["name"])
+        features = np.zeros((len(names), _STATUS_OFFSET + len(CLUSTER_STATUSES)))
+        features[:, 0] = 1
+        features[:, 1] = locations["lat"].to_numpy(dtype=float)
+        features[:, 2] = locations["lon"].to_numpy(dtype=float)
+        rows = names.get_indexer(counts["location"])
+        columns = pd.Index(CLUSTER_STATUSES).get_indexer(counts["status"])
+        known = (rows >= 0) & (columns >= 0)
+        np.add.at(
+            features,
+            (rows[known], columns[known] + _STATUS_OFFSET),
+            counts["lines"].to_numpy(dtype=float)[known],
+        )
+        with self._lock:
+            self.version = version
+            self._names = names
+            self._features = features
+            self._tiers = {}
+
+    def _tier(self, zoom):
+        tier = self._tiers.get(zoom)
+        if tier is None:
+            keys = grid_cells(self._features[:, 1], self._features[:, 2], cell_size(zoom))
+            cells, inverse = np.unique(keys, return_inverse=True)
+            sums = np.column_stack([
+                np.bincount(inverse, weights=self._features[:, column], minlength=len(cells))
+                for column in range(self._features.shape[1])
+            ]) if len(cells) else np.zeros((0, self._features.shape[1]))
+            tier = self._tiers[zoom] = (inverse, sums)
+        return tier
+
+    def clusters(self, zoom, viewport=None):
+        """
+        Return one row per grid cell at ``zoom``, optionally only those inside ``viewport``.
+
+        Columns: ``lat``/``lon`` (mean of the cell's locations), ``locations``,
+        ``items`` (supply lines), one count per status and ``worst_status``
+        (empty when the cell holds no supply lines).
+        """
+        zoom = max(MIN_ZOOM, min(int(zoom), DETAIL_ZOOM - 1))
+        with self._lock:
+            _, sums = self._tier(zoom)
+            sums = sums.copy()
+        by_status = sums[:, _STATUS_OFFSET:]
+        present = by_status > 0
+        # Index of the last (worst) status present; -1 when the cell has none
+        worst = np.where(
+            present.any(axis=1), len(CLUSTER_STATUSES) - 1 - np.argmax(present[:, ::-1], axis=1), -1
+        )
+        frame = pd.DataFrame({
+            "lat": sums[:, 1] / np.maximum(sums[:, 0], 1),
+            "lon": sums[:, 2] / np.maximum(sums[:, 0], 1),
+            "locations": sums[:, 0].astype(int),
+            "items": by_status.sum(axis=1).astype(int),
+        })
+        for position, status in enumerate(CLUSTER_STATUSES):
+            frame[status] = by_status[:, position].astype(int)
+        frame["worst_status"] = np.array(("",) + CLUSTER_STATUSES, dtype=object)[worst + 1]
+        if viewport is not None:
+            inside = np.zeros(len(frame), dtype=bool)
+            for south, west, north, east in viewport.boxes():
+                inside |= frame["lat"].between(south, north) & frame["lon"].between(west, east)
+            frame = frame[inside].reset_index(drop=True)
+        return frame
+
+    def record_change(self, from_version, to_version, old, new):
+        """
+        Apply one supply line moving from ``old`` to ``new`` ``(location, status)``.
+
+        Either side may be None (insert or delete). The delta is applied only
+        if the index is at ``from_version``, the versions read inside the
+        write transaction; otherwise the index is left stale and the next
+        ``refresh`` rebuilds it.
+        """
+        with self._lock:
+            if self.version is None or self.version != from_version:
+                return False
+            for position, delta in ((old, -1), (new, 1)):
+                if position is None:
+                    continue
+                location, status = position
+                row = self._names.get_indexer([location])[0]
+                if row < 0 or status not in CLUSTER_STATUSES:
+                    continue
+                column = _STATUS_OFFSET + CLUSTER_STATUSES.index(status)
+                self._features[row, column] += delta
+                for inverse, sums in self._tiers.values():
+                    sums[inverse[row], column] += delta
+            self.version = to_version
+            return True
@@ -0,0 +1,28 @@
+"""
+Fixed value lists shared by the forms, filters and validation.
+"""
+
+PERSONNEL_CLASSES = ["Officer", "Enlisted", "Civilian", "Contractor"]
+CLEARANCE_LEVELS = ["Unclassified", "Confidential", "Secret", "Top Secret"]
+PERSONNEL_STATUSES = ["Active", "Inactive", "Reserve", "Retired"]
+
+SUPPLY_CLASSES = ["Ammunition", "Fuel", "Medical", "Food", "Equipment", "Clothing"]
+SUPPLY_TYPES = ["Consumable", "Durable", "Perishable", "Hazardous"]
+SUPPLY_UNITS = ["Each", "Box", "Pallet", "Gallon", "Pound", "Kilogram"]
+SUPPLY_STATUSES = ["Available", "Low Stock", "Out of Stock", "Reserved"]
+SUPPLY_PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+LOCATION_KINDS = ["Depot", "Cache", "Convoy"]
+
+# Least to most privileged, as in the README's access matrix
+USER_ROLES = ["Viewer", "Logistician", "Admin"]
+
+# Columns written by the forms and bulk import, in table order
+PERSONNEL_COLUMNS = (
+    "personnel_id", "first_name", "last_name", "personnel_class", "rank", "unit",
+    "clearance_level", "status", "notes",
+)
+SUPPLY_COLUMNS = (
+    "supply_id", "supply_name", "supply_class", "supply_type", "quantity", "unit",
+    "status", "priority", "location", "supplier", "notes",
+)
@@ -0,0 +1,124 @@
+"""
+In-process publish/subscribe of table changes for live dashboards.
+
+Writers call ``ChangeBroker.publish(topic)`` after a committed save; each
+open session holds a ``Subscription`` and asks it, on a short timer, which
+topics changed since it last rendered. The check reads only in-memory
+counters, so any number of idle dashboards cost nothing on the database.
+
+Bursts are debounced: a topic is reported once it has been quiet for
+``debounce`` seconds, or at the latest ``max_delay`` seconds after its first
+unseen change, so a bulk edit produces one refresh, not hundreds.
+
+A save reruns only the fragment that made it, so the saving session is
+usually told of its own change too: other fragments drawing the topic are
+still stale. A publisher passes ``origin`` only when its own session
+already shows everything the change affects; that subscription then skips
+the event.
+
+Only writes made through this process are published. Writes from other
+processes (such as the bulk import CLI) show up on the next interaction,
+through the table versions.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+DEBOUNCE_SECONDS = 1.0
+MAX_DELAY_SECONDS = 5.0
+MAX_EVENTS = 1000
+
+_tokens = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One published change."""
+
+    seq: int
+    topic: str
+    origin: object
+    published_at: float
+
+
+class ChangeBroker:
+    """A bounded, thread-safe log of change events shared by every session."""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._seq = 0
+
+    @property
+    def seq(self):
+        """The sequence number of the latest event, 0 before any."""
+        return self._seq
+
+    def publish(self, topic, origin=None, now=None):
+        """Record a change to ``topic``; ``origin`` names a subscription that need not be told."""
+        with self._lock:
+            self._seq += 1
+            event = ChangeEvent(self._seq, topic, origin, time.monotonic() if now is None else now)
+            self._events.append(event)
+        return event
+
+    def events_since(self, seq):
+        """
+        Return ``(events, complete)`` for events after ``seq``.
+
+        ``complete`` is False when older events were dropped from the log.
+        """
+        with self._lock:
+            events = [event for event in self._events if event.seq > seq]
+            oldest = self._events[0].seq if self._events else self._seq + 1
+        return events, seq >= oldest - 1
+
+    def subscribe(self):
+        """Return a subscription that starts at the current event."""
+        return Subscription(self)
+
+
+class Subscription:
+    """One session's position in the broker's event log."""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.token = next(_tokens)
+        self.seen = broker.seq
+
+    def catch_up(self):
+        """Mark everything published so far as seen (the session is re-rendering anyway)."""
+        self.seen = self.broker.seq
+
+    def poll(self, topics=None, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS, now=None):
+        """
+        Return the set of changed topics that are due for a refresh.
+
+        Returns an empty set while changes are still arriving within the
+        debounce window; once due, all pending topics are returned together
+        and marked seen. ``topics`` limits which topics are of interest. A
+        subscription that fell behind the bounded log gets ``topics`` (or
+        ``{"*"}``), meaning refresh everything.
+        """
+        now = time.monotonic() if now is None else now
+        events, complete = self.broker.events_since(self.seen)
+        if not complete:
+            self.seen = self.broker.seq
+            return set(topics or ()) or {"*"}
+        pending = [
+            event for event in events
+            if event.origin != self.token and (topics is None or event.topic in topics)
+        ]
+        if not pending:
+            if events:
+                self.seen = events[-1].seq
+            return set()
+        quiet = now - pending[-1].published_at >= debounce
+        overdue = now - pending[0].published_at >= max_delay
+        if not (quiet or overdue):
+            return set()
+        self.seen = events[-1].seq
+        return {event.topic for event in pending}
@@ -0,0 +1,140 @@
+"""
+Streaming export of the personnel and supply tables.
+
+Rows are pulled from a database cursor in chunks and written out one
+fixed-size chunk at a time as CSV, JSON Lines or Parquet, so memory use is
+bounded by the chunk size rather than the table size.
+
+Command line usage::
+
+    python -m logistics.export supply --format parquet --db logistics.db -o supply.parquet
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = pq = None
+
+from logistics.backend import stream_rows, table_columns
+
+DEFAULT_CHUNK_SIZE = 10000
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORTABLE_TABLES = ("personnel", "supply")
+
+
+def iter_chunks(conn, table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield ``(columns, rows)`` for ``table`` in chunks of at most ``chunk_size`` rows."""
+    if table not in EXPORTABLE_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    yield from stream_rows(conn, f"SELECT * FROM {table} ORDER BY id", chunk_size=chunk_size)
+
+
+def _arrow_schema(conn, table):
+    fields = []
+    for name, declared_type in table_columns(conn, table):
+        # SQLite's INTEGER and PostgreSQL's bigint both hold the integer columns
+        arrow_type = pa.int64() if "INT" in declared_type.upper() else pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def export_table(pool, table, file_format, out, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write ``table`` to the binary file object ``out`` and return the row count.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+
+    written = 0
+    with pool.connection() as conn:
+        if file_format == "parquet":
+            if pq is None:
+                raise RuntimeError("Parquet export requires pyarrow")
+            schema = _arrow_schema(conn, table)
+            with pq.ParquetWriter(out, schema) as writer:
+                for columns, rows in iter_chunks(conn, table, chunk_size):
+                    arrays = [
+                        pa.array(values, type=schema.field(name).type)
+                        for name, values in zip(columns, zip(*rows))
+                    ]
+                    writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                    written += len(rows)
+            return written
+
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+        try:
+            header_written = False
+            for columns, rows in iter_chunks(conn, table, chunk_size):
+                if file_format == "csv":
+                    writer = csv.writer(text)
+                    if not header_written:
+                        writer.writerow(columns)
+                        header_written = True
+                    writer.writerows(rows)
+                else:
+                    text.writelines(
+                        json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows
+                    )
+                written += len(rows)
+            if file_format == "csv" and not header_written:
+                csv.writer(text).writerow(
+                    [name for name, _ in table_columns(conn, table)]
+                )
+            text.flush()
+        finally:
+            # Leave ``out`` open for the caller
+            text.detach()
+    return written
+
+
+def export_to_tempfile(pool, table, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Export into a spooled temporary file (spills to disk past 8 MB), rewound for reading."""
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    export_table(pool, table, file_format, spool, chunk_size)
+    spool.seek(0)
+    return spool
+
+
+def main(argv=None):
+    """Command line entry point."""
+    from logistics.repository import DB_PATH_ENV, LogisticsRepository
+
+    parser = argparse.ArgumentParser(description="Export personnel or supply records.")
+    parser.add_argument("table", choices=EXPORTABLE_TABLES)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--db", help=f"Logistics database file or postgresql:// URL (default: ${DB_PATH_ENV} or app/logistics.db)")
+    parser.add_argument("-o", "--output", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    repository = LogisticsRepository(args.db)
+    pool = repository.pool
+    try:
+        if args.output == "-":
+            written = export_table(pool, args.table, args.format, sys.stdout.buffer, args.chunk_size)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, "wb") as out:
+                written = export_table(pool, args.table, args.format, out, args.chunk_size)
+    finally:
+        pool.close()
+    print(f"Exported {written} {args.table} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Burn rates, days of supply and projected stock-outs for every supply line.
+
+A line's burn rate is its daily consumption over the last ``window_days``
+days, as ``logistics.history.burn_rates`` reads it from the
+``supply_history_daily`` rollup, weighted so that each ``half_life_days``
+halves the weight of older days: a line that started drawing down this week
+shows up at once, and a surge a month ago fades out. Days of supply is
+the quantity on hand divided by the burn rate, and the projected stock-out
+date follows from it. Lines with no consumption in the window never run
+out and are left out.
+
+``burn_rates`` has the database weigh and sum each line's rollup rows, so
+one row of totals per line reaches Python instead of one per line and day
+(converting rows, not the arithmetic, was the cost). ``ConsumptionForecast``
+adds the quantities on hand of the lines that consumed anything, computes
+days of supply and dates for all of them at once with NumPy and keeps the
+result in memory. Later
+refreshes read only the history appended since (``supply_history.id`` is
+monotonic) and recompute just the lines it touches, found by reading the
+new events in id order. The whole inventory is recomputed only on the first
+refresh, when the window moves on to a new day, or after a bulk change:
+more than ``max_changes`` lines touched, or ``EVENTS_PER_CHANGE`` times that
+many events appended.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from logistics.backend import read_frame
+from logistics.history import burn_rates, utc_now
+from logistics.pool import read_snapshot
+
+WINDOW_DAYS = 30
+HALF_LIFE_DAYS = 7.0
+MAX_CHANGES = 5000
+# History events read per touched line allowed before a refresh counts as a bulk change
+EVENTS_PER_CHANGE = 4
+STOCKOUT_HORIZONS = (7, 30)
+
+LATEST_HISTORY_QUERY = "SELECT COALESCE(MAX(id), 0) FROM supply_history"
+# A range of the rowid, in order: DISTINCT here would walk the supply_id index instead
+TOUCHED_LINES_QUERY = "SELECT supply_id FROM supply_history WHERE id > ? ORDER BY id LIMIT ?"
+LINE_QUANTITY_QUERY = "SELECT supply_id, quantity FROM supply WHERE supply_id IN ({})"
+LINE_DETAILS_QUERY = "SELECT supply_id, supply_name, unit, location, priority FROM supply WHERE supply_id IN ({})"
+
+FORECAST_COLUMNS = ("quantity", "consumed", "burn_rate", "days_of_supply", "stockout_date")
+
+# Lines re-read per statement, below SQLite's default host parameter limit
+_ID_BATCH = 500
+
+
+@dataclass(frozen=True)
+class ForecastStats:
+    """What the last refresh did."""
+
+    lines: int = 0
+    recomputed: int = 0
+    full: bool = False
+    seconds: float = 0.0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ForecastMetrics:
+    """Counts shown in the forecast metric tiles."""
+
+    consuming: int = 0
+    within_week: int = 0
+    within_month: int = 0
+    next_stockout: object = None
+
+
+def _empty_forecast():
+    frame = pd.DataFrame({
+        "quantity": pd.Series(dtype="int64"),
+        "consumed": pd.Series(dtype="int64"),
+        "burn_rate": pd.Series(dtype=float),
+        "days_of_supply": pd.Series(dtype=float),
+        "stockout_date": pd.Series(dtype="datetime64[s]"),
+    })
+    frame.index.name = "supply_id"
+    return frame
+
+
+def _batches(ids):
+    return (ids[i:i + _ID_BATCH] for i in range(0, len(ids), _ID_BATCH))
+
+
+def consuming_lines(conn, rates):
+    """
+    Return the lines of ``rates`` (``burn_rates`` output) that consumed anything, with ``quantity``.
+
+    Lines deleted since are dropped.
+    """
+    rates = rates[rates["consumed"] > 0]
+    ids = rates["supply_id"].tolist()
+    if not ids:
+        return rates.assign(quantity=pd.Series(dtype="int64"))
+    quantities = pd.concat([
+        read_frame(conn, LINE_QUANTITY_QUERY.format(", ".join("?" * len(batch))), batch)
+        for batch in _batches(ids)
+    ], ignore_index=True)
+    return rates.merge(quantities, on="supply_id")
+
+
+def forecast_lines(lines, today):
+    """
+    Forecast every line in ``lines`` (``consuming_lines`` output) at once.
+
+    Returns a frame indexed by ``supply_id`` with ``FORECAST_COLUMNS``.
+    """
+    if lines.empty:
+        return _empty_forecast()
+    burn_rate = lines["burn_rate"].to_numpy(dtype=float)
+    quantity = lines["quantity"].to_numpy(dtype=float)
+    days_of_supply = np.maximum(quantity, 0) / burn_rate
+    return pd.DataFrame({
+        "quantity": lines["quantity"].to_numpy(dtype="int64"),
+        "consumed": lines["consumed"].to_numpy(dtype="int64"),
+        "burn_rate": burn_rate,
+        "days_of_supply": days_of_supply,
+        "stockout_date": np.datetime64(today, "s") + (days_of_supply * 86400).astype("timedelta64[s]"),
+    }, index=pd.Index(lines["supply_id"], name="supply_id"))
+
+
+class ConsumptionForecast:
+    """Per-line consumption forecasts, refreshed incrementally from the supply history."""
+
+    def __init__(self, window_days=WINDOW_DAYS, half_life_days=HALF_LIFE_DAYS, max_changes=MAX_CHANGES):
+        self.window_days = window_days
+        self.half_life_days = half_life_days
+        self.max_changes = max_changes
+        self.history_id = None
+        self.today = None
+        self.stats = ForecastStats()
+        self._lock = threading.Lock()
+        self._frame = _empty_forecast()
+
+    @property
+    def frame(self):
+        """The current forecasts; treat as read-only."""
+        return self._frame
+
+    def _forecast(self, conn, now, supply_ids=None):
+        rates = burn_rates(conn, self.window_days, now, self.half_life_days, supply_ids)
+        return forecast_lines(consuming_lines(conn, rates), now.date())
+
+    def refresh(self, conn, now=None):
+        """Bring the forecasts up to the newest history, recomputing only touched lines."""
+        started = time.perf_counter()
+        now = now or utc_now()
+        today = now.date()
+        with self._lock, read_snapshot(conn):
+            history_id = conn.execute(LATEST_HISTORY_QUERY).fetchone()[0]
+            if history_id == self.history_id and today == self.today:
+                return self._frame
+            touched = None
+            if today == self.today:
+                limit = self.max_changes * EVENTS_PER_CHANGE
+                events = conn.execute(TOUCHED_LINES_QUERY, (self.history_id, limit + 1)).fetchall()
+                touched = list(dict.fromkeys(row[0] for row in events))
+                if len(events) > limit or len(touched) > self.max_changes:
+                    touched = None
+
+            if touched is None:
+                frame = self._forecast(conn, now)
+            else:
+                kept = self._frame[~self._frame.index.isin(touched)]
+                fresh = [self._forecast(conn, now, batch) for batch in _batches(touched)]
+                frame = pd.concat([kept] + [part for part in fresh if len(part)])
+
+            self._frame = frame
+            self.history_id = history_id
+            self.today = today
+            self.stats = ForecastStats(
+                lines=len(frame),
+                recomputed=len(frame) if touched is None else len(touched),
+                full=touched is None,
+                seconds=time.perf_counter() - started,
+            )
+        return frame
+
+
+def stockouts(forecast, within_days):
+    """Return the forecast lines projected to run out within ``within_days``, soonest first."""
+    soon = forecast[forecast["days_of_supply"] <= within_days]
+    return soon.sort_values("days_of_supply", kind="stable")
+
+
+def stockout_view(conn, forecast, within_days, limit=100):
+    """
+    Return the lines running out within ``within_days`` with their names and locations.
+
+    At most ``limit`` lines, soonest first; details are read for just those lines.
+    """
+    soon = stockouts(forecast, within_days).head(limit)
+    if soon.empty:
+        return soon.reset_index()
+    ids = list(soon.index)
+    details = read_frame(conn, LINE_DETAILS_QUERY.format(", ".join("?" * len(ids))), ids)
+    return soon.reset_index().merge(details, on="supply_id", how="left")[[
+        "supply_id", "supply_name", "location", "priority", "quantity", "unit",
+        "burn_rate", "days_of_supply", "stockout_date",
+    ]]
+
+
+def forecast_metrics(forecast):
+    """Summarize the forecasts for the metric tiles."""
+    if forecast.empty:
+        return ForecastMetrics()
+    days = forecast["days_of_supply"].to_numpy()
+    week, month = STOCKOUT_HORIZONS
+    return ForecastMetrics(
+        consuming=len(forecast),
+        within_week=int((days <= week).sum()),
+        within_month=int((days <= month).sum()),
+        next_stockout=forecast["stockout_date"].min(),
+    )
@@ -0,0 +1,110 @@
+"""
+Geotagged locations and viewport-bounded map queries.
+
+Depots, caches and convoy positions live in ``locations`` (unique ``name``,
+matched by ``supply.location``). An R*Tree virtual table indexes their
+coordinates, kept in step by triggers, so the map fetches only the points
+inside the current viewport, however many locations exist.
+"""
+
+import math
+from dataclasses import dataclass
+
+import pandas as pd
+
+from logistics.backend import read_frame
+from logistics.cache import table_version
+
+MAX_MAP_POINTS = 20000
+
+# Named starting views: (center latitude, center longitude, zoom)
+MAP_REGIONS = {
+    "Continental US": (39.5, -98.35, 3),
+    "Europe": (50.0, 10.0, 3),
+    "Middle East": (29.0, 45.0, 4),
+    "Indo-Pacific": (10.0, 125.0, 3),
+    "World": (20.0, 0.0, 1),
+}
+
+VIEWPORT_POINTS_QUERY = '''
+    SELECT l.lat, l.lon, l.name AS location, l.kind,
+           s.supply_id, s.supply_class, s.supply_type, s.quantity, s.status, s.priority
+    FROM locations_rtree r
+    JOIN locations l ON l.id = r.id
+    LEFT JOIN supply s ON s.location = l.name
+    WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+    LIMIT ?
+'''
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """A latitude/longitude bounding box; ``west > east`` means it crosses the antimeridian."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def boxes(self):
+        """Split into one or two boxes that do not cross the antimeridian."""
+        if self.west <= self.east:
+            return [(self.south, self.west, self.north, self.east)]
+        return [
+            (self.south, self.west, self.north, 180.0),
+            (self.south, -180.0, self.north, self.east),
+        ]
+
+
+def viewport_bounds(lat, lon, zoom, width_px=1200, height_px=500):
+    """
+    Approximate the box a Web Mercator map of the given size shows at ``zoom``.
+    """
+    degrees_per_px = 360.0 / (256 * 2 ** zoom)
+    half_width = min(180.0, degrees_per_px * width_px / 2)
+    # Latitude degrees shrink away from the equator by cos(lat)
+    half_height = degrees_per_px * height_px / 2 * max(math.cos(math.radians(lat)), 0.05)
+    south = max(-90.0, lat - half_height)
+    north = min(90.0, lat + half_height)
+    if half_width >= 180.0:
+        return Viewport(south, -180.0, north, 180.0)
+    west = (lon - half_width + 180.0) % 360.0 - 180.0
+    east = (lon + half_width + 180.0) % 360.0 - 180.0
+    return Viewport(south, west, north, east)
+
+
+def map_version(conn):
+    """Return the ``(supply, locations)`` table versions the map is drawn from."""
+    return (table_version(conn, "supply"), table_version(conn, "locations"))
+
+
+def fetch_points(conn, viewport, limit=MAX_MAP_POINTS):
+    """
+    Return ``(points, truncated)`` for supply lines at locations inside ``viewport``.
+
+    Locations with no supply lines are returned once with empty supply columns.
+    """
+    frames = []
+    remaining = limit + 1
+    for south, west, north, east in viewport.boxes():
+        frame = read_frame(conn, VIEWPORT_POINTS_QUERY, (south, north, west, east, remaining))
+        frames.append(frame)
+        remaining -= len(frame)
+        if remaining <= 0:
+            break
+    points = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    truncated = len(points) > limit
+    return points.iloc[:limit], truncated
+
+
+def save_location(conn, name, lat, lon, kind="Depot"):
+    """Insert or move a location, keeping its id."""
+    conn.execute(
+        '''
+        INSERT INTO locations (name, kind, lat, lon) VALUES (?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            kind = excluded.kind, lat = excluded.lat, lon = excluded.lon,
+            updated_at = CURRENT_TIMESTAMP
+        ''',
+        (name, kind, lat, lon),
+    )
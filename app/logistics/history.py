@@ -0,0 +1,156 @@
+"""
+Supply quantity history, and the trends and burn rates read from it.
+
+Saving a supply line overwrites its row. ``schema.track_supply_history``
+keeps what it held: every change to a line's quantity, status or priority
+appends an event to ``supply_history`` and is folded into the
+``supply_history_hourly`` and ``supply_history_daily`` rollups in the same
+transaction. The readers here go to the rollups, so a trend over months is
+a few hundred rows and a burn rate one index range per day of its window,
+however many saves produced them and however long the history.
+
+``burn_rates`` is the one definition of a burn rate: the forecasts in
+``logistics.forecast`` read theirs from it, decay-weighted.
+
+Timestamps and buckets are ``YYYY-MM-DD HH:MM:SS`` text in UTC, like every
+other timestamp the database writes.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from logistics.backend import read_frame
+
+GRANULARITIES = ("hourly", "daily")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+BURN_RATE_DAYS = 30
+
+HISTORY_QUERY = '''
+    SELECT id, supply_id, op, quantity, previous_quantity, status, priority, recorded_at
+    FROM supply_history
+    WHERE supply_id = ?
+    ORDER BY id DESC
+    LIMIT ?
+'''
+LINE_TREND_QUERY = '''
+    SELECT bucket, opening_quantity, closing_quantity, min_quantity, max_quantity,
+           consumed, received, changes, status, priority
+    FROM {rollup}
+    WHERE supply_id = ? AND bucket >= ?
+    ORDER BY bucket
+'''
+# PostgreSQL sums BIGINTs to NUMERIC, hence the casts
+INVENTORY_TREND_QUERY = '''
+    SELECT bucket, CAST(SUM(consumed) AS BIGINT) AS consumed,
+           CAST(SUM(received) AS BIGINT) AS received,
+           CAST(SUM(changes) AS BIGINT) AS changes, COUNT(*) AS lines
+    FROM {rollup}
+    WHERE bucket >= ?
+    GROUP BY bucket
+    ORDER BY bucket
+'''
+# The window's days and weights arrive as a constant table, so the rollup is
+# read one day at a time from the covering (bucket, supply_id, ...) index and
+# weighing a row is part of the join rather than a CASE over every day.
+BURN_RATE_QUERY = '''
+    WITH window_days (bucket, weight) AS (VALUES {days})
+    SELECT h.supply_id, CAST(SUM(h.consumed) AS BIGINT) AS consumed,
+           CAST(SUM(h.received) AS BIGINT) AS received,
+           SUM(h.consumed * window_days.weight) AS weighted
+    FROM window_days
+    JOIN supply_history_daily h ON h.bucket = window_days.bucket{lines}
+    GROUP BY h.supply_id
+'''
+
+
+def utc_now():
+    """Return the current UTC time as a naive datetime, matching stored timestamps."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def rollup_table(granularity):
+    """Return the rollup table for ``granularity``, one of ``GRANULARITIES``."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity {granularity!r}; expected one of {GRANULARITIES}")
+    return f"supply_history_{granularity}"
+
+
+def bucket_start(moment, granularity):
+    """Return the bucket key of the hourly or daily bucket containing ``moment``."""
+    rollup_table(granularity)
+    if granularity == "daily":
+        moment = moment.replace(hour=0)
+    return moment.replace(minute=0, second=0, microsecond=0).strftime(TIMESTAMP_FORMAT)
+
+
+def _since(since, granularity):
+    # Every bucket key sorts after the empty string
+    return "" if since is None else bucket_start(since, granularity)
+
+
+def _parse_buckets(frame, column="bucket"):
+    frame[column] = pd.to_datetime(frame[column], format="ISO8601", errors="coerce")
+    return frame
+
+
+def supply_history(conn, supply_id, limit=100):
+    """Return the newest ``limit`` history events of one supply line, newest first."""
+    frame = read_frame(conn, HISTORY_QUERY, (supply_id, limit))
+    return _parse_buckets(frame, "recorded_at")
+
+
+def quantity_trend(conn, granularity="daily", since=None, supply_id=None):
+    """
+    Return stock movement per bucket from ``since`` (a datetime) on.
+
+    For one ``supply_id`` each row has the line's opening, closing, low and
+    high quantity and what was consumed and received; for the whole
+    inventory, consumption, receipts, changes and lines touched are summed
+    per bucket.
+    """
+    rollup = rollup_table(granularity)
+    if supply_id is not None:
+        sql, params = LINE_TREND_QUERY, (supply_id, _since(since, granularity))
+    else:
+        sql, params = INVENTORY_TREND_QUERY, (_since(since, granularity),)
+    return _parse_buckets(read_frame(conn, sql.format(rollup=rollup), params))
+
+
+def day_weights(today, days=BURN_RATE_DAYS, half_life_days=None):
+    """
+    Return ``[(bucket, weight), ...]`` for the daily buckets of the ``days`` ending ``today``.
+
+    Every ``half_life_days`` back halves a day's weight; without a half-life
+    every day weighs 1.
+    """
+    return [
+        ((today - timedelta(days=age)).strftime(TIMESTAMP_FORMAT),
+         1.0 if half_life_days is None else 0.5 ** (age / half_life_days))
+        for age in range(days)
+    ]
+
+
+def burn_rate_query(weights, supply_ids=None):
+    """Return the SQL and parameters summing each line's rollup rows weighted by ``weights`` (see ``day_weights``)."""
+    sql = BURN_RATE_QUERY.format(
+        days=", ".join("(?, ?)" for _ in weights),
+        lines="" if supply_ids is None else f" WHERE h.supply_id IN ({', '.join('?' * len(supply_ids))})",
+    )
+    return sql, [value for pair in weights for value in pair] + list(supply_ids or ())
+
+
+def burn_rates(conn, days=BURN_RATE_DAYS, now=None, half_life_days=None, supply_ids=None):
+    """
+    Return each supply line's average daily consumption over the last ``days`` days.
+
+    Columns are ``supply_id``, ``consumed``, ``received`` and ``burn_rate``
+    (consumed per day, today included); lines with no history in the window
+    are absent. With ``half_life_days`` the average is weighted by
+    ``day_weights``, so recent days count more and days without consumption
+    still count as zero. ``supply_ids`` limits the read to those lines.
+    """
+    weights = day_weights((now or utc_now()).date(), days, half_life_days)
+    frame = read_frame(conn, *burn_rate_query(weights, supply_ids))
+    frame["burn_rate"] = frame.pop("weighted").astype(float) / sum(weight for _, weight in weights)
+    return frame
@@ -0,0 +1,89 @@
+"""
+Aggregates behind the dashboard metric tiles.
+
+Supply tiles read the trigger-maintained ``supply_counts`` table (see
+``schema.track_value_counts``), so their cost does not grow with the
+inventory. The breakdown charts read class and status counts from the
+trigger-maintained totals tables the same way (``supply_totals`` and
+``personnel_class_totals``, see ``schema.track_group_totals``). Small
+in-memory frames are summarized in a single pass.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from logistics.frames import CATEGORY_COLUMNS
+
+
+@dataclass(frozen=True)
+class SupplyMetrics:
+    """Counts shown in the supply metric tiles."""
+
+    total_items: int = 0
+    low_stock: int = 0
+    out_of_stock: int = 0
+    critical: int = 0
+
+
+SUPPLY_METRICS_QUERY = '''
+    SELECT dimension, value, count FROM supply_counts
+    WHERE (dimension = '*' AND value = '*')
+       OR (dimension = 'status' AND value IN ('Low Stock', 'Out of Stock'))
+       OR (dimension = 'priority' AND value = 'Critical')
+'''
+
+# Table -> (class column, its counts per class and status). Supply totals
+# are also kept per location, so they are summed across locations: a few
+# rows per location, not per supply line.
+BREAKDOWN_QUERIES = {
+    "personnel": ("personnel_class", "SELECT personnel_class, status, count FROM personnel_class_totals"),
+    "supply": ("supply_class", '''
+        SELECT supply_class, status, CAST(SUM(count) AS BIGINT)
+        FROM supply_totals
+        GROUP BY supply_class, status
+    '''),
+}
+
+
+def supply_metrics(conn):
+    """Read the supply tile counts from the maintained counter table."""
+    rows = conn.execute(SUPPLY_METRICS_QUERY).fetchall()
+    counts = {(dimension, value): count for dimension, value, count in rows}
+    return SupplyMetrics(
+        total_items=counts.get(('*', '*'), 0),
+        low_stock=counts.get(('status', 'Low Stock'), 0),
+        out_of_stock=counts.get(('status', 'Out of Stock'), 0),
+        critical=counts.get(('priority', 'Critical'), 0),
+    )
+
+
+def count_by(df, column):
+    """Return ``{value: count}`` for one column in a single pass."""
+    if df.empty:
+        return {}
+    return df[column].value_counts().to_dict()
+
+
+def _in_domain_order(known, present):
+    return list(known) + sorted(set(present) - set(known))
+
+
+def breakdown(conn, table):
+    """
+    Return a ``count`` of ``table``'s rows per class and status pair.
+
+    Every class and status in ``logistics.domain`` is listed in its order,
+    counted as zero when no rows have it, so a chart's axes stay put however
+    the data changes; values stored outside those lists follow them.
+    """
+    column, query = BREAKDOWN_QUERIES[table]
+    counts = {(value, status): count for value, status, count in conn.execute(query).fetchall()}
+    if not counts:
+        return pd.DataFrame(columns=[column, "status", "count"])
+    values = _in_domain_order(CATEGORY_COLUMNS[table][column], {value for value, _ in counts})
+    statuses = _in_domain_order(CATEGORY_COLUMNS[table]["status"], {status for _, status in counts})
+    return pd.DataFrame(
+        [(value, status, counts.get((value, status), 0)) for value in values for status in statuses],
+        columns=[column, "status", "count"],
+    )
@@ -0,0 +1,277 @@
+"""
+Shared, long-lived SQLite connection pool.
+
+Streamlit re-executes the whole script on every interaction, so opening a
+fresh ``sqlite3.connect`` for every query adds connect/close overhead and
+makes concurrent sessions trip over each other's locks. A ``ConnectionPool``
+keeps a bounded set of connections per database file, configures each one
+once (WAL journaling plus tuned pragmas) and hands them out per thread.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection, in order. WAL lets readers proceed while a
+# writer holds the lock; synchronous=NORMAL is durable under WAL except for
+# power loss, and avoids an fsync per commit.
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),  # negative means KiB: ~16 MB page cache
+    ("mmap_size", 268435456),  # 256 MB of memory-mapped reads
+    ("busy_timeout", 5000),  # milliseconds
+    ("temp_store", "MEMORY"),
+    # The app saves with upserts (logistics.upsert), which fire UPDATE
+    # triggers. Any INSERT OR REPLACE issued by other writers removes the
+    # old row by conflict resolution, which fires DELETE triggers only with
+    # this on; without it the trigger-maintained counters would drift.
+    ("recursive_triggers", "ON"),
+)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how a pool has been used."""
+
+    created: int = 0
+    hits: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    lock_retries: int = 0
+    in_use: int = 0
+    idle: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def is_lock_error(error):
+    """Return True if ``error`` is SQLite reporting a locked or busy database."""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and (
+        "locked" in message or "busy" in message
+    )
+
+
+@contextmanager
+def read_snapshot(conn):
+    """
+    Run the enclosed reads against one consistent snapshot of the database.
+
+    Opens a deferred read transaction unless ``conn`` is already in one, so
+    a version number and the rows it describes cannot be torn apart by a
+    concurrent writer.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
+
+
+class ConnectionPool:
+    """
+    A bounded pool of SQLite connections to a single database file.
+
+    Connections are checked out with ``connection()``. A thread that already
+    holds a connection gets the same one back on nested calls, so helpers can
+    open a connection freely without deadlocking the pool. Writes should go
+    through ``transaction()``, which takes the write lock up front and retries
+    when another writer holds it.
+
+    ``metrics_hook`` is called as ``hook(event, value)`` for the events
+    ``"hit"``, ``"miss"``, ``"wait"`` (value is seconds waited) and
+    ``"lock_retry"`` (value is the attempt number).
+
+    Subclasses adapt the pool to another database engine by overriding
+    ``_connect``, ``begin_statement`` and ``is_retryable`` (see
+    ``logistics.postgres``).
+    """
+
+    # Takes SQLite's write lock up front instead of on the first write
+    begin_statement = "BEGIN IMMEDIATE"
+
+    def __init__(self, path, max_size=8, timeout=30.0, pragmas=DEFAULT_PRAGMAS,
+                 metrics_hook=None, max_retries=5, retry_delay=0.05):
+        self.path = str(path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = tuple(pragmas)
+        self.metrics_hook = metrics_hook
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._local = threading.local()
+        self._stats = PoolStats()
+
+    def _emit(self, event, value=1):
+        if self.metrics_hook is None:
+            return
+        try:
+            self.metrics_hook(event, value)
+        except Exception:
+            logger.exception("Connection pool metrics hook failed")
+
+    def _connect(self):
+        busy_timeout = dict(self.pragmas).get("busy_timeout", 5000)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout / 1000.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _acquire(self):
+        waited = None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.path} is closed")
+
+            if self._idle:
+                self._stats.hits += 1
+                self._stats.in_use += 1
+                conn = self._idle.pop()
+                event = "hit"
+            elif self._size < self.max_size:
+                self._size += 1
+                self._stats.created += 1
+                self._stats.in_use += 1
+                conn = None
+                event = "miss"
+            else:
+                started = time.perf_counter()
+                deadline = started + self.timeout
+                while not self._idle:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or self._closed:
+                        raise PoolTimeout(
+                            f"No connection to {self.path} available after {self.timeout}s"
+                        )
+                    self._cond.wait(remaining)
+                waited = time.perf_counter() - started
+                self._stats.waits += 1
+                self._stats.wait_seconds += waited
+                self._stats.in_use += 1
+                conn = self._idle.pop()
+                event = "wait"
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._stats.in_use -= 1
+                    self._cond.notify()
+                raise
+
+        self._emit(event, waited if waited is not None else 1)
+        return conn
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._cond:
+            self._stats.in_use -= 1
+            if self._closed:
+                self._size -= 1
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def is_retryable(self, error):
+        """Return True if a transaction that failed with ``error`` should be retried."""
+        return is_lock_error(error)
+
+    def transaction(self, fn):
+        """
+        Run ``fn(conn)`` in a write transaction and return its result.
+
+        The transaction is opened with ``BEGIN IMMEDIATE`` so the write lock is
+        taken before any work is done; if another writer holds it past the
+        busy timeout (or ``is_retryable`` accepts the error) the whole
+        transaction is retried with backoff. Calls made while the thread is
+        already inside a transaction join it.
+        """
+        with self.connection() as conn:
+            if conn.in_transaction:
+                return fn(conn)
+
+            attempt = 0
+            while True:
+                try:
+                    conn.execute(self.begin_statement)
+                    try:
+                        result = fn(conn)
+                        conn.execute("COMMIT")
+                    except BaseException:
+                        if conn.in_transaction:
+                            conn.execute("ROLLBACK")
+                        raise
+                    return result
+                except Exception as e:
+                    if not self.is_retryable(e) or attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    with self._cond:
+                        self._stats.lock_retries += 1
+                    self._emit("lock_retry", attempt)
+                    time.sleep(self.retry_delay * (2 ** (attempt - 1)))
+
+    def stats(self):
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            snapshot = PoolStats(**self._stats.as_dict())
+            snapshot.idle = len(self._idle)
+        return snapshot
+
+    def close(self):
+        """Close idle connections; checked-out ones close when returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+            self._cond.notify_all()
+
+
+def log_pool_event(event, value):
+    """Default metrics hook: log pool activity at debug level."""
+    logger.debug("connection pool %s: %s", event, value)
@@ -0,0 +1,752 @@
+"""
+PostgreSQL storage backend for multi-node deployments.
+
+A SQLite file on local disk ties the app to one Streamlit node. Pointing
+``$LOGISTICS_DB`` (or ``--db``) at a ``postgresql://`` URL instead runs every
+replica against one shared server:
+
+* ``PostgresPool`` is a ``ConnectionPool`` whose connections are psycopg 3
+  connections (3.2 or newer) behind a thin adapter, so the SQL modules run
+  unchanged. ``translate_sql`` rewrites SQLite's ``?``/``:name``
+  parameters, ``IS NOT`` comparisons and ``CURRENT_TIMESTAMP`` into their
+  PostgreSQL forms. PostgreSQL 14 or newer is required.
+* Large reads (exports) stream through named server-side cursors, so a
+  replica holds one chunk at a time rather than the whole result.
+* ``POSTGRES_MIGRATIONS`` builds the same schema as the SQLite history:
+  the same tables and columns, with timestamps kept as
+  ``YYYY-MM-DD HH:MM:SS`` text in UTC. Triggers maintain
+  ``table_versions``, ``supply_counts`` and ``change_log``, so read caches
+  and live frames on every replica see writes made by the others. There is
+  no R*Tree; ``locations_rtree`` is a view over a ``(lat, lon)`` B-tree
+  index.
+
+Writes still run one transaction at a time per replica through the write
+queue. Across replicas, row changes are serialized on an advisory lock while
+they are logged, so ``change_log.seq`` order matches commit order and a
+reader never skips a change that commits late. In-process change events
+(``logistics.events``) do not cross replicas; other replicas' saves show up
+on the next interaction through the table versions.
+
+psycopg is only needed when this backend is used::
+
+    pip install "psycopg[binary]>=3.2"
+"""
+
+import functools
+import itertools
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+import pandas as pd
+
+try:
+    import psycopg
+    from psycopg import errors as pg_errors
+    from psycopg.pq import TransactionStatus
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = pg_errors = TransactionStatus = None
+
+from logistics.backend import DEFAULT_CHUNK_SIZE
+from logistics.pool import ConnectionPool, read_snapshot
+from logistics.schema import (
+    CHANGE_LOG_RETENTION,
+    HISTORY_BASELINE,
+    HISTORY_BUCKETS,
+    HISTORY_CONSUMED,
+    HISTORY_RECEIVED,
+    READINESS_CUBE_SELECT,
+    READINESS_TOTALS,
+    SAMPLE_LOCATIONS,
+    SEARCH_COLUMNS,
+    Migration,
+)
+
+# Applied to every new connection, in order. UTF8 makes text arrive as str
+# even from a SQL_ASCII database; UTC and ISO dates make timestamps read
+# back exactly as SQLite's CURRENT_TIMESTAMP writes them.
+DEFAULT_SETTINGS = (
+    ("client_encoding", "'UTF8'"),
+    ("timezone", "'UTC'"),
+    ("datestyle", "'ISO, YMD'"),
+    ("lock_timeout", "'5s'"),
+)
+
+# Whole statements that mean something different on PostgreSQL. A bare
+# BEGIN opens ``read_snapshot``, which needs one snapshot for all its reads.
+STATEMENT_REWRITES = {
+    "BEGIN": "BEGIN ISOLATION LEVEL REPEATABLE READ",
+}
+
+_LITERALS = re.compile(r"('(?:[^']|'')*'|\$\$.*?\$\$)", re.S)
+_NAMED_PARAMETER = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+_IS_NOT = re.compile(r"\bIS NOT (?!NULL\b|DISTINCT\b|TRUE\b|FALSE\b)", re.I)
+_CURRENT_TIMESTAMP = re.compile(r"\bCURRENT_TIMESTAMP\b", re.I)
+
+_cursor_names = itertools.count(1)
+
+# PostgreSQL's form of ``backend.FULL_TEXT_QUERY``
+FULL_TEXT_QUERY = "SELECT id FROM {index} WHERE document @@ to_tsquery('simple', %s) ORDER BY id DESC LIMIT %s"
+
+
+@functools.lru_cache(maxsize=1024)
+def translate_sql(sql, bind=True):
+    """
+    Rewrite a statement written for SQLite into PostgreSQL's dialect.
+
+    Outside string literals and ``$$`` bodies, ``?`` and ``:name`` become
+    psycopg's ``%s`` and ``%(name)s`` (when ``bind``, that is when
+    parameters are passed; literal ``%`` is then doubled), ``a IS NOT b``
+    becomes ``a IS DISTINCT FROM b`` and ``CURRENT_TIMESTAMP`` becomes the
+    second-precision ``LOCALTIMESTAMP(0)``.
+    """
+    rewrite = STATEMENT_REWRITES.get(sql.strip())
+    if rewrite is not None:
+        return rewrite
+    parts = _LITERALS.split(sql)
+    for i, part in enumerate(parts):
+        if bind:
+            part = part.replace("%", "%%")
+        if i % 2 == 0:
+            if bind:
+                part = part.replace("?", "%s")
+                part = _NAMED_PARAMETER.sub(r"%(\1)s", part)
+            part = _IS_NOT.sub("IS DISTINCT FROM ", part)
+            part = _CURRENT_TIMESTAMP.sub("LOCALTIMESTAMP(0)", part)
+        parts[i] = part
+    return "".join(parts)
+
+
+def redact_url(url):
+    """Return ``url`` with any password masked, for logs and diagnostics."""
+    parts = urlsplit(url)
+    if parts.password is None:
+        return url
+    netloc = f"{parts.username}:***@{parts.hostname}"
+    if parts.port is not None:
+        netloc += f":{parts.port}"
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+class PostgresConnection:
+    """A psycopg connection that accepts the SQLite-flavoured SQL of the data modules."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def in_transaction(self):
+        return self.raw.info.transaction_status != TransactionStatus.IDLE
+
+    def execute(self, sql, params=None):
+        return self.raw.execute(translate_sql(sql, params is not None), params)
+
+    def executemany(self, sql, params_seq):
+        cursor = self.raw.cursor()
+        cursor.executemany(translate_sql(sql), params_seq)
+        return cursor
+
+    def rollback(self):
+        self.raw.execute("ROLLBACK")
+
+    def close(self):
+        self.raw.close()
+
+    def read_frame(self, sql, params=None):
+        cursor = self.execute(sql, params)
+        columns = [column.name for column in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def table_exists(self, table):
+        return self.raw.execute("SELECT to_regclass(%s) IS NOT NULL", (table,)).fetchone()[0]
+
+    def table_columns(self, table):
+        return self.raw.execute(
+            '''
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+            ORDER BY ordinal_position
+            ''',
+            (table,),
+        ).fetchall()
+
+    def serialize_migrations(self):
+        self.raw.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+
+    def full_text_matches(self, table, terms, limit):
+        # Each term a quoted lexeme; the last one a prefix
+        lexemes = ["'" + term.replace("\\", "\\\\").replace("'", "''") + "'" for term in terms]
+        query = " & ".join(lexemes) + ":*"
+        sql = FULL_TEXT_QUERY.format(index=f"{table}_search")
+        return [row[0] for row in self.raw.execute(sql, (query, limit))]
+
+    def stream_rows(self, sql, params=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        # Named cursors live inside a transaction; the snapshot keeps chunks consistent
+        with read_snapshot(self):
+            cursor = self.raw.cursor(name=f"stream_{next(_cursor_names)}")
+            try:
+                cursor.execute(translate_sql(sql, bool(params)), params or None)
+                columns = [column.name for column in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield columns, rows
+            finally:
+                cursor.close()
+
+
+class PostgresPool(ConnectionPool):
+    """
+    A bounded pool of connections to one PostgreSQL database.
+
+    Behaves like the SQLite ``ConnectionPool``: per-thread checkout,
+    ``transaction()`` with retries and the same stats and metrics events.
+    ``path`` is the URL with its password masked; ``settings`` are
+    ``SET`` on each new connection.
+    """
+
+    # Writers wait on row locks rather than one database-wide lock
+    begin_statement = "BEGIN ISOLATION LEVEL READ COMMITTED"
+
+    def __init__(self, url, max_size=8, timeout=30.0, settings=DEFAULT_SETTINGS,
+                 metrics_hook=None, max_retries=5, retry_delay=0.05):
+        if psycopg is None:
+            raise ImportError(
+                'The PostgreSQL backend needs psycopg 3.2+: pip install "psycopg[binary]>=3.2"'
+            )
+        super().__init__(redact_url(url), max_size=max_size, timeout=timeout, pragmas=(),
+                         metrics_hook=metrics_hook, max_retries=max_retries,
+                         retry_delay=retry_delay)
+        self.url = url
+        self.settings = tuple(settings)
+
+    def _connect(self):
+        raw = psycopg.connect(self.url, autocommit=True)
+        for name, value in self.settings:
+            raw.execute(f"SET {name} = {value}")
+        return PostgresConnection(raw)
+
+    def is_retryable(self, error):
+        return isinstance(error, (
+            pg_errors.SerializationFailure, pg_errors.DeadlockDetected, pg_errors.LockNotAvailable,
+        ))
+
+
+# Second-precision UTC text, the format SQLite's CURRENT_TIMESTAMP produces
+NOW = "(LOCALTIMESTAMP(0)::text)"
+
+
+def track_table_version(table):
+    """Return migration steps bumping ``table_versions`` on every row change of ``table``."""
+    return (
+        '''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 0) "
+        "ON CONFLICT (table_name) DO NOTHING",
+        f'''
+        CREATE OR REPLACE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION bump_table_version()
+        ''',
+    )
+
+
+def track_changes(table, retention=CHANGE_LOG_RETENTION):
+    """Return migration steps appending every row change of ``table`` to ``change_log``."""
+    return (
+        f'''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            row_id BIGINT NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_change_log_table_seq ON change_log (table_name, seq)",
+        '''
+        CREATE OR REPLACE FUNCTION log_row_change() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Held to commit: seq order is then commit order across replicas
+            PERFORM pg_advisory_xact_lock(hashtext('change_log'));
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO change_log (table_name, row_id, op) VALUES (TG_TABLE_NAME, OLD.id, 'delete');
+            ELSE
+                INSERT INTO change_log (table_name, row_id, op) VALUES (TG_TABLE_NAME, NEW.id, lower(TG_OP));
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        f'''
+        CREATE OR REPLACE FUNCTION prune_change_log() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - {int(retention)};
+            RETURN NULL;
+        END
+        $$
+        ''',
+        '''
+        CREATE OR REPLACE TRIGGER change_log_retention AFTER INSERT ON change_log
+        FOR EACH STATEMENT EXECUTE FUNCTION prune_change_log()
+        ''',
+        f'''
+        CREATE OR REPLACE TRIGGER {table}_change_log AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION log_row_change()
+        ''',
+    )
+
+
+def track_value_counts(table, columns):
+    """Return migration steps maintaining ``{table}_counts`` for ``columns``."""
+    counts = f"{table}_counts"
+
+    def bump(row, delta):
+        statements = [
+            f"UPDATE {counts} SET count = count + ({delta}) WHERE dimension = '*' AND value = '*';"
+        ]
+        for column in columns:
+            statements.append(
+                f"INSERT INTO {counts} (dimension, value, count) "
+                f"SELECT '{column}', {row}.{column}, {delta} WHERE {row}.{column} IS NOT NULL "
+                f"ON CONFLICT (dimension, value) DO UPDATE SET count = {counts}.count + ({delta});"
+            )
+        return "\n                ".join(statements)
+
+    unchanged = " AND ".join(f"OLD.{column} IS NOT DISTINCT FROM NEW.{column}" for column in columns)
+    steps = [
+        f'''
+        CREATE TABLE IF NOT EXISTS {counts} (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        )
+        ''',
+        f"DELETE FROM {counts}",
+        f"INSERT INTO {counts} (dimension, value, count) SELECT '*', '*', COUNT(*) FROM {table}",
+    ]
+    for column in columns:
+        steps.append(
+            f"INSERT INTO {counts} (dimension, value, count) "
+            f"SELECT '{column}', {column}, COUNT(*) FROM {table} "
+            f"WHERE {column} IS NOT NULL GROUP BY {column}"
+        )
+    steps.extend([
+        f'''
+        CREATE OR REPLACE FUNCTION {counts}_maintain() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND {unchanged} THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {bump("OLD", -1)}
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                {bump("NEW", 1)}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        f'''
+        CREATE OR REPLACE TRIGGER {counts}_maintain AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {counts}_maintain()
+        ''',
+    ])
+    return tuple(steps)
+
+
+def track_group_totals(table, totals, keys, sums=()):
+    """Return migration steps maintaining ``totals``, ``table`` grouped by ``keys``."""
+    key_list = ", ".join(keys)
+    columns = ", ".join((*keys, "count", *sums))
+
+    def bump(row, delta):
+        values = ", ".join(
+            [f"COALESCE({row}.{key}, '')" for key in keys] + [str(delta)]
+            + [f"({delta}) * COALESCE({row}.{column}, 0)" for column in sums]
+        )
+        updates = ", ".join(
+            f"{column} = {totals}.{column} + excluded.{column}" for column in ("count", *sums)
+        )
+        statements = [
+            f"INSERT INTO {totals} ({columns}) VALUES ({values}) "
+            f"ON CONFLICT ({key_list}) DO UPDATE SET {updates};"
+        ]
+        if delta < 0:
+            match = " AND ".join(f"{key} = COALESCE({row}.{key}, '')" for key in keys)
+            statements.append(f"DELETE FROM {totals} WHERE {match} AND count = 0;")
+        return "\n                ".join(statements)
+
+    unchanged = " AND ".join(
+        f"OLD.{column} IS NOT DISTINCT FROM NEW.{column}" for column in (*keys, *sums)
+    )
+    return (
+        f'''
+        CREATE TABLE IF NOT EXISTS {totals} (
+            {" ".join(f"{key} TEXT NOT NULL," for key in keys)}
+            count BIGINT NOT NULL DEFAULT 0,
+            {" ".join(f"{column} BIGINT NOT NULL DEFAULT 0," for column in sums)}
+            PRIMARY KEY ({key_list})
+        )
+        ''',
+        f"DELETE FROM {totals}",
+        f'''
+        INSERT INTO {totals} ({columns})
+        SELECT {", ".join(f"COALESCE({key}, '')" for key in keys)}, COUNT(*)
+               {"".join(f", SUM(COALESCE({column}, 0))" for column in sums)}
+        FROM {table}
+        GROUP BY {", ".join(f"COALESCE({key}, '')" for key in keys)}
+        ''',
+        f'''
+        CREATE OR REPLACE FUNCTION {totals}_maintain() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND {unchanged} THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {bump("OLD", -1)}
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                {bump("NEW", 1)}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        f'''
+        CREATE OR REPLACE TRIGGER {totals}_maintain AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {totals}_maintain()
+        ''',
+    )
+
+
+def index_filter_columns(table, columns):
+    """Return steps creating one ``(column, updated_at, id)`` index per filter column."""
+    # PostgreSQL has no implicit rowid in secondary indexes, so id is spelled out
+    return tuple(
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_updated_at ON {table} ({column}, updated_at, id)"
+        for column in columns
+    )
+
+
+def index_full_text(table, columns=None):
+    """
+    Return migration steps keeping ``{table}_search``, a GIN-indexed ``tsvector`` per row.
+
+    The ``simple`` configuration lowercases words without stemming, like
+    SQLite's FTS5 tokenizer.
+    """
+    names = [column for column, _ in columns or SEARCH_COLUMNS[table]]
+    index = f"{table}_search"
+
+    def document(row):
+        return f"to_tsvector('simple', concat_ws(' ', {', '.join(row + column for column in names)}))"
+
+    unchanged = " AND ".join(f"OLD.{column} IS NOT DISTINCT FROM NEW.{column}" for column in names)
+    return (
+        f'''
+        CREATE TABLE IF NOT EXISTS {index} (
+            id BIGINT PRIMARY KEY,
+            document tsvector NOT NULL
+        )
+        ''',
+        f"CREATE INDEX IF NOT EXISTS idx_{index}_document ON {index} USING GIN (document)",
+        f"INSERT INTO {index} (id, document) SELECT id, {document('')} FROM {table} ON CONFLICT (id) DO NOTHING",
+        f'''
+        CREATE OR REPLACE FUNCTION {index}_maintain() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM {index} WHERE id = OLD.id;
+            ELSIF TG_OP = 'INSERT' OR NOT ({unchanged}) THEN
+                INSERT INTO {index} (id, document) VALUES (NEW.id, {document("NEW.")})
+                ON CONFLICT (id) DO UPDATE SET document = excluded.document;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        f'''
+        CREATE OR REPLACE TRIGGER {index}_maintain AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {index}_maintain()
+        ''',
+    )
+
+
+def track_supply_history():
+    """Return migration steps keeping ``supply_history`` and its hourly and daily rollups."""
+    steps = [
+        f'''
+        CREATE TABLE IF NOT EXISTS supply_history (
+            id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            supply_id TEXT NOT NULL,
+            op TEXT NOT NULL,
+            quantity BIGINT NOT NULL,
+            previous_quantity BIGINT,
+            status TEXT,
+            priority TEXT,
+            recorded_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_supply_history_supply_id ON supply_history (supply_id, id)",
+        '''
+        CREATE OR REPLACE FUNCTION supply_history_append_only() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            RAISE EXCEPTION 'supply_history is append-only';
+        END
+        $$
+        ''',
+        '''
+        CREATE OR REPLACE TRIGGER supply_history_append_only BEFORE UPDATE OR DELETE ON supply_history
+        FOR EACH ROW EXECUTE FUNCTION supply_history_append_only()
+        ''',
+    ]
+    rollups = []
+    for granularity, bucket in HISTORY_BUCKETS.items():
+        rollup = f"supply_history_{granularity}"
+        steps.extend([
+            f'''
+            CREATE TABLE IF NOT EXISTS {rollup} (
+                supply_id TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                opening_quantity BIGINT NOT NULL,
+                closing_quantity BIGINT NOT NULL,
+                min_quantity BIGINT NOT NULL,
+                max_quantity BIGINT NOT NULL,
+                consumed BIGINT NOT NULL DEFAULT 0,
+                received BIGINT NOT NULL DEFAULT 0,
+                changes BIGINT NOT NULL DEFAULT 0,
+                status TEXT,
+                priority TEXT,
+                PRIMARY KEY (supply_id, bucket)
+            )
+            ''',
+            f"CREATE INDEX IF NOT EXISTS idx_{rollup}_bucket ON {rollup} (bucket)",
+        ])
+        rollups.append(f'''
+            INSERT INTO {rollup} (supply_id, bucket, opening_quantity, closing_quantity,
+                                  min_quantity, max_quantity, consumed, received, changes,
+                                  status, priority)
+            VALUES (NEW.supply_id, {bucket.format("NEW.recorded_at")},
+                    COALESCE(NEW.previous_quantity, 0), NEW.quantity,
+                    LEAST(COALESCE(NEW.previous_quantity, 0), NEW.quantity),
+                    GREATEST(COALESCE(NEW.previous_quantity, 0), NEW.quantity),
+                    {HISTORY_CONSUMED.format("NEW")}, {HISTORY_RECEIVED.format("NEW")}, 1,
+                    NEW.status, NEW.priority)
+            ON CONFLICT (supply_id, bucket) DO UPDATE SET
+                closing_quantity = excluded.closing_quantity,
+                min_quantity = LEAST({rollup}.min_quantity, excluded.closing_quantity),
+                max_quantity = GREATEST({rollup}.max_quantity, excluded.closing_quantity),
+                consumed = {rollup}.consumed + excluded.consumed,
+                received = {rollup}.received + excluded.received,
+                changes = {rollup}.changes + 1,
+                status = excluded.status,
+                priority = excluded.priority;''')
+    steps.extend([
+        f'''
+        CREATE OR REPLACE FUNCTION supply_history_rollup() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN{"".join(rollups)}
+            RETURN NULL;
+        END
+        $$
+        ''',
+        '''
+        CREATE OR REPLACE TRIGGER supply_history_rollup AFTER INSERT ON supply_history
+        FOR EACH ROW EXECUTE FUNCTION supply_history_rollup()
+        ''',
+        HISTORY_BASELINE.format(now=NOW),
+        '''
+        CREATE OR REPLACE FUNCTION supply_history_record() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority)
+                VALUES (NEW.supply_id, 'insert', NEW.quantity, NULL, NEW.status, NEW.priority);
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority)
+                VALUES (OLD.supply_id, 'delete', 0, OLD.quantity, OLD.status, OLD.priority);
+            ELSIF OLD.quantity IS DISTINCT FROM NEW.quantity OR OLD.status IS DISTINCT FROM NEW.status
+                  OR OLD.priority IS DISTINCT FROM NEW.priority THEN
+                INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority)
+                VALUES (NEW.supply_id, 'update', NEW.quantity, OLD.quantity, NEW.status, NEW.priority);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        ''',
+        '''
+        CREATE OR REPLACE TRIGGER supply_history_record AFTER INSERT OR UPDATE OR DELETE ON supply
+        FOR EACH ROW EXECUTE FUNCTION supply_history_record()
+        ''',
+    ])
+    return tuple(steps)
+
+
+UNIT_READINESS_VIEW = '''
+    CREATE OR REPLACE VIEW unit_readiness AS
+    WITH staff AS (
+        SELECT unit,
+               COUNT(*) AS personnel,
+               COUNT(*) FILTER (WHERE status = 'Active') AS active_personnel
+        FROM personnel
+        GROUP BY unit
+    ),
+    stock AS (
+        SELECT location,
+               COUNT(*) AS supply_lines,
+               COUNT(*) FILTER (WHERE status = 'Available') AS available,
+               COUNT(*) FILTER (WHERE status = 'Low Stock') AS low_stock,
+               COUNT(*) FILTER (WHERE status = 'Out of Stock') AS out_of_stock,
+               COUNT(*) FILTER (WHERE priority = 'Critical') AS critical
+        FROM supply
+        GROUP BY location
+    )
+    SELECT staff.unit,
+           unit_stations.location,
+           staff.personnel,
+           staff.active_personnel,
+           COALESCE(stock.supply_lines, 0) AS supply_lines,
+           COALESCE(stock.available, 0) AS available,
+           COALESCE(stock.low_stock, 0) AS low_stock,
+           COALESCE(stock.out_of_stock, 0) AS out_of_stock,
+           COALESCE(stock.critical, 0) AS critical
+    FROM staff
+    LEFT JOIN unit_stations ON unit_stations.unit = staff.unit
+    LEFT JOIN stock ON stock.location = unit_stations.location
+'''
+
+POSTGRES_MIGRATIONS = (
+    Migration(1, "Create personnel table", (
+        f'''
+        CREATE TABLE IF NOT EXISTS personnel (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            personnel_id TEXT UNIQUE NOT NULL,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            personnel_class TEXT NOT NULL,
+            rank TEXT,
+            unit TEXT,
+            clearance_level TEXT,
+            status TEXT,
+            notes TEXT,
+            created_at TEXT DEFAULT {NOW},
+            updated_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_personnel_updated_at ON personnel (updated_at, id)",
+    ) + index_filter_columns("personnel", ("personnel_class", "status", "unit", "clearance_level"))),
+    Migration(2, "Create supply table", (
+        f'''
+        CREATE TABLE IF NOT EXISTS supply (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            supply_id TEXT UNIQUE NOT NULL,
+            supply_name TEXT NOT NULL,
+            supply_class TEXT NOT NULL,
+            supply_type TEXT NOT NULL,
+            quantity BIGINT NOT NULL,
+            unit TEXT NOT NULL,
+            status TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            location TEXT,
+            supplier TEXT,
+            notes TEXT,
+            created_at TEXT DEFAULT {NOW},
+            updated_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_supply_updated_at ON supply (updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_supply_location_status ON supply (location, status)",
+    ) + index_filter_columns("supply", ("supply_class", "status", "priority", "unit", "location"))),
+    Migration(3, "Track table versions and log row changes",
+              track_table_version("personnel") + track_table_version("supply")
+              + track_changes("personnel") + track_changes("supply")),
+    Migration(4, "Maintain supply status and priority counts",
+              track_value_counts("supply", ("status", "priority"))),
+    Migration(5, "Add geotagged locations with a viewport index", (
+        f'''
+        CREATE TABLE IF NOT EXISTS locations (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'Depot',
+            lat DOUBLE PRECISION NOT NULL CHECK (lat BETWEEN -90 AND 90),
+            lon DOUBLE PRECISION NOT NULL CHECK (lon BETWEEN -180 AND 180),
+            updated_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_locations_lat_lon ON locations (lat, lon)",
+        # Same columns as SQLite's R*Tree, so the viewport query runs unchanged
+        '''
+        CREATE OR REPLACE VIEW locations_rtree AS
+        SELECT id, lat AS min_lat, lat AS max_lat, lon AS min_lon, lon AS max_lon FROM locations
+        ''',
+    ) + track_table_version("locations") + tuple(
+        f"INSERT INTO locations (name, kind, lat, lon) VALUES ('{name}', '{kind}', {lat}, {lon}) "
+        "ON CONFLICT (name) DO NOTHING"
+        for name, kind, lat, lon in SAMPLE_LOCATIONS
+    )),
+    Migration(6, "Station units at locations and add the unit readiness view", (
+        f'''
+        CREATE TABLE IF NOT EXISTS unit_stations (
+            unit TEXT PRIMARY KEY,
+            location TEXT NOT NULL,
+            updated_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_unit_stations_location ON unit_stations (location)",
+        UNIT_READINESS_VIEW,
+    ) + track_table_version("unit_stations")),
+    Migration(7, "Record a random database id for validating snapshots", (
+        '''
+        CREATE TABLE IF NOT EXISTS database_info (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        ''',
+        "INSERT INTO database_info (key, value) VALUES ('database_id', md5(random()::text || clock_timestamp()::text)) "
+        "ON CONFLICT (key) DO NOTHING",
+    )),
+    Migration(8, "Keep supply quantity history with hourly and daily rollups", track_supply_history()),
+    Migration(9, "Maintain personnel and supply totals for the readiness cube", tuple(
+        step for args in READINESS_TOTALS for step in track_group_totals(*args)
+    ) + (f"CREATE OR REPLACE VIEW {READINESS_CUBE_SELECT}",)),
+    Migration(10, "Index personnel and supply text for full-text search",
+              index_full_text("personnel") + index_full_text("supply")),
+    Migration(11, "Add user accounts and a session signing key", (
+        f'''
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            created_at TEXT DEFAULT {NOW},
+            updated_at TEXT DEFAULT {NOW}
+        )
+        ''',
+        # gen_random_uuid() draws from the server's cryptographic random source
+        "INSERT INTO database_info (key, value) "
+        "VALUES ('session_key', replace(gen_random_uuid()::text || gen_random_uuid()::text, '-', '')) "
+        "ON CONFLICT (key) DO NOTHING",
+    )),
+    Migration(12, "Cover reads of the daily rollup by day with an index", (
+        "DROP INDEX IF EXISTS idx_supply_history_daily_bucket",
+        '''
+        CREATE INDEX IF NOT EXISTS idx_supply_history_daily_totals
+        ON supply_history_daily (bucket, supply_id) INCLUDE (consumed, received, changes)
+        ''',
+    )),
+    Migration(13, "Count account changes so older sessions end", (
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS generation BIGINT NOT NULL DEFAULT 0",
+    ) + track_table_version("users")),
+    Migration(14, "Maintain personnel totals by class and status for the breakdown chart",
+              track_group_totals("personnel", "personnel_class_totals", ("personnel_class", "status"))),
+)
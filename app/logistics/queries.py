@@ -0,0 +1,84 @@
+"""
+Keyset-paginated, filtered reads for the personnel and supply grids.
+
+Pages are ordered by ``(updated_at, id)`` and continue from the last row of
+the previous page, so fetching page N costs the same as fetching page 1 and
+only ``page_size`` rows ever leave SQLite. Filters and sort direction are
+applied in SQL against a fixed allow-list of columns.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from logistics.backend import read_frame
+
+PAGE_SIZE = 50
+
+FILTERABLE_COLUMNS = {
+    "personnel": ("personnel_class", "status", "unit", "clearance_level"),
+    "supply": ("supply_class", "status", "priority", "unit", "location"),
+}
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of rows plus the cursor needed to fetch the next one."""
+
+    rows: pd.DataFrame
+    next_cursor: tuple
+    has_more: bool
+
+
+def all_rows_query(table):
+    """Return the query behind ``get_personnel_data``/``get_supply_data``."""
+    if table not in FILTERABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+    return f"SELECT * FROM {table} ORDER BY updated_at DESC"
+
+
+def build_page_query(table, filters=None, cursor=None, descending=True, page_size=PAGE_SIZE):
+    """Return ``(sql, params)`` for one keyset page of ``table``."""
+    if table not in FILTERABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+
+    clauses = []
+    params = []
+    for column, value in (filters or {}).items():
+        if column not in FILTERABLE_COLUMNS[table]:
+            raise ValueError(f"Column {column!r} cannot be filtered on {table}")
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    if cursor is not None:
+        clauses.append(f"(updated_at, id) {'<' if descending else '>'} (?, ?)")
+        params.extend(cursor)
+
+    direction = "DESC" if descending else "ASC"
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    sql = (
+        f"SELECT * FROM {table} {where}"
+        f"ORDER BY updated_at {direction}, id {direction} LIMIT ?"
+    )
+    # One extra row tells us whether another page exists
+    params.append(page_size + 1)
+    return sql, params
+
+
+def fetch_page(conn, table, filters=None, cursor=None, descending=True, page_size=PAGE_SIZE):
+    """Fetch one page of ``table`` starting after ``cursor``."""
+    sql, params = build_page_query(table, filters, cursor, descending, page_size)
+    rows = read_frame(conn, sql, params)
+
+    has_more = len(rows) > page_size
+    rows = rows.iloc[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows.iloc[-1]
+        next_cursor = (last["updated_at"], int(last["id"]))
+    return Page(rows=rows, next_cursor=next_cursor, has_more=has_more)
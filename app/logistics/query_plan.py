@@ -0,0 +1,240 @@
+"""
+Query plan check for every query the app issues.
+
+Runs ``EXPLAIN QUERY PLAN`` over the app's queries (built by the same helpers
+the app uses) and flags any that scan a whole table, directly or by walking
+an index with no LIMIT, or sort through a temporary B-tree. Queries that
+read a whole table by design say so with ``allow_scan``. Run it after
+changing queries or indexes::
+
+    python -m logistics.query_plan                      # fresh, migrated schema
+    python -m logistics.query_plan --db logistics.db
+
+Exits non-zero when any query has a problem.
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from logistics.auth import GENERATIONS_QUERY, SESSION_KEY_QUERY, USER_QUERY
+from logistics.backend import FULL_TEXT_QUERY, is_database_url
+from logistics.cache import TABLE_VERSION_QUERY
+from logistics.changes import (
+    CHANGES_SINCE_QUERY,
+    LATEST_SEQ_QUERY,
+    OLDEST_SEQ_QUERY,
+    rows_by_id_query,
+)
+from logistics.clustering import (
+    LOCATION_COORDS_QUERY,
+    LOCATION_STATUS_COUNTS_QUERY,
+    SUPPLY_POSITION_QUERY,
+)
+from logistics.export import EXPORTABLE_TABLES
+from logistics.forecast import (
+    HALF_LIFE_DAYS,
+    LATEST_HISTORY_QUERY,
+    LINE_DETAILS_QUERY,
+    LINE_QUANTITY_QUERY,
+    TOUCHED_LINES_QUERY,
+    WINDOW_DAYS,
+)
+from logistics.geo import VIEWPORT_POINTS_QUERY
+from logistics.history import (
+    GRANULARITIES,
+    HISTORY_QUERY,
+    INVENTORY_TREND_QUERY,
+    LINE_TREND_QUERY,
+    burn_rate_query,
+    day_weights,
+    rollup_table,
+)
+from logistics.metrics import BREAKDOWN_QUERIES, SUPPLY_METRICS_QUERY
+from logistics.queries import FILTERABLE_COLUMNS, all_rows_query, build_page_query
+from logistics.readiness import READINESS_CUBE_QUERY
+from logistics.repository import LOCATION_NAMES_QUERY, UNIT_READINESS_QUERY, UNITS_QUERY
+from logistics.schema import SEARCH_COLUMNS
+from logistics.upsert import lookup_statement
+
+SAMPLE_CURSOR = ("2024-01-01T00:00:00", 1)
+SAMPLE_LINES = ("x", "y", "z")
+
+# A table read from end to end, in rowid order or walking an index
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_MATERIALIZE = re.compile(r"^MATERIALIZE (\w+)$")
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """One query the app issues, with representative parameters."""
+
+    name: str
+    sql: str
+    params: tuple = ()
+    allow_scan: bool = False
+    allow_sort: bool = False
+
+
+def app_queries():
+    """Return every query shape the app issues against the logistics database."""
+    queries = []
+    for table, columns in FILTERABLE_COLUMNS.items():
+        # A live frame's first read loads the whole table by design
+        queries.append(PlannedQuery(f"{table}: all rows", all_rows_query(table), allow_scan=True))
+        queries.append(PlannedQuery(f"{table}: version", TABLE_VERSION_QUERY, (table,)))
+        queries.append(PlannedQuery(f"{table}: upsert lookup", lookup_statement(table), ("x",)))
+        queries.append(PlannedQuery(f"{table}: latest change", LATEST_SEQ_QUERY))
+        queries.append(PlannedQuery(f"{table}: oldest change", OLDEST_SEQ_QUERY))
+        queries.append(PlannedQuery(f"{table}: changes since", CHANGES_SINCE_QUERY, (table, 0, 100)))
+        queries.append(PlannedQuery(f"{table}: changed rows", rows_by_id_query(table, 3), (1, 2, 3)))
+        for descending in (True, False):
+            order = "desc" if descending else "asc"
+            for cursor in (None, SAMPLE_CURSOR):
+                page = "first page" if cursor is None else "next page"
+                for column in (None,) + columns:
+                    filters = {column: "x"} if column else {}
+                    sql, params = build_page_query(table, filters, cursor, descending)
+                    label = f"{table}: {page} {order}" + (f" by {column}" if column else "")
+                    queries.append(PlannedQuery(label, sql, tuple(params)))
+    queries.append(PlannedQuery("supply: metric tiles", SUPPLY_METRICS_QUERY))
+    # The breakdowns read whole totals tables: a row per class and status, and
+    # for supply per location too, summed across locations in a small sort
+    queries.append(PlannedQuery("personnel: breakdown", BREAKDOWN_QUERIES["personnel"][1], allow_scan=True))
+    queries.append(PlannedQuery(
+        "supply: breakdown", BREAKDOWN_QUERIES["supply"][1], allow_scan=True, allow_sort=True
+    ))
+    queries.append(PlannedQuery("supply: locations version", TABLE_VERSION_QUERY, ("locations",)))
+    queries.append(PlannedQuery(
+        "supply: map viewport", VIEWPORT_POINTS_QUERY, (30.0, 45.0, -100.0, -80.0, 100)
+    ))
+    queries.append(PlannedQuery("supply: line position", SUPPLY_POSITION_QUERY, ("x",)))
+    # Building the clusters counts every location's lines from supply_totals:
+    # a few rows per location, whatever the number of supply lines
+    queries.append(PlannedQuery(
+        "supply: cluster counts", LOCATION_STATUS_COUNTS_QUERY, allow_scan=True, allow_sort=True
+    ))
+    # Clustering snaps every location to the grid
+    queries.append(PlannedQuery(
+        "supply: cluster locations", LOCATION_COORDS_QUERY, allow_scan=True
+    ))
+    queries.append(PlannedQuery("readiness: stations version", TABLE_VERSION_QUERY, ("unit_stations",)))
+    queries.append(PlannedQuery("readiness: units", UNITS_QUERY))
+    # The station form lists every location; there is a row per depot or cache
+    queries.append(PlannedQuery("readiness: location names", LOCATION_NAMES_QUERY, allow_scan=True))
+    # Readiness aggregates every personnel and supply row by design
+    queries.append(PlannedQuery("readiness: unit readiness", UNIT_READINESS_QUERY, allow_scan=True))
+    # The cube reads every station and totals row: a few per unit, not per record
+    queries.append(PlannedQuery("readiness: cube", READINESS_CUBE_QUERY, allow_scan=True))
+    queries.append(PlannedQuery("history: line events", HISTORY_QUERY, ("x", 100)))
+    for granularity in GRANULARITIES:
+        rollup = rollup_table(granularity)
+        queries.append(PlannedQuery(
+            f"history: {granularity} inventory trend", INVENTORY_TREND_QUERY.format(rollup=rollup), ("2024-01-01",)
+        ))
+        queries.append(PlannedQuery(
+            f"history: {granularity} line trend", LINE_TREND_QUERY.format(rollup=rollup), ("x", "2024-01-01")
+        ))
+    queries.append(PlannedQuery("forecast: latest history", LATEST_HISTORY_QUERY))
+    queries.append(PlannedQuery("forecast: touched lines", TOUCHED_LINES_QUERY, (0, 100)))
+    weights = day_weights(date(2024, 3, 10), WINDOW_DAYS, HALF_LIFE_DAYS)
+    for label, lines in (("burn rates", None), ("burn rates of lines", SAMPLE_LINES)):
+        sql, params = burn_rate_query(weights, lines)
+        # Grouping by line sorts the window's rollup rows, not the whole history
+        queries.append(PlannedQuery(f"forecast: {label}", sql, tuple(params), allow_sort=True))
+    for label, sql in (("line quantities", LINE_QUANTITY_QUERY), ("line details", LINE_DETAILS_QUERY)):
+        queries.append(PlannedQuery(f"forecast: {label}", sql.format("?, ?, ?"), SAMPLE_LINES))
+    queries.append(PlannedQuery("auth: user", USER_QUERY, ("ada",)))
+    queries.append(PlannedQuery("auth: session key", SESSION_KEY_QUERY))
+    queries.append(PlannedQuery("auth: users version", TABLE_VERSION_QUERY, ("users",)))
+    # Read only after an account was saved: one row per account
+    queries.append(PlannedQuery("auth: account generations", GENERATIONS_QUERY, allow_scan=True))
+    for table in SEARCH_COLUMNS:
+        queries.append(PlannedQuery(
+            f"{table}: search", FULL_TEXT_QUERY.format(index=f"{table}_search"), ('"alpha" AND "bravo"*', 1000)
+        ))
+    for table in EXPORTABLE_TABLES:
+        # Exports read every row by design
+        queries.append(PlannedQuery(
+            f"{table}: export", f"SELECT * FROM {table} ORDER BY id", allow_scan=True
+        ))
+    return queries
+
+
+def explain(conn, sql, params=()):
+    """Return the detail strings of ``EXPLAIN QUERY PLAN`` for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def plan_problems(details, allow_scan=False, allow_sort=False, limited=False):
+    """
+    Return the problems found in a query plan.
+
+    Walking a whole index reads as many rows as scanning the table, so it is
+    a full scan too unless ``limited``: a query with a LIMIT stops after a
+    page, which is how keyset pages read an index in order.
+    """
+    # Scanning a CTE the query built itself (say, from VALUES) reads no table
+    built = {match.group(1) for match in map(_MATERIALIZE.match, details) if match}
+    problems = []
+    for detail in details:
+        scan = _FULL_SCAN.match(detail)
+        if scan and scan.group(1) not in built and not (allow_scan or (limited and " USING " in detail)):
+            problems.append(f"full table scan ({detail})")
+        if not allow_sort and "USE TEMP B-TREE" in detail:
+            problems.append(f"unindexed sort ({detail})")
+    return problems
+
+
+def check_query_plans(pool, queries=None):
+    """
+    Explain ``queries`` (default: every app query) against ``pool``.
+
+    Returns ``[(query, details, problems)]`` for every query.
+    """
+    results = []
+    with pool.connection() as conn:
+        for query in queries or app_queries():
+            details = explain(conn, query.sql, query.params)
+            limited = bool(_LIMIT.search(query.sql))
+            results.append((query, details, plan_problems(details, query.allow_scan, query.allow_sort, limited)))
+    return results
+
+
+def main(argv=None):
+    """Command line entry point."""
+    from logistics.repository import LogisticsRepository
+
+    parser = argparse.ArgumentParser(description="Check the app's query plans for full scans.")
+    parser.add_argument("--db", help="Logistics database (default: fresh temporary copy)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args(argv)
+    if args.db and is_database_url(args.db):
+        parser.error("query plans can only be checked on a SQLite database")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        repository = LogisticsRepository(args.db or Path(scratch) / "logistics.db")
+        repository.migrate()
+        try:
+            results = check_query_plans(repository.pool)
+        finally:
+            repository.close()
+
+    failures = 0
+    for query, details, problems in results:
+        if problems:
+            failures += 1
+            print(f"FAIL {query.name}: {'; '.join(problems)}")
+        elif args.verbose:
+            print(f"ok   {query.name}: {' | '.join(details)}")
+    print(f"{len(results) - failures} of {len(results)} queries use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+The readiness cube: unit x supply class x supply status.
+
+Readiness by unit used to mean reading the personnel grid (``unit``,
+``status``) against the supply grid (``location``, ``quantity``).
+``schema.track_group_totals`` now keeps ``personnel_totals`` (heads per
+unit and status) and ``supply_totals`` (lines and quantity per location,
+supply class and status) current from triggers on every save, and the
+``readiness_cube`` view joins them through ``unit_stations``. A cube read
+touches a few rows per stationed unit, never the personnel or supply
+tables, so it costs milliseconds however many records there are.
+
+A supply location may serve several units; its stock is counted under each
+of them.
+"""
+
+import pandas as pd
+
+from logistics.backend import read_frame
+
+READINESS_CUBE_QUERY = '''
+    SELECT unit, location, supply_class, status, lines, quantity, personnel, active_personnel
+    FROM readiness_cube
+'''
+CUBE_COLUMNS = (
+    "unit", "location", "supply_class", "status", "lines", "quantity", "personnel", "active_personnel",
+)
+
+# Measures a readiness grid can show, with their labels
+READINESS_MEASURES = {
+    "ready": "Share of lines available",
+    "lines": "Supply lines",
+    "quantity": "Quantity on hand",
+}
+READY_STATUS = "Available"
+
+
+def readiness_cube(conn):
+    """Return the cube, one row per unit, supply class and status, sorted by unit."""
+    cube = read_frame(conn, READINESS_CUBE_QUERY)
+    if cube.empty:
+        return pd.DataFrame(columns=list(CUBE_COLUMNS))
+    # Sorted here: ORDER BY on the view needs a temp B-tree
+    return cube.sort_values(["unit", "supply_class", "status"], ignore_index=True)
+
+
+def readiness_grid(cube, measure="ready", status=None):
+    """
+    Collapse the cube to one cell per unit and supply class for a heatmap.
+
+    ``measure`` is one of ``READINESS_MEASURES``. ``"ready"`` is the share
+    of a cell's lines that are available (0 to 1); ``"lines"`` and
+    ``"quantity"`` are totals, over every status or just ``status``. Each
+    cell carries the unit's ``location``, ``personnel`` and
+    ``active_personnel`` for tooltips.
+    """
+    if measure not in READINESS_MEASURES:
+        raise ValueError(f"Unknown measure {measure!r}; expected one of {tuple(READINESS_MEASURES)}")
+    keys = ["unit", "supply_class"]
+    unit_columns = ["location", "personnel", "active_personnel"]
+    if cube.empty:
+        return pd.DataFrame(columns=keys + [measure] + unit_columns)
+
+    cube = cube.assign(ready=cube["lines"].where(cube["status"] == READY_STATUS, 0))
+    if status is not None and measure != "ready":
+        cube = cube[cube["status"] == status]
+    grid = cube.groupby(keys, as_index=False, sort=True).agg(
+        lines=("lines", "sum"), quantity=("quantity", "sum"), ready=("ready", "sum"),
+        **{column: (column, "first") for column in unit_columns},
+    )
+    if measure == "ready":
+        grid["ready"] = grid["ready"] / grid["lines"]
+    return grid[keys + [measure] + unit_columns]
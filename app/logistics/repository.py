@@ -0,0 +1,118 @@
+"""
+The logistics database and the cross-domain queries it makes possible.
+
+Personnel, supply, locations and unit stations share one SQLite file, so
+readiness questions ("which units are stationed where stock is running
+out?") are answered by a SQL join instead of loading both domains into
+pandas. ``LogisticsRepository`` owns the file's single connection pool and
+migrations.
+
+The file is found at an absolute path, never relative to the working
+directory: an explicit ``path``, else ``$LOGISTICS_DB``, else
+``logistics.db`` in the app directory. On first start, rows from the
+former ``personnel.db``/``supply.db`` beside it are imported.
+
+A ``postgresql://`` URL in place of the path selects the PostgreSQL backend
+(see ``logistics.postgres``), so several app replicas can share one
+database; everything above the pool works the same either way.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from logistics.backend import is_database_url, read_frame
+from logistics.pool import ConnectionPool
+from logistics.schema import MIGRATIONS, migrate
+
+DB_PATH_ENV = "LOGISTICS_DB"
+DEFAULT_DB_NAME = "logistics.db"
+APP_DIR = Path(__file__).resolve().parent.parent
+
+UNIT_READINESS_QUERY = "SELECT * FROM unit_readiness"
+STATION_UNIT_STATEMENT = '''
+    INSERT INTO unit_stations (unit, location) VALUES (?, ?)
+    ON CONFLICT (unit) DO UPDATE SET location = excluded.location, updated_at = CURRENT_TIMESTAMP
+    WHERE unit_stations.location IS NOT excluded.location
+'''
+UNITS_QUERY = "SELECT DISTINCT unit FROM personnel WHERE unit IS NOT NULL AND unit != '' ORDER BY unit"
+LOCATION_NAMES_QUERY = "SELECT name FROM locations ORDER BY name"
+
+
+def database_path(path=None):
+    """
+    Resolve the database file to an absolute path (see the module docstring).
+
+    A PostgreSQL URL is returned unchanged.
+    """
+    path = path or os.environ.get(DB_PATH_ENV) or APP_DIR / DEFAULT_DB_NAME
+    if is_database_url(path):
+        return str(path)
+    return Path(path).expanduser().resolve()
+
+
+def station_unit(conn, unit, location):
+    """Record that ``unit`` draws its supplies from ``location``."""
+    conn.execute(STATION_UNIT_STATEMENT, (unit, location))
+
+
+class LogisticsRepository:
+    """
+    The shared logistics database: one file, one pool, one migration history.
+
+    ``path`` is the file, or for PostgreSQL the server URL with any password
+    masked; ``pool_options`` go to the backend's pool. ``snapshot_dir`` is
+    where this database's columnar snapshots are kept (see
+    ``logistics.snapshot``): beside the file, or per server under the app
+    directory.
+    """
+
+    def __init__(self, path=None, **pool_options):
+        location = database_path(path)
+        if is_database_url(location):
+            # Imported here so SQLite deployments never need psycopg
+            from logistics.postgres import POSTGRES_MIGRATIONS, PostgresPool
+            self.pool = PostgresPool(location, **pool_options)
+            self.migrations = POSTGRES_MIGRATIONS
+            self.path = self.pool.path
+            digest = hashlib.sha1(self.path.encode()).hexdigest()[:12]
+            self.snapshot_dir = APP_DIR / "snapshots" / digest
+        else:
+            location.parent.mkdir(parents=True, exist_ok=True)
+            self.pool = ConnectionPool(location, **pool_options)
+            self.migrations = MIGRATIONS
+            self.path = location
+            self.snapshot_dir = location.parent / f"{location.stem}-snapshots"
+
+    def migrate(self):
+        """Bring the database to the current schema; returns the versions applied."""
+        return migrate(self.pool, self.migrations)
+
+    def connection(self):
+        """Check out a connection for the current thread."""
+        return self.pool.connection()
+
+    def transaction(self, fn):
+        """Run ``fn(conn)`` in a write transaction."""
+        return self.pool.transaction(fn)
+
+    def unit_readiness(self):
+        """Return personnel strength per unit joined with stock at its station."""
+        with self.connection() as conn:
+            readiness = read_frame(conn, UNIT_READINESS_QUERY)
+        # Sorted here: one row per unit, and ORDER BY on the view needs a temp B-tree
+        return readiness.sort_values("unit", ignore_index=True)
+
+    def units(self):
+        """Return the distinct units personnel are assigned to."""
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute(UNITS_QUERY)]
+
+    def location_names(self):
+        """Return every known location name."""
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute(LOCATION_NAMES_QUERY)]
+
+    def close(self):
+        """Close the pool's idle connections."""
+        self.pool.close()
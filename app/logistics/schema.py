@@ -0,0 +1,826 @@
+"""
+Versioned schema migrations.
+
+The app keeps every domain in one database, migrated by ``MIGRATIONS``
+(the personnel, supply and shared lists chained in that order). Each
+database carries a ``schema_migrations`` table recording which numbered
+migrations have been applied. ``migrate`` applies any newer ones in order, each
+in its own write transaction, so the schema only moves forward and an already
+current database costs a single read. The app runs this once per process at
+startup instead of issuing ``CREATE TABLE IF NOT EXISTS`` on every rerun.
+"""
+
+import sqlite3
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from logistics.backend import serialize_migrations, table_exists
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One forward schema step: SQL statements and/or callables taking a connection."""
+
+    version: int
+    description: str
+    steps: tuple
+
+
+def add_column(table, column, definition):
+    """Return a migration step that adds a column unless it already exists."""
+    def step(conn):
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def track_table_version(table):
+    """
+    Return migration steps that keep ``table_versions`` in step with ``table``.
+
+    Triggers bump the table's counter on every insert, update and delete, so
+    readers can tell whether anything changed with a single primary-key
+    lookup, whichever process or connection made the write.
+    """
+    steps = [
+        '''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        f"INSERT OR IGNORE INTO table_versions (table_name, version) VALUES ('{table}', 0)",
+    ]
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        steps.append(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_after_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+        END
+        ''')
+    return tuple(steps)
+
+
+CHANGE_LOG_RETENTION = 10000
+
+
+def track_changes(table, retention=CHANGE_LOG_RETENTION):
+    """
+    Return migration steps that append every row change of ``table`` to ``change_log``.
+
+    Each insert, update and delete records the row id and operation under a
+    monotonically increasing ``seq`` (AUTOINCREMENT never reuses a value), so
+    a reader holding the last ``seq`` it saw can fetch exactly the rows that
+    changed since. Only the newest ``retention`` entries are kept; a reader
+    that falls further behind reloads in full.
+    """
+    steps = [
+        '''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_change_log_table_seq ON change_log (table_name, seq)",
+        f'''
+        CREATE TRIGGER IF NOT EXISTS change_log_retention AFTER INSERT ON change_log
+        BEGIN
+            DELETE FROM change_log WHERE seq <= NEW.seq - {int(retention)};
+        END
+        ''',
+    ]
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        steps.append(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_change_log_after_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op) VALUES ('{table}', {row}.id, '{event.lower()}');
+        END
+        ''')
+    return tuple(steps)
+
+
+def track_value_counts(table, columns):
+    """
+    Return migration steps that maintain ``{table}_counts`` for ``columns``.
+
+    The counter table holds one row per (column, value) plus a ``('*', '*')``
+    row for the total, backfilled from existing data and kept current by
+    triggers, so dashboard tiles read a handful of rows however large the
+    table grows.
+    """
+    counts = f"{table}_counts"
+    steps = [
+        f'''
+        CREATE TABLE IF NOT EXISTS {counts} (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+        ''',
+        f"DELETE FROM {counts}",
+        f"INSERT INTO {counts} (dimension, value, count) SELECT '*', '*', COUNT(*) FROM {table}",
+    ]
+    for column in columns:
+        steps.append(
+            f"INSERT INTO {counts} (dimension, value, count) "
+            f"SELECT '{column}', {column}, COUNT(*) FROM {table} "
+            f"WHERE {column} IS NOT NULL GROUP BY {column}"
+        )
+
+    def bump(row, delta):
+        statements = [
+            f"UPDATE {counts} SET count = count + ({delta}) WHERE dimension = '*' AND value = '*';"
+        ]
+        for column in columns:
+            statements.append(
+                f"INSERT INTO {counts} (dimension, value, count) "
+                f"SELECT '{column}', {row}.{column}, {delta} WHERE {row}.{column} IS NOT NULL "
+                f"ON CONFLICT (dimension, value) DO UPDATE SET count = count + ({delta});"
+            )
+        return "\n            ".join(statements)
+
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+    steps.extend([
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {counts}_after_insert AFTER INSERT ON {table}
+        BEGIN
+            {bump("NEW", 1)}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {counts}_after_delete AFTER DELETE ON {table}
+        BEGIN
+            {bump("OLD", -1)}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {counts}_after_update
+        AFTER UPDATE OF {", ".join(columns)} ON {table} WHEN {changed}
+        BEGIN
+            {bump("OLD", -1)}
+            {bump("NEW", 1)}
+        END
+        ''',
+    ])
+    return tuple(steps)
+
+
+def track_group_totals(table, totals, keys, sums=()):
+    """
+    Return migration steps that maintain ``totals``: ``table`` grouped by ``keys``.
+
+    One row per distinct combination of ``keys`` holds the number of rows
+    (``count``) and the total of each column in ``sums``, backfilled from
+    existing data and kept current by triggers. A group's row is removed
+    when its last row goes. Missing keys are grouped under ``''`` and
+    missing sums count as zero.
+    """
+    key_list = ", ".join(keys)
+    columns = ", ".join((*keys, "count", *sums))
+    steps = [
+        f'''
+        CREATE TABLE IF NOT EXISTS {totals} (
+            {" ".join(f"{key} TEXT NOT NULL," for key in keys)}
+            count INTEGER NOT NULL DEFAULT 0,
+            {" ".join(f"{column} INTEGER NOT NULL DEFAULT 0," for column in sums)}
+            PRIMARY KEY ({key_list})
+        ) WITHOUT ROWID
+        ''',
+        f"DELETE FROM {totals}",
+        f'''
+        INSERT INTO {totals} ({columns})
+        SELECT {", ".join(f"COALESCE({key}, '')" for key in keys)}, COUNT(*)
+               {"".join(f", SUM(COALESCE({column}, 0))" for column in sums)}
+        FROM {table}
+        GROUP BY {", ".join(f"COALESCE({key}, '')" for key in keys)}
+        ''',
+    ]
+
+    def bump(row, delta):
+        values = ", ".join(
+            [f"COALESCE({row}.{key}, '')" for key in keys] + [str(delta)]
+            + [f"({delta}) * COALESCE({row}.{column}, 0)" for column in sums]
+        )
+        updates = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in ("count", *sums)
+        )
+        statements = [
+            f"INSERT INTO {totals} ({columns}) VALUES ({values}) "
+            f"ON CONFLICT ({key_list}) DO UPDATE SET {updates};"
+        ]
+        if delta < 0:
+            match = " AND ".join(f"{key} = COALESCE({row}.{key}, '')" for key in keys)
+            statements.append(f"DELETE FROM {totals} WHERE {match} AND count = 0;")
+        return "\n            ".join(statements)
+
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in (*keys, *sums))
+    steps.extend([
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {totals}_after_insert AFTER INSERT ON {table}
+        BEGIN
+            {bump("NEW", 1)}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {totals}_after_delete AFTER DELETE ON {table}
+        BEGIN
+            {bump("OLD", -1)}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {totals}_after_update
+        AFTER UPDATE OF {", ".join((*keys, *sums))} ON {table} WHEN {changed}
+        BEGIN
+            {bump("OLD", -1)}
+            {bump("NEW", 1)}
+        END
+        ''',
+    ])
+    return tuple(steps)
+
+
+def index_filter_columns(table, columns):
+    """
+    Return steps creating one ``(column, updated_at)`` index per filter column.
+
+    With the implicit rowid (``id``) as the trailing key, each index serves an
+    equality filter, the ``(updated_at, id)`` keyset cursor and the sort order
+    together, so a page read touches only the rows it returns.
+    """
+    return tuple(
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_updated_at ON {table} ({column}, updated_at)"
+        for column in columns
+    )
+
+
+LOCATION_STEPS = (
+    '''
+    CREATE TABLE IF NOT EXISTS locations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        kind TEXT NOT NULL DEFAULT 'Depot',
+        lat REAL NOT NULL CHECK (lat BETWEEN -90 AND 90),
+        lon REAL NOT NULL CHECK (lon BETWEEN -180 AND 180),
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    "CREATE VIRTUAL TABLE IF NOT EXISTS locations_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    '''
+    CREATE TRIGGER IF NOT EXISTS locations_rtree_after_insert AFTER INSERT ON locations
+    BEGIN
+        INSERT INTO locations_rtree VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS locations_rtree_after_update AFTER UPDATE OF lat, lon ON locations
+    BEGIN
+        UPDATE locations_rtree
+        SET min_lat = NEW.lat, max_lat = NEW.lat, min_lon = NEW.lon, max_lon = NEW.lon
+        WHERE id = NEW.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS locations_rtree_after_delete AFTER DELETE ON locations
+    BEGIN
+        DELETE FROM locations_rtree WHERE id = OLD.id;
+    END
+    ''',
+)
+
+# The five sample sites the map showed before locations were stored
+SAMPLE_LOCATIONS = (
+    ("New York", "Depot", 40.7128, -74.0060),
+    ("Los Angeles", "Depot", 34.0522, -118.2437),
+    ("Chicago", "Depot", 41.8781, -87.6298),
+    ("Houston", "Depot", 29.7604, -95.3698),
+    ("Phoenix", "Depot", 33.4484, -112.0740),
+)
+
+SEED_LOCATION_STEPS = tuple(
+    f"INSERT OR IGNORE INTO locations (name, kind, lat, lon) VALUES ('{name}', '{kind}', {lat}, {lon})"
+    for name, kind, lat, lon in SAMPLE_LOCATIONS
+)
+
+
+PERSONNEL_MIGRATIONS = (
+    Migration(1, "Create personnel table", (
+        '''
+        CREATE TABLE IF NOT EXISTS personnel (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            personnel_id TEXT UNIQUE NOT NULL,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            personnel_class TEXT NOT NULL,
+            rank TEXT,
+            unit TEXT,
+            clearance_level TEXT,
+            status TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    )),
+    Migration(2, "Index personnel by last update", (
+        "CREATE INDEX IF NOT EXISTS idx_personnel_updated_at ON personnel (updated_at)",
+    )),
+    Migration(3, "Track personnel table version", track_table_version("personnel")),
+    Migration(4, "Index personnel filter columns",
+              index_filter_columns("personnel", ("personnel_class", "status", "unit", "clearance_level"))
+              + ("ANALYZE personnel",)),
+    Migration(5, "Log personnel row changes for incremental reads", track_changes("personnel")),
+)
+
+SUPPLY_MIGRATIONS = (
+    Migration(1, "Create supply table", (
+        '''
+        CREATE TABLE IF NOT EXISTS supply (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supply_id TEXT UNIQUE NOT NULL,
+            supply_name TEXT NOT NULL,
+            supply_class TEXT NOT NULL,
+            supply_type TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            unit TEXT NOT NULL,
+            status TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            location TEXT,
+            supplier TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    )),
+    Migration(2, "Index supply by last update", (
+        "CREATE INDEX IF NOT EXISTS idx_supply_updated_at ON supply (updated_at)",
+    )),
+    Migration(3, "Track supply table version", track_table_version("supply")),
+    Migration(4, "Maintain supply status and priority counts",
+              track_value_counts("supply", ("status", "priority"))),
+    Migration(5, "Index supply filter columns",
+              index_filter_columns("supply", ("supply_class", "status", "priority", "unit", "location"))
+              + ("ANALYZE supply",)),
+    Migration(6, "Add geotagged locations with an R*Tree index",
+              LOCATION_STEPS + track_table_version("locations") + SEED_LOCATION_STEPS),
+    Migration(7, "Index supply by location and status for map clustering", (
+        "CREATE INDEX IF NOT EXISTS idx_supply_location_status ON supply (location, status)",
+    )),
+    Migration(8, "Log supply row changes for incremental reads", track_changes("supply")),
+)
+
+
+def chain(*groups):
+    """
+    Renumber groups of migrations into one consecutive sequence.
+
+    Used to apply the per-domain migration lists, each numbered from 1, to a
+    single shared database in a fixed order.
+    """
+    migrations = []
+    for group in groups:
+        for migration in sorted(group, key=lambda m: m.version):
+            migrations.append(replace(migration, version=len(migrations) + 1))
+    return tuple(migrations)
+
+
+# Former per-domain database files and the tables they held
+LEGACY_DATABASES = (
+    ("personnel.db", ("personnel",)),
+    ("supply.db", ("supply", "locations")),
+)
+
+# Rows are copied with their ids, except where a fresh database already seeded some
+_LEGACY_SKIP_COLUMNS = {"locations": {"id"}}
+
+
+def _copy_legacy_table(source, conn, table, chunk_size=5000):
+    source_columns = [row[1] for row in source.execute(f"PRAGMA table_info({table})")]
+    if not source_columns:
+        return
+    target_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    columns = [
+        c for c in source_columns
+        if c in target_columns and c not in _LEGACY_SKIP_COLUMNS.get(table, ())
+    ]
+    names = ", ".join(columns)
+    insert = f"INSERT OR IGNORE INTO {table} ({names}) VALUES ({', '.join('?' * len(columns))})"
+    cursor = source.execute(f"SELECT {names} FROM {table}")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        conn.executemany(insert, rows)
+
+
+def import_legacy_databases(conn):
+    """
+    Migration step copying rows from ``personnel.db``/``supply.db`` beside the database.
+
+    The files are opened read-only and left in place. Existing rows win on
+    any natural key conflict, and every trigger (versions, counts, change
+    log, R*Tree) fires as for a normal insert.
+    """
+    main_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not main_file:
+        return
+    main_path = Path(main_file).resolve()
+    for filename, tables in LEGACY_DATABASES:
+        legacy = main_path.parent / filename
+        if not legacy.is_file() or legacy.resolve() == main_path:
+            continue
+        source = sqlite3.connect(f"{legacy.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            for table in tables:
+                _copy_legacy_table(source, conn, table)
+        finally:
+            source.close()
+
+
+UNIT_READINESS_VIEW = '''
+    CREATE VIEW IF NOT EXISTS unit_readiness AS
+    WITH staff AS (
+        SELECT unit,
+               COUNT(*) AS personnel,
+               SUM(status = 'Active') AS active_personnel
+        FROM personnel
+        GROUP BY unit
+    ),
+    stock AS (
+        SELECT location,
+               COUNT(*) AS supply_lines,
+               SUM(status = 'Available') AS available,
+               SUM(status = 'Low Stock') AS low_stock,
+               SUM(status = 'Out of Stock') AS out_of_stock,
+               SUM(priority = 'Critical') AS critical
+        FROM supply
+        GROUP BY location
+    )
+    SELECT staff.unit,
+           unit_stations.location,
+           staff.personnel,
+           staff.active_personnel,
+           COALESCE(stock.supply_lines, 0) AS supply_lines,
+           COALESCE(stock.available, 0) AS available,
+           COALESCE(stock.low_stock, 0) AS low_stock,
+           COALESCE(stock.out_of_stock, 0) AS out_of_stock,
+           COALESCE(stock.critical, 0) AS critical
+    FROM staff
+    LEFT JOIN unit_stations ON unit_stations.unit = staff.unit
+    LEFT JOIN stock ON stock.location = unit_stations.location
+'''
+
+# Totals kept per group by ``track_group_totals`` for the readiness cube
+READINESS_TOTALS = (
+    ("personnel", "personnel_totals", ("unit", "status"), ()),
+    ("supply", "supply_totals", ("location", "supply_class", "status"), ("quantity",)),
+)
+# Unit x supply class x supply status: the stock at each stationed unit's
+# location with the unit's personnel strength, read from the totals alone.
+# Shared by both backends (PostgreSQL sums BIGINTs to NUMERIC, hence the
+# casts); prefixed with each backend's CREATE VIEW.
+READINESS_CUBE_SELECT = '''
+    readiness_cube AS
+    WITH staff AS (
+        SELECT unit,
+               CAST(SUM(count) AS BIGINT) AS personnel,
+               CAST(SUM(CASE WHEN status = 'Active' THEN count ELSE 0 END) AS BIGINT) AS active_personnel
+        FROM personnel_totals
+        GROUP BY unit
+    )
+    SELECT unit_stations.unit,
+           unit_stations.location,
+           stock.supply_class,
+           stock.status,
+           stock.count AS lines,
+           stock.quantity,
+           COALESCE(staff.personnel, 0) AS personnel,
+           COALESCE(staff.active_personnel, 0) AS active_personnel
+    FROM unit_stations
+    JOIN supply_totals stock ON stock.location = unit_stations.location
+    LEFT JOIN staff ON staff.unit = unit_stations.unit
+'''
+
+# Columns indexed for full-text search, with the weights ``search`` ranks
+# hits by: a hit in a name counts for more than one in the notes
+SEARCH_COLUMNS = {
+    "personnel": (("first_name", 4.0), ("last_name", 4.0), ("unit", 2.0), ("notes", 1.0)),
+    "supply": (("supply_name", 4.0), ("supplier", 2.0), ("location", 2.0), ("notes", 1.0)),
+}
+
+
+def index_full_text(table, columns=None):
+    """
+    Return migration steps creating ``{table}_search``, an FTS5 index over ``table``.
+
+    The index is external-content: it stores only the inverted index and
+    reads column values from ``table`` by ``id``, so the text is not kept
+    twice. Triggers keep it in step with every insert and delete and with
+    updates to the indexed columns; existing rows are indexed by a
+    ``rebuild``. ``columns`` defaults to ``SEARCH_COLUMNS[table]``. Prefix
+    indexes for two to six characters let a half-typed word be read in id
+    order like a whole one; without them FTS5 merges the posting list of
+    every word it starts before returning a single row.
+    """
+    columns = columns or SEARCH_COLUMNS[table]
+    index = f"{table}_search"
+    names = [column for column, _ in columns]
+
+    def values(row):
+        return ", ".join(f"{row}.{column}" for column in names)
+
+    remove = f"INSERT INTO {index} ({index}, rowid, {', '.join(names)}) VALUES ('delete', OLD.id, {values('OLD')});"
+    add = f"INSERT INTO {index} (rowid, {', '.join(names)}) VALUES (NEW.id, {values('NEW')});"
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in names)
+    return (
+        f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+            {", ".join(names)},
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3 4 5 6'
+        )
+        ''',
+        f"INSERT INTO {index} ({index}) VALUES ('rebuild')",
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {index}_after_insert AFTER INSERT ON {table}
+        BEGIN
+            {add}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {index}_after_delete AFTER DELETE ON {table}
+        BEGIN
+            {remove}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {index}_after_update
+        AFTER UPDATE OF {", ".join(names)} ON {table} WHEN {changed}
+        BEGIN
+            {remove}
+            {add}
+        END
+        ''',
+    )
+
+
+# Rollup granularity -> expression truncating a ``YYYY-MM-DD HH:MM:SS`` text
+# timestamp to the start of its bucket; plain text functions, so both
+# backends share them
+HISTORY_BUCKETS = {
+    "hourly": "substr({}, 1, 13) || ':00:00'",
+    "daily": "substr({}, 1, 10) || ' 00:00:00'",
+}
+# Stock drawn down and received by the history event in row {0}
+HISTORY_CONSUMED = (
+    "CASE WHEN {0}.op = 'update' AND {0}.quantity < {0}.previous_quantity "
+    "THEN {0}.previous_quantity - {0}.quantity ELSE 0 END"
+)
+HISTORY_RECEIVED = (
+    "CASE WHEN {0}.op IN ('insert', 'update') AND {0}.quantity > COALESCE({0}.previous_quantity, 0) "
+    "THEN {0}.quantity - COALESCE({0}.previous_quantity, 0) ELSE 0 END"
+)
+# The supply rows on record when history starts, stamped with their last update
+HISTORY_BASELINE = '''
+    INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority, recorded_at)
+    SELECT supply_id, 'baseline', quantity, quantity, status, priority,
+           COALESCE(substr(replace(updated_at, 'T', ' '), 1, 19), {now})
+    FROM supply
+    ORDER BY updated_at, id
+'''
+
+
+def track_supply_history():
+    """
+    Return migration steps keeping an append-only history of supply quantities.
+
+    Triggers on ``supply`` append a ``supply_history`` event (quantity
+    before and after, status, priority) for every insert, delete and
+    change to those columns, so overwriting a row no longer loses what it
+    held. Each event is folded into ``supply_history_hourly`` and
+    ``supply_history_daily`` as it is appended: one row per line and bucket
+    with opening, closing, low and high quantity and the stock consumed and
+    received, so trends and burn rates over months read a few rows per line
+    rather than every event. The rows on record at migration time seed the
+    history as ``baseline`` events.
+    """
+    steps = [
+        '''
+        CREATE TABLE IF NOT EXISTS supply_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supply_id TEXT NOT NULL,
+            op TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            previous_quantity INTEGER,
+            status TEXT,
+            priority TEXT,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_supply_history_supply_id ON supply_history (supply_id, id)",
+    ]
+    for event in ("UPDATE", "DELETE"):
+        steps.append(f'''
+        CREATE TRIGGER IF NOT EXISTS supply_history_no_{event.lower()} BEFORE {event} ON supply_history
+        BEGIN
+            SELECT RAISE(ABORT, 'supply_history is append-only');
+        END
+        ''')
+    for granularity, bucket in HISTORY_BUCKETS.items():
+        rollup = f"supply_history_{granularity}"
+        steps.extend([
+            f'''
+            CREATE TABLE IF NOT EXISTS {rollup} (
+                supply_id TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                opening_quantity INTEGER NOT NULL,
+                closing_quantity INTEGER NOT NULL,
+                min_quantity INTEGER NOT NULL,
+                max_quantity INTEGER NOT NULL,
+                consumed INTEGER NOT NULL DEFAULT 0,
+                received INTEGER NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0,
+                status TEXT,
+                priority TEXT,
+                PRIMARY KEY (supply_id, bucket)
+            ) WITHOUT ROWID
+            ''',
+            f"CREATE INDEX IF NOT EXISTS idx_{rollup}_bucket ON {rollup} (bucket)",
+            f'''
+            CREATE TRIGGER IF NOT EXISTS {rollup}_after_insert AFTER INSERT ON supply_history
+            BEGIN
+                INSERT INTO {rollup} (supply_id, bucket, opening_quantity, closing_quantity,
+                                      min_quantity, max_quantity, consumed, received, changes,
+                                      status, priority)
+                VALUES (NEW.supply_id, {bucket.format("NEW.recorded_at")},
+                        COALESCE(NEW.previous_quantity, 0), NEW.quantity,
+                        min(COALESCE(NEW.previous_quantity, 0), NEW.quantity),
+                        max(COALESCE(NEW.previous_quantity, 0), NEW.quantity),
+                        {HISTORY_CONSUMED.format("NEW")}, {HISTORY_RECEIVED.format("NEW")}, 1,
+                        NEW.status, NEW.priority)
+                ON CONFLICT (supply_id, bucket) DO UPDATE SET
+                    closing_quantity = excluded.closing_quantity,
+                    min_quantity = min(min_quantity, excluded.closing_quantity),
+                    max_quantity = max(max_quantity, excluded.closing_quantity),
+                    consumed = consumed + excluded.consumed,
+                    received = received + excluded.received,
+                    changes = changes + 1,
+                    status = excluded.status,
+                    priority = excluded.priority;
+            END
+            ''',
+        ])
+    steps.append(HISTORY_BASELINE.format(now="CURRENT_TIMESTAMP"))
+    record = (
+        "INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority) "
+        "VALUES ({})"
+    )
+    steps.extend([
+        f'''
+        CREATE TRIGGER IF NOT EXISTS supply_history_after_insert AFTER INSERT ON supply
+        BEGIN
+            {record.format("NEW.supply_id, 'insert', NEW.quantity, NULL, NEW.status, NEW.priority")};
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS supply_history_after_update
+        AFTER UPDATE OF quantity, status, priority ON supply
+        WHEN OLD.quantity IS NOT NEW.quantity OR OLD.status IS NOT NEW.status
+             OR OLD.priority IS NOT NEW.priority
+        BEGIN
+            {record.format("NEW.supply_id, 'update', NEW.quantity, OLD.quantity, NEW.status, NEW.priority")};
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS supply_history_after_delete AFTER DELETE ON supply
+        BEGIN
+            {record.format("OLD.supply_id, 'delete', 0, OLD.quantity, OLD.status, OLD.priority")};
+        END
+        ''',
+    ])
+    return tuple(steps)
+
+
+# Steps for the shared database. PERSONNEL_MIGRATIONS and SUPPLY_MIGRATIONS
+# are frozen now that they are chained ahead of these (appending to them
+# would renumber everything after); new migrations are appended here.
+SHARED_MIGRATIONS = (
+    Migration(1, "Import rows from the former personnel.db and supply.db", (import_legacy_databases,)),
+    Migration(2, "Station units at locations and add the unit readiness view", (
+        '''
+        CREATE TABLE IF NOT EXISTS unit_stations (
+            unit TEXT PRIMARY KEY,
+            location TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_unit_stations_location ON unit_stations (location)",
+        UNIT_READINESS_VIEW,
+    ) + track_table_version("unit_stations")),
+    Migration(3, "Record a random database id for validating snapshots", (
+        '''
+        CREATE TABLE IF NOT EXISTS database_info (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        ''',
+        "INSERT OR IGNORE INTO database_info (key, value) VALUES ('database_id', lower(hex(randomblob(16))))",
+    )),
+    Migration(4, "Keep supply quantity history with hourly and daily rollups", track_supply_history()),
+    Migration(5, "Maintain personnel and supply totals for the readiness cube", tuple(
+        step for args in READINESS_TOTALS for step in track_group_totals(*args)
+    ) + (f"CREATE VIEW IF NOT EXISTS {READINESS_CUBE_SELECT}",)),
+    Migration(6, "Index personnel and supply text for full-text search",
+              index_full_text("personnel") + index_full_text("supply")),
+    Migration(7, "Add user accounts and a session signing key", (
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        "INSERT OR IGNORE INTO database_info (key, value) VALUES ('session_key', lower(hex(randomblob(32))))",
+    )),
+    # Burn rates read whole days of the daily rollup; covering the columns
+    # they and the inventory trend sum keeps those reads in the index
+    Migration(8, "Cover reads of the daily rollup by day with an index", (
+        "DROP INDEX IF EXISTS idx_supply_history_daily_bucket",
+        '''
+        CREATE INDEX IF NOT EXISTS idx_supply_history_daily_totals
+        ON supply_history_daily (bucket, supply_id, consumed, received, changes)
+        ''',
+    )),
+    # Every account save bumps its generation, and the users version tells
+    # running processes to re-check the sessions they have cached
+    Migration(9, "Count account changes so older sessions end", (
+        add_column("users", "generation", "INTEGER NOT NULL DEFAULT 0"),
+    ) + track_table_version("users")),
+    # Supply's breakdown chart sums supply_totals; personnel_totals is per unit
+    Migration(10, "Maintain personnel totals by class and status for the breakdown chart",
+              track_group_totals("personnel", "personnel_class_totals", ("personnel_class", "status"))),
+)
+
+# One database for every domain
+MIGRATIONS = chain(PERSONNEL_MIGRATIONS, SUPPLY_MIGRATIONS, SHARED_MIGRATIONS)
+
+
+def _ensure_migrations_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def current_version(conn):
+    """Return the highest applied migration version, or 0 for a fresh database."""
+    if not table_exists(conn, "schema_migrations"):
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+
+def migrate(pool, migrations):
+    """
+    Apply every migration newer than the database's version.
+
+    Returns the list of versions applied by this call. The version is re-read
+    inside each write transaction, so concurrent processes starting against the
+    same file apply each migration exactly once.
+    """
+    with pool.connection() as conn:
+        if current_version(conn) >= max(m.version for m in migrations):
+            return []
+
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        def apply(conn, migration=migration):
+            serialize_migrations(conn)
+            _ensure_migrations_table(conn)
+            if current_version(conn) >= migration.version:
+                return False
+            for step in migration.steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (migration.version, migration.description),
+            )
+            return True
+
+        if pool.transaction(apply):
+            applied.append(migration.version)
+    return applied
@@ -0,0 +1,176 @@
+"""
+Columnar snapshots of the personnel and supply tables for cold reads.
+
+A process without the tables in memory (a restart, a new replica, an
+evicted cache entry) otherwise rebuilds each one from a full ``SELECT *``,
+turning every row into Python objects. ``SnapshotStore`` keeps one Arrow
+IPC file per table beside the database, with the low-cardinality columns
+(status, priority, classes, units) dictionary-encoded, and memory-maps it
+on load, so a cold read costs little more than paging the file in.
+
+Each file records the change log position, database id and schema version
+it was written at. A loaded snapshot is a ``LiveFrame`` like any other:
+``refresh_frame`` brings it up to date by re-reading only the rows changed
+since, and falls back to a full SQL read when the snapshot is older than
+the change log's retention. Files from another database or schema version
+are ignored.
+
+Snapshots are written from frames already in memory, never by querying
+again, at most once every ``interval`` seconds per table, on a background
+thread, and replaced atomically so readers never see a partial file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+
+from logistics.changes import LiveFrame
+from logistics.frames import CATEGORY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL_SECONDS = 60.0
+FORMAT_VERSION = 2
+
+DICTIONARY_COLUMNS = {table: tuple(columns) for table, columns in CATEGORY_COLUMNS.items()}
+
+DATABASE_ID_QUERY = "SELECT value FROM database_info WHERE key = 'database_id'"
+
+_METADATA_KEY = b"logistics"
+
+
+def database_id(conn):
+    """Return the random id the database was created with."""
+    row = conn.execute(DATABASE_ID_QUERY).fetchone()
+    return row[0] if row else None
+
+
+def frame_to_arrow(frame, table):
+    """Convert a table frame to Arrow with its low-cardinality columns dictionary-encoded."""
+    arrow = pa.Table.from_pandas(frame, preserve_index=False)
+    for column in DICTIONARY_COLUMNS.get(table, ()):
+        index = arrow.schema.get_field_index(column)
+        if index >= 0 and not pa.types.is_dictionary(arrow.schema.field(index).type):
+            arrow = arrow.set_column(index, column, arrow.column(index).dictionary_encode())
+    return arrow
+
+
+class SnapshotStore:
+    """
+    Arrow snapshots of tables for one database.
+
+    ``database_id`` and ``schema_version`` identify the database the process
+    is connected to; snapshots written for anything else are not loaded.
+    """
+
+    def __init__(self, directory, database_id, schema_version, interval=SNAPSHOT_INTERVAL_SECONDS):
+        self.directory = Path(directory)
+        self.database_id = database_id
+        self.schema_version = schema_version
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._saved = {}  # table -> (seq, monotonic time) of the last write
+        self._writers = {}
+
+    @property
+    def enabled(self):
+        return pa is not None
+
+    def path(self, table):
+        return self.directory / f"{table}.arrow"
+
+    def load(self, table):
+        """Return the table's snapshot as a ``LiveFrame``, or None if there is no usable one."""
+        if not self.enabled:
+            return None
+        try:
+            with pa.memory_map(str(self.path(table))) as source:
+                arrow = pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            return None
+        except (OSError, pa.ArrowException):
+            logger.warning("Ignoring unreadable snapshot %s", self.path(table), exc_info=True)
+            return None
+
+        metadata = json.loads((arrow.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+        if (metadata.get("format") != FORMAT_VERSION
+                or metadata.get("table") != table
+                or metadata.get("database_id") != self.database_id
+                or metadata.get("schema_version") != self.schema_version):
+            return None
+        # Dictionary columns arrive as Categoricals; split blocks avoid a consolidation copy
+        return LiveFrame(table, metadata["seq"], arrow.to_pandas(split_blocks=True))
+
+    def save(self, live):
+        """Write ``live`` as the table's snapshot, replacing any previous one."""
+        arrow = frame_to_arrow(live.frame, live.table)
+        metadata = dict(arrow.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps({
+            "format": FORMAT_VERSION,
+            "table": live.table,
+            "seq": live.seq,
+            "database_id": self.database_id,
+            "schema_version": self.schema_version,
+        }).encode()
+        arrow = arrow.replace_schema_metadata(metadata)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{live.table}.", suffix=".tmp")
+        try:
+            # Uncompressed, so a load can map the buffers instead of decoding them
+            with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, arrow.schema) as writer:
+                writer.write_table(arrow)
+            os.replace(tmp, self.path(live.table))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            self._saved[live.table] = (live.seq, time.monotonic())
+
+    def save_in_background(self, live):
+        """
+        Snapshot ``live`` on a background thread if the table's snapshot is due.
+
+        Due means older than ``interval`` seconds and behind ``live``; returns
+        True if a write was started.
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            seq, saved_at = self._saved.get(live.table, (None, None))
+            writer = self._writers.get(live.table)
+            if seq == live.seq or (writer is not None and writer.is_alive()):
+                return False
+            if saved_at is not None and time.monotonic() - saved_at < self.interval:
+                return False
+            writer = threading.Thread(
+                target=self._save_logged, args=(live,), name=f"snapshot:{live.table}", daemon=True
+            )
+            self._writers[live.table] = writer
+            # Counts as written now, so a failing write is not retried on every read
+            self._saved[live.table] = (live.seq, time.monotonic())
+        writer.start()
+        return True
+
+    def _save_logged(self, live):
+        try:
+            self.save(live)
+        except Exception:
+            logger.exception("Writing the %s snapshot failed", live.table)
+
+    def flush(self, timeout=None):
+        """Wait for background writes to finish."""
+        with self._lock:
+            writers = list(self._writers.values())
+        for writer in writers:
+            writer.join(timeout)
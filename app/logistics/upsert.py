@@ -0,0 +1,90 @@
+"""
+Identity-preserving upserts for personnel and supply records.
+
+``INSERT OR REPLACE`` deletes the existing row and inserts a new one, which
+allocates a new ``id``, resets ``created_at`` and rewrites every index entry.
+These helpers use ``INSERT ... ON CONFLICT (<natural key>) DO UPDATE``
+instead: an existing row keeps its identity, only changed columns are
+assigned, and a submission identical to what is stored writes nothing at
+all (``updated_at`` included).
+"""
+
+from logistics.domain import PERSONNEL_COLUMNS, SUPPLY_COLUMNS
+
+INSERTED = "inserted"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+TABLE_KEYS = {
+    "personnel": ("personnel_id", PERSONNEL_COLUMNS),
+    "supply": ("supply_id", SUPPLY_COLUMNS),
+}
+
+
+def _insert_clause(table):
+    _, columns = TABLE_KEYS[table]
+    names = columns + ("updated_at",)
+    return (
+        f"INSERT INTO {table} ({', '.join(names)}) "
+        f"VALUES ({', '.join(':' + name for name in names)})"
+    )
+
+
+def lookup_statement(table):
+    """Return the statement reading a stored record by its natural key."""
+    key, columns = TABLE_KEYS[table]
+    return f"SELECT {', '.join(columns)} FROM {table} WHERE {key} = ?"
+
+
+def upsert_statement(table):
+    """
+    Return a static upsert statement for ``executemany``.
+
+    Every data column is assigned on conflict, but the ``WHERE`` guard turns
+    rows whose values all match into no-ops, so ``cursor.rowcount`` counts
+    only rows actually inserted or updated.
+    """
+    key, columns = TABLE_KEYS[table]
+    data_columns = [c for c in columns if c != key]
+    assignments = ", ".join(f"{c} = excluded.{c}" for c in data_columns + ["updated_at"])
+    guard = " OR ".join(f"{table}.{c} IS NOT excluded.{c}" for c in data_columns)
+    return (
+        f"{_insert_clause(table)} ON CONFLICT ({key}) DO UPDATE SET {assignments} "
+        f"WHERE {guard}"
+    )
+
+
+def upsert_record(conn, table, record):
+    """
+    Insert or update one record and report which happened.
+
+    Must run inside a write transaction (see ``ConnectionPool.transaction``)
+    so the stored row cannot change between the comparison and the write.
+    Returns ``INSERTED``, ``UPDATED`` or ``UNCHANGED``.
+    """
+    key, columns = TABLE_KEYS[table]
+    params = {column: record.get(column) for column in columns + ("updated_at",)}
+
+    existing = conn.execute(lookup_statement(table), (params[key],)).fetchone()
+    if existing is None:
+        conn.execute(_insert_clause(table), params)
+        return INSERTED
+
+    changed = [
+        column for column, stored in zip(columns, existing)
+        if column != key and params[column] != stored
+    ]
+    if not changed:
+        return UNCHANGED
+
+    assignments = ", ".join(f"{c} = excluded.{c}" for c in changed + ["updated_at"])
+    conn.execute(
+        f"{_insert_clause(table)} ON CONFLICT ({key}) DO UPDATE SET {assignments}", params
+    )
+    return UPDATED
+
+
+def upsert_many(conn, table, records):
+    """Upsert an iterable of record dicts; return how many rows were written."""
+    cursor = conn.executemany(upsert_statement(table), records)
+    return cursor.rowcount
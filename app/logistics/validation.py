@@ -0,0 +1,140 @@
+"""
+Validation rules shared by the entry forms and bulk import.
+
+Rules are declared once per table. ``validate_record`` applies them to a
+single form submission; ``validate_frame`` applies the same rules to a whole
+DataFrame chunk with vectorized column operations.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from logistics.domain import (
+    CLEARANCE_LEVELS,
+    PERSONNEL_CLASSES,
+    PERSONNEL_STATUSES,
+    SUPPLY_CLASSES,
+    SUPPLY_PRIORITIES,
+    SUPPLY_STATUSES,
+    SUPPLY_TYPES,
+    SUPPLY_UNITS,
+)
+
+
+@dataclass(frozen=True)
+class TableRules:
+    """Required fields, fixed-choice fields and non-negative numbers for one table."""
+
+    required: tuple
+    choices: tuple = ()
+    non_negative: tuple = ()
+
+
+RULES = {
+    "personnel": TableRules(
+        required=(
+            ("personnel_id", "Personnel ID"),
+            ("first_name", "First Name"),
+            ("last_name", "Last Name"),
+            ("personnel_class", "Personnel Class"),
+        ),
+        choices=(
+            ("personnel_class", "Personnel Class", PERSONNEL_CLASSES),
+            ("clearance_level", "Clearance Level", CLEARANCE_LEVELS),
+            ("status", "Status", PERSONNEL_STATUSES),
+        ),
+    ),
+    "supply": TableRules(
+        required=(
+            ("supply_id", "Supply ID"),
+            ("supply_name", "Supply Name"),
+            ("supply_class", "Supply Class"),
+            ("supply_type", "Supply Type"),
+            ("quantity", "Quantity"),
+            ("unit", "Unit"),
+            ("status", "Status"),
+            ("priority", "Priority"),
+        ),
+        choices=(
+            ("supply_class", "Supply Class", SUPPLY_CLASSES),
+            ("supply_type", "Supply Type", SUPPLY_TYPES),
+            ("unit", "Unit", SUPPLY_UNITS),
+            ("status", "Status", SUPPLY_STATUSES),
+            ("priority", "Priority", SUPPLY_PRIORITIES),
+        ),
+        non_negative=(("quantity", "Quantity"),),
+    ),
+}
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() == ""
+
+
+def validate_record(table, record):
+    """Return the list of error messages for one record (empty when valid)."""
+    rules = RULES[table]
+    errors = []
+    for column, label in rules.required:
+        if _is_blank(record.get(column)):
+            errors.append(f"{label} is required")
+    for column, label, allowed in rules.choices:
+        value = record.get(column)
+        if not _is_blank(value) and value not in allowed:
+            errors.append(f"{label} must be one of: {', '.join(allowed)}")
+    for column, label in rules.non_negative:
+        value = record.get(column)
+        if _is_blank(value):
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            errors.append(f"{label} must be a whole number")
+            continue
+        if number < 0:
+            errors.append(f"{label} must be non-negative")
+        elif not number.is_integer():
+            errors.append(f"{label} must be a whole number")
+    return errors
+
+
+def validate_frame(table, df):
+    """
+    Validate every row of ``df`` at once.
+
+    Returns ``(valid, rejected)``: the rows passing every rule, and the failing
+    rows with an added ``errors`` column joining their messages.
+    """
+    rules = RULES[table]
+    errors = pd.Series("", index=df.index, dtype=object)
+
+    def flag(mask, message):
+        nonlocal errors
+        errors = errors + np.where(mask, message + "; ", "")
+
+    def blank(column):
+        if column not in df:
+            return pd.Series(True, index=df.index)
+        values = df[column]
+        return values.isna() | (values.astype(str).str.strip() == "")
+
+    for column, label in rules.required:
+        flag(blank(column), f"{label} is required")
+    for column, label, allowed in rules.choices:
+        if column in df:
+            flag(~blank(column) & ~df[column].isin(allowed), f"{label} must be one of: {', '.join(allowed)}")
+    for column, label in rules.non_negative:
+        if column not in df:
+            continue
+        numbers = pd.to_numeric(df[column], errors="coerce")
+        present = ~blank(column)
+        flag(present & numbers.isna(), f"{label} must be a whole number")
+        flag(present & (numbers < 0), f"{label} must be non-negative")
+        flag(present & (numbers >= 0) & (numbers % 1 != 0), f"{label} must be a whole number")
+
+    bad = errors != ""
+    rejected = df[bad].copy()
+    rejected["errors"] = errors[bad].str.rstrip("; ")
+    return df[~bad], rejected
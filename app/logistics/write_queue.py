@@ -0,0 +1,204 @@
+"""
+Single-writer queue with group commit.
+
+SQLite admits one writer at a time, so concurrent form submissions from
+many sessions otherwise queue up on the write lock, each paying for its own
+``BEGIN IMMEDIATE``/``COMMIT``. A ``WriteQueue`` owns one background thread
+per database that takes every pending write off the queue and runs the
+batch in a single transaction, one ``SAVEPOINT`` per write so a failing
+write is rolled back alone. Callers get a ``concurrent.futures.Future`` that
+resolves to their write's result once the batch has committed.
+
+``stats()`` reports queue depth, batch sizes and commit and end-to-end
+latencies; ``metrics_hook`` receives ``("batch", size)`` and
+``("commit", seconds)`` events as they happen.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class WriteQueueStats:
+    """Counters describing write queue throughput and latency."""
+
+    submitted: int = 0
+    committed: int = 0
+    failed: int = 0
+    batches: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    max_batch: int = 0
+    commit_seconds: float = 0.0
+    max_commit_seconds: float = 0.0
+    latency_seconds: float = 0.0
+
+    @property
+    def mean_batch(self):
+        """Average writes per committed batch."""
+        return (self.committed + self.failed) / self.batches if self.batches else 0.0
+
+    @property
+    def mean_commit_seconds(self):
+        """Average time spent running and committing one batch."""
+        return self.commit_seconds / self.batches if self.batches else 0.0
+
+    @property
+    def mean_latency_seconds(self):
+        """Average time from ``submit`` to the write's result being available."""
+        done = self.committed + self.failed
+        return self.latency_seconds / done if done else 0.0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class WriteQueue:
+    """
+    Run submitted writes on one background thread, committing them in groups.
+
+    ``max_batch`` caps the writes per transaction. Each batch takes whatever
+    has queued up while the previous one committed, so batches grow with the
+    load on their own; ``linger`` optionally holds a batch open a few more
+    seconds for stragglers, at the cost of latency for lone writes.
+    """
+
+    def __init__(self, pool, max_batch=100, linger=0.0, metrics_hook=None):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.linger = linger
+        self.metrics_hook = metrics_hook
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = WriteQueueStats()
+        self._thread = None
+        self._closed = False
+
+    def _emit(self, event, value):
+        if self.metrics_hook is None:
+            return
+        try:
+            self.metrics_hook(event, value)
+        except Exception:
+            logger.exception("Write queue metrics hook failed")
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"write-queue:{self.pool.path}", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, fn):
+        """
+        Queue ``fn(conn)`` to run in a write transaction; return a ``Future`` of its result.
+
+        The future raises whatever ``fn`` raised, or the commit error if the
+        whole batch failed.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Write queue for {self.pool.path} is closed")
+            self._ensure_started()
+            self._stats.submitted += 1
+            self._stats.depth += 1
+            self._stats.max_depth = max(self._stats.max_depth, self._stats.depth)
+            self._queue.put((fn, future, time.perf_counter()))
+        return future
+
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.linger
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Finish this batch, then stop
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._commit(batch)
+
+    def _commit(self, batch):
+        def run_batch(conn):
+            outcomes = []
+            for fn, _, _ in batch:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    outcomes.append((True, fn(conn)))
+                    conn.execute("RELEASE queued_write")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((False, e))
+            return outcomes
+
+        started = time.perf_counter()
+        try:
+            outcomes = self.pool.transaction(run_batch)
+        except Exception as e:
+            outcomes = [(False, e)] * len(batch)
+        finished = time.perf_counter()
+        elapsed = finished - started
+
+        with self._lock:
+            self._stats.batches += 1
+            self._stats.depth -= len(batch)
+            self._stats.max_batch = max(self._stats.max_batch, len(batch))
+            self._stats.commit_seconds += elapsed
+            self._stats.max_commit_seconds = max(self._stats.max_commit_seconds, elapsed)
+            for (_, _, submitted_at), (ok, _) in zip(batch, outcomes):
+                self._stats.latency_seconds += finished - submitted_at
+                if ok:
+                    self._stats.committed += 1
+                else:
+                    self._stats.failed += 1
+        self._emit("batch", len(batch))
+        self._emit("commit", elapsed)
+
+        for (_, future, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self):
+        """Return a snapshot of the queue counters."""
+        with self._lock:
+            return WriteQueueStats(**self._stats.as_dict())
+
+    def close(self, timeout=None):
+        """Stop accepting writes, let queued ones commit and stop the writer thread."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+
+def log_write_event(event, value):
+    """Default metrics hook: log write queue activity at debug level."""
+    logger.debug("write queue %s: %s", event, value)
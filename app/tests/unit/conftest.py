@@ -0,0 +1,40 @@
+"""
+Shared fixtures and record builders for the unit tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.repository import LogisticsRepository
+
+
+def supply_record(supply_id="S-1", **fields):
+    """Build a complete supply record for ``upsert_record``; ``fields`` replace the defaults."""
+    record = {
+        "supply_id": supply_id, "supply_name": f"Item {supply_id}", "supply_class": "Fuel",
+        "supply_type": "Consumable", "quantity": 1, "unit": "Each", "status": "Available",
+        "priority": "Medium", "location": "Depot", "supplier": "", "notes": "",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Create a migrated logistics database."""
+    repository = LogisticsRepository(tmp_path / "logistics.db")
+    repository.migrate()
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def pool(repository):
+    """Return the connection pool of the migrated logistics database."""
+    return repository.pool
@@ -0,0 +1,84 @@
+"""
+Unit tests for the viewer, logistician and admin access levels of the app,
+using Streamlit's AppTest class against a scratch database.
+"""
+
+import os
+import sys
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import app
+from logistics.auth import save_user
+from logistics.repository import DB_PATH_ENV
+from tests.unit.conftest import supply_record
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "app.py")
+
+SAVE_BUTTONS = ("Save Personnel Data", "Save Supply Data")
+
+
+class TestAccessControl:
+    """Test class for what viewers and signed-in users may change."""
+
+    @pytest.fixture(autouse=True)
+    def database(self, tmp_path, monkeypatch):
+        """Point the app at a scratch database with one logistician."""
+        monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "logistics.db"))
+        st.cache_resource.clear()
+        app.init_schema()
+        app.get_repository().transaction(lambda conn: save_user(conn, "ada", "correct horse", "Logistician"))
+        yield
+        st.session_state.pop("session_token", None)
+        app.get_snapshot_store().flush()
+        st.cache_resource.clear()
+
+    def _supply_rows(self, supply_id):
+        with app.get_connection_pool().connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM supply WHERE supply_id = ?", (supply_id,)).fetchone()[0]
+
+    def _run(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=30)
+        at.run()
+        assert not at.exception, f"App should load without errors, but got: {at.exception}"
+        return at
+
+    def test_viewer_sees_no_edit_forms(self):
+        """Test that a viewer gets the sign-in prompt instead of the personnel and supply forms."""
+        at = self._run()
+        labels = [button.label for button in at.button]
+        assert not any(label in labels for label in SAVE_BUTTONS)
+        warnings = [warning.value for warning in at.warning]
+        assert any("add or update personnel records" in warning for warning in warnings)
+        assert any("add or update supply records" in warning for warning in warnings)
+
+    def test_signed_in_logistician_sees_edit_forms(self):
+        """Test that signing in as a logistician shows the personnel and supply forms."""
+        at = self._run()
+        inputs = {text_input.label: text_input for text_input in at.text_input}
+        inputs["Username"].input("ada")
+        inputs["Password"].input("correct horse")
+        next(button for button in at.button if button.label == "Sign in").click()
+        at.run()
+        assert not at.exception
+        labels = [button.label for button in at.button]
+        assert all(label in labels for label in SAVE_BUTTONS)
+        assert any("Signed in as **ada** (Logistician)" in caption.value for caption in at.caption)
+
+    def test_viewer_save_is_rejected(self):
+        """Test that calling a save without a signed-in editor writes nothing."""
+        assert app.save_supply_data(supply_record("ACCESS-1")) is None
+        assert self._supply_rows("ACCESS-1") == 0
+
+        st.session_state["session_token"] = app.get_session_store().issue("alan", "Viewer")
+        assert app.save_supply_data(supply_record("ACCESS-1")) is None
+        assert self._supply_rows("ACCESS-1") == 0
+
+        st.session_state["session_token"] = app.get_session_store().issue("ada", "Logistician")
+        assert app.save_supply_data(supply_record("ACCESS-1")) == "inserted"
+        assert self._supply_rows("ACCESS-1") == 1
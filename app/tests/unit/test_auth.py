@@ -0,0 +1,193 @@
+"""
+Unit tests for user accounts, password hashing and cached session tokens.
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.auth import (
+    SessionStore,
+    authenticate,
+    has_permission,
+    hash_password,
+    main,
+    save_user,
+    session_key,
+    verify_password,
+)
+from logistics.repository import LogisticsRepository
+
+
+class FakeClock:
+    """A settable stand-in for ``time.time``."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestAuth:
+    """Test class for sign-in, session tokens and the role matrix."""
+
+    @pytest.fixture
+    def repository(self, repository):
+        """Add one logistician to the migrated database."""
+        repository.transaction(lambda conn: save_user(conn, "Ada", "correct horse", "Logistician"))
+        return repository
+
+    @pytest.fixture
+    def clock(self):
+        """Provide a fake clock for expiry tests."""
+        return FakeClock()
+
+    @pytest.fixture
+    def store(self, clock):
+        """Create a session store with a fixed key and a fake clock."""
+        return SessionStore(b"k" * 32, ttl_seconds=3600, clock=clock)
+
+    def _authenticate(self, repository, username, password):
+        with repository.connection() as conn:
+            return authenticate(conn, username, password)
+
+    def test_password_hashes(self):
+        """Test that hashes are salted scrypt and only the right password verifies."""
+        encoded = hash_password("s3cret")
+        assert encoded.startswith("scrypt$16384$8$1$")
+        assert encoded != hash_password("s3cret")
+        assert verify_password("s3cret", encoded)
+        assert not verify_password("s3cre", encoded)
+        assert not verify_password("s3cret", "plain$s3cret")
+        assert not verify_password("s3cret", "garbage")
+
+    def test_authenticate(self, repository):
+        """Test that sign-in returns the role and generation for the right password only."""
+        assert self._authenticate(repository, " ADA ", "correct horse") == ("Logistician", 0)
+        assert self._authenticate(repository, "ada", "wrong horse") is None
+        assert self._authenticate(repository, "grace", "correct horse") is None
+        with repository.connection() as conn:
+            stored = conn.execute("SELECT password_hash FROM users WHERE username = 'ada'").fetchone()[0]
+        assert "correct horse" not in stored
+
+    def test_save_user_resets_password_and_role(self, repository):
+        """Test that saving an existing user replaces their password and role."""
+        repository.transaction(lambda conn: save_user(conn, "ada", "new horse", "Admin"))
+        assert self._authenticate(repository, "ada", "correct horse") is None
+        assert self._authenticate(repository, "ada", "new horse") == ("Admin", 1)
+        with pytest.raises(ValueError):
+            repository.transaction(lambda conn: save_user(conn, "ada", "x", "Quartermaster"))
+        with pytest.raises(ValueError):
+            repository.transaction(lambda conn: save_user(conn, " ", "x", "Admin"))
+
+    def test_role_matrix(self, store):
+        """Test the README's access matrix."""
+        logistician = store.resolve(store.issue("ada", "Logistician"))
+        admin = store.resolve(store.issue("grace", "Admin"))
+        viewer = store.resolve(store.issue("alan", "Viewer"))
+        assert has_permission(logistician, "edit_records")
+        assert not has_permission(logistician, "edit_base_info")
+        assert has_permission(admin, "edit_records") and has_permission(admin, "edit_base_info")
+        assert not has_permission(viewer, "edit_records")
+        assert not has_permission(None, "edit_records")
+
+    def test_reruns_hit_the_cache(self, store):
+        """Test that resolving an issued token needs no signature check."""
+        token = store.issue("ada", "Logistician")
+        for _ in range(3):
+            assert store.resolve(token).role == "Logistician"
+        stats = store.stats()
+        assert (stats.cache_hits, stats.signature_checks, stats.active) == (3, 0, 1)
+
+    def test_tokens_are_checked_by_signature_elsewhere(self, store, clock):
+        """Test that another process with the same key accepts a token and rejects a forgery."""
+        token = store.issue("ada", "Logistician")
+        replica = SessionStore(b"k" * 32, clock=clock)
+        assert replica.resolve(token).username == "ada"
+        assert replica.resolve(token).username == "ada"
+        assert replica.stats().signature_checks == 1
+
+        signature = token.split(".")[1]
+        forged = store.issue("ada", "Admin").split(".")[0] + "." + signature
+        assert replica.resolve(forged) is None
+        assert SessionStore(b"x" * 32, clock=clock).resolve(token) is None
+        assert replica.resolve("not-a-token") is None
+        assert replica.stats().rejected == 2
+
+    def test_tokens_expire(self, store, clock):
+        """Test that a token stops working after its lifetime, cached or not."""
+        token = store.issue("ada", "Logistician")
+        clock.now += 3599
+        assert store.resolve(token) is not None
+        clock.now += 2
+        assert store.resolve(token) is None
+        assert SessionStore(b"k" * 32, clock=clock).resolve(token) is None
+
+    def test_sign_out(self, store):
+        """Test that a signed-out token stays rejected even when re-checked by signature."""
+        first = store.issue("ada", "Logistician")
+        second = store.issue("ada", "Logistician")
+        store.revoke(first)
+        assert store.resolve(first) is None
+        assert store.resolve(second) is not None
+
+    def test_account_changes_end_sessions(self, repository, store, clock):
+        """Test that resetting an account, in another process, ends its sessions everywhere."""
+        repository.transaction(lambda conn: save_user(conn, "grace", "hunter2", "Admin"))
+        with repository.connection() as conn:
+            store.sync(conn)
+            ada = store.issue("ada", *authenticate(conn, "ada", "correct horse"))
+            grace = store.issue("grace", *authenticate(conn, "grace", "hunter2"))
+        assert store.resolve(ada).role == "Logistician"
+
+        # The command line resets ada's password from a process of its own
+        repository.transaction(lambda conn: save_user(conn, "ada", "new horse", "Viewer"))
+        assert store.resolve(ada) is not None  # until the next sync
+        with repository.connection() as conn:
+            store.sync(conn)
+            replica = SessionStore(b"k" * 32, clock=clock)
+            replica.sync(conn)
+        assert store.resolve(ada) is None
+        assert replica.resolve(ada) is None
+        assert store.resolve(grace) is not None and replica.resolve(grace) is not None
+        assert replica.resolve(replica.issue("ada", "Viewer", 1)).role == "Viewer"
+        assert store.resolve(store.issue("alan", "Admin")) is None
+
+    def test_sync_reads_accounts_only_after_a_change(self, repository, store):
+        """Test that syncing with no account saved since costs only the version lookup."""
+        with repository.connection() as conn:
+            store.sync(conn)
+            generations = store._generations
+            store.sync(conn)
+            assert store._generations is generations
+            save_user(conn, "grace", "hunter2", "Admin")
+            store.sync(conn)
+            assert store._generations == {"ada": 0, "grace": 0}
+
+    def test_session_key_is_shared(self, repository, tmp_path):
+        """Test that every process opening the database signs with the same random key."""
+        with repository.connection() as conn:
+            key = session_key(conn)
+        again = LogisticsRepository(tmp_path / "logistics.db")
+        again.migrate()
+        with again.connection() as conn:
+            assert session_key(conn) == key
+        again.close()
+        assert len(key) == 32
+
+    def test_command_line(self, tmp_path, monkeypatch, capsys):
+        """Test creating an account from the command line with the password on stdin."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("hunter2\n"))
+        path = tmp_path / "cli.db"
+        assert main(["Grace", "--role", "Admin", "--db", str(path)]) == 0
+        assert "Saved grace as Admin" in capsys.readouterr().out
+        repository = LogisticsRepository(path)
+        assert self._authenticate(repository, "grace", "hunter2") == ("Admin", 0)
+        repository.close()
+
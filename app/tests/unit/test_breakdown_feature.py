@@ -0,0 +1,139 @@
+"""
+Unit tests for the personnel and supply breakdown charts, which read the
+trigger-maintained totals, and for the whole-table reads the app keeps
+current through the change log.
+"""
+
+import os
+import sys
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import app
+from logistics import changes
+from logistics.auth import save_user
+from logistics.domain import PERSONNEL_CLASSES, SUPPLY_CLASSES, SUPPLY_STATUSES
+from logistics.repository import DB_PATH_ENV
+from tests.unit.conftest import supply_record
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "app.py")
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    """Point the app at a scratch database, signed in as a logistician."""
+    monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "logistics.db"))
+    st.cache_resource.clear()
+    app.init_schema()
+    app.get_repository().transaction(lambda conn: save_user(conn, "ada", "correct horse", "Logistician"))
+    st.session_state["session_token"] = app.get_session_store().issue("ada", "Logistician")
+    st.session_state.pop("live_frames", None)
+    yield
+    st.session_state.pop("session_token", None)
+    st.session_state.pop("live_frames", None)
+    app.get_snapshot_store().flush()
+    st.cache_resource.clear()
+
+
+@pytest.fixture
+def full_reads(monkeypatch):
+    """Count full table reads made by the live frames."""
+    reads = []
+    load_frame = changes.load_frame
+    monkeypatch.setattr(changes, "load_frame", lambda conn, table: reads.append(table) or load_frame(conn, table))
+    return reads
+
+
+class TestBreakdown:
+    """Test class for the breakdown charts."""
+
+    def _counts(self, table):
+        counts = app.get_breakdown(table)
+        column = counts.columns[0]
+        return {(row[column], row["status"]): row["count"] for _, row in counts.iterrows() if row["count"]}
+
+    def test_breakdown_lists_every_class_and_status_in_order(self):
+        """Test that the chart's axes cover every class and status, in domain order."""
+        app.save_supply_data(supply_record("S-1"))
+        counts = app.get_breakdown("supply")
+        assert len(counts) == len(SUPPLY_CLASSES) * len(SUPPLY_STATUSES)
+        assert list(dict.fromkeys(counts["supply_class"])) == SUPPLY_CLASSES
+        assert list(dict.fromkeys(counts["status"])) == SUPPLY_STATUSES
+        assert app.get_breakdown("personnel").empty
+
+    def test_breakdown_follows_saves_from_the_totals(self, full_reads):
+        """Test that saves reach the counts, summed across locations, without reading a table."""
+        for i in range(3):
+            app.save_supply_data(supply_record(f"S-{i}", location=f"Depot 00{i}"))
+        assert self._counts("supply") == {("Fuel", "Available"): 3}
+
+        app.save_supply_data(supply_record("S-0", status="Reserved"))
+        app.save_supply_data(supply_record("S-9", supply_class="Ammunition"))
+        assert self._counts("supply") == {
+            ("Fuel", "Available"): 2, ("Fuel", "Reserved"): 1, ("Ammunition", "Available"): 1,
+        }
+
+        app.save_personnel_data({
+            "personnel_id": "P-1", "first_name": "Ada", "last_name": "King", "personnel_class": "Officer",
+            "rank": "Captain", "unit": "1st Battalion", "clearance_level": "Secret",
+            "status": "Active", "notes": "", "updated_at": "2024-03-10T12:00:00",
+        })
+        counts = app.get_breakdown("personnel")
+        assert list(dict.fromkeys(counts["personnel_class"])) == PERSONNEL_CLASSES
+        assert self._counts("personnel") == {("Officer", "Active"): 1}
+        assert full_reads == []
+
+    def test_breakdown_is_cached_until_the_table_changes(self, monkeypatch):
+        """Test that reruns reuse the counts without querying the totals."""
+        app.save_supply_data(supply_record("S-1"))
+        first = app.get_breakdown("supply")
+        monkeypatch.setattr(app, "breakdown", lambda conn, table: pytest.fail("totals re-read"))
+        assert app.get_breakdown("supply") is first
+
+    def test_app_renders_breakdowns_without_loading_tables(self, full_reads):
+        """Test that the page shows a breakdown for personnel and for supply and reads no whole table."""
+        app.save_supply_data(supply_record("S-1"))
+        at = AppTest.from_file(APP_PATH, default_timeout=30)
+        at.run()
+        assert not at.exception, f"App should load without errors, but got: {at.exception}"
+        labels = [expander.label for expander in at.expander]
+        assert "📊 Personnel by class and status" in labels
+        assert "📊 Supply by class and status" in labels
+        assert full_reads == []
+
+
+class TestLiveTables:
+    """Test class for the whole-table reads behind ``get_supply_data``."""
+
+    def test_saves_reach_the_table_without_reloading(self, full_reads):
+        """Test that after the first read, saves reach the table as row deltas."""
+        for i in range(3):
+            app.save_supply_data(supply_record(f"S-{i}"))
+        assert len(app.get_supply_data()) == 3
+        assert full_reads == ["supply"]
+
+        app.save_supply_data(supply_record("S-0", status="Reserved"))
+        app.save_supply_data(supply_record("S-9", supply_class="Ammunition"))
+        frame = app.get_supply_data().set_index("supply_id")
+        assert frame.loc["S-0", "status"] == "Reserved"
+        assert len(frame) == 4
+        assert full_reads == ["supply"]
+
+    def test_restart_starts_from_the_snapshot(self, full_reads):
+        """Test that a restarted process reads the snapshot and the changes since, not the table."""
+        app.save_supply_data(supply_record("S-1"))
+        app.get_supply_data()
+        app.get_snapshot_store().flush()
+        assert app.get_snapshot_store().path("supply").exists()
+
+        # A restart: the process-wide caches and this session's frames are gone
+        st.cache_resource.clear()
+        st.session_state.pop("live_frames", None)
+        app.save_supply_data(supply_record("S-2"))
+        assert sorted(app.get_supply_data()["supply_id"]) == ["S-1", "S-2"]
+        assert full_reads == ["supply"]
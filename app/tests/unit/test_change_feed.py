@@ -0,0 +1,116 @@
+"""
+Unit tests for the change log and incremental table reads.
+"""
+
+import os
+import sys
+from dataclasses import replace
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.changes import latest_seq, load_frame, refresh_frame
+from logistics.repository import LogisticsRepository
+from logistics.schema import MIGRATIONS, migrate, track_changes
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+# The change log migrations, by description; the first creates the shared retention trigger
+CHANGE_LOG_MIGRATIONS = {
+    "Log personnel row changes for incremental reads": "personnel",
+    "Log supply row changes for incremental reads": "supply",
+}
+
+
+class TestChangeFeed:
+    """Test class for incremental reads from the change log."""
+
+    @pytest.fixture
+    def pool(self, pool):
+        """Seed the migrated logistics database with two rows."""
+        self._save(pool, supply_record("S-1", updated_at="2024-01-01T00:00:00"))
+        self._save(pool, supply_record("S-2", updated_at="2024-01-02T00:00:00"))
+        return pool
+
+    def _save(self, pool, record):
+        return pool.transaction(lambda conn: upsert_record(conn, "supply", record))
+
+    def _refresh(self, pool, live, **kwargs):
+        with pool.connection() as conn:
+            return refresh_frame(conn, live, **kwargs)
+
+    def _load(self, pool):
+        with pool.connection() as conn:
+            return load_frame(conn, "supply")
+
+    def test_triggers_log_every_operation(self, pool):
+        """Test that inserts, updates and deletes are logged in order."""
+        self._save(pool, supply_record("S-1", quantity=5))
+        pool.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-2'"))
+        with pool.connection() as conn:
+            ops = [row[0] for row in conn.execute("SELECT op FROM change_log ORDER BY seq")]
+        assert ops == ["insert", "insert", "update", "delete"]
+
+    def test_unchanged_refresh_returns_same_frame(self, pool):
+        """Test that a refresh with no new changes does no work."""
+        live = self._load(pool)
+        assert self._refresh(pool, live) is live
+
+    def test_refresh_applies_deltas(self, pool):
+        """Test that inserts, updates and deletes are applied to the cached frame."""
+        live = self._load(pool)
+        self._save(pool, supply_record("S-1", quantity=7, updated_at="2024-01-03T00:00:00"))
+        self._save(pool, supply_record("S-3", updated_at="2024-01-04T00:00:00"))
+        pool.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-2'"))
+
+        refreshed = self._refresh(pool, live)
+        expected = self._load(pool)
+        assert refreshed.seq == expected.seq
+        assert refreshed.frame.equals(expected.frame)
+        assert list(refreshed.frame["supply_id"]) == ["S-3", "S-1"]
+        assert len(live.frame) == 2
+
+    def test_out_of_order_timestamps_are_sorted(self, pool):
+        """Test that an edit with an older timestamp keeps updated_at order."""
+        live = self._load(pool)
+        self._save(pool, supply_record("S-2", quantity=3, updated_at="2023-12-31T00:00:00"))
+        refreshed = self._refresh(pool, live)
+        assert list(refreshed.frame["supply_id"]) == ["S-1", "S-2"]
+
+    def test_first_read_loads_in_full(self, pool):
+        """Test that a reader with no frame gets the whole table."""
+        live = self._refresh(pool, None, table="supply")
+        assert len(live.frame) == 2
+        with pool.connection() as conn:
+            assert live.seq == latest_seq(conn)
+
+    def test_large_backlog_reloads(self, pool):
+        """Test that more changes than max_changes fall back to a full read."""
+        live = self._load(pool)
+        for i in range(3):
+            self._save(pool, supply_record(f"S-1{i}"))
+        refreshed = self._refresh(pool, live, max_changes=2)
+        assert len(refreshed.frame) == 5
+
+    def test_reader_behind_retention_reloads(self, tmp_path):
+        """Test that pruned log entries force a full reload."""
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        pool = repository.pool
+        migrate(pool, tuple(
+            replace(m, steps=track_changes(CHANGE_LOG_MIGRATIONS[m.description], retention=2))
+            if m.description in CHANGE_LOG_MIGRATIONS else m
+            for m in MIGRATIONS
+        ))
+        try:
+            self._save(pool, supply_record("S-1"))
+            live = self._load(pool)
+            for i in range(4):
+                self._save(pool, supply_record(f"S-2{i}"))
+            with pool.connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0] == 2
+            refreshed = self._refresh(pool, live)
+            assert len(refreshed.frame) == 5
+        finally:
+            repository.close()
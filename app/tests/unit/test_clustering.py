@@ -0,0 +1,124 @@
+"""
+Unit tests for map point clustering.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.clustering import (
+    DETAIL_ZOOM,
+    ClusterIndex,
+    cell_size,
+    grid_cells,
+    supply_position,
+)
+from logistics.geo import Viewport, map_version, save_location
+from logistics.schema import SAMPLE_LOCATIONS
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+INSERT_SUPPLY = (
+    "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, "
+    "unit, status, priority, location) VALUES (?, 'Item', 'Fuel', 'Consumable', 1, 'Each', ?, "
+    "'Medium', ?)"
+)
+
+CONTINENTAL_US = Viewport(south=24.0, west=-125.0, north=50.0, east=-66.0)
+
+
+class TestClustering:
+    """Test class for the map cluster index."""
+
+    @pytest.fixture
+    def pool(self, pool):
+        """Seed the migrated logistics database with stock at two sites."""
+        pool.transaction(lambda conn: conn.executemany(INSERT_SUPPLY, [
+            ("S-1", "Available", "Phoenix"),
+            ("S-2", "Low Stock", "Phoenix"),
+            ("S-3", "Available", "Chicago"),
+        ]))
+        return pool
+
+    def _index(self, pool):
+        index = ClusterIndex()
+        with pool.connection() as conn:
+            index.refresh(conn)
+        return index
+
+    def _save(self, pool, index, record):
+        def write(conn):
+            before = map_version(conn)
+            previous = supply_position(conn, record["supply_id"])
+            upsert_record(conn, "supply", record)
+            return before, previous, map_version(conn)
+
+        before, previous, after = pool.transaction(write)
+        return index.record_change(before, after, previous, (record["location"], record["status"]))
+
+    def test_world_view_merges_everything(self, pool):
+        """Test that at zoom 0 the continental sites fall into few cells."""
+        clusters = self._index(pool).clusters(0)
+        assert clusters["locations"].sum() == len(SAMPLE_LOCATIONS)
+        assert clusters["items"].sum() == 3
+        assert len(clusters) < len(SAMPLE_LOCATIONS)
+
+    def test_close_zoom_separates_sites(self, pool):
+        """Test that at a close zoom every site has its own cluster."""
+        clusters = self._index(pool).clusters(DETAIL_ZOOM - 1)
+        assert len(clusters) == len(SAMPLE_LOCATIONS)
+        assert (clusters["locations"] == 1).all()
+
+    def test_worst_status(self, pool):
+        """Test that a cluster reports the worst status it contains."""
+        clusters = self._index(pool).clusters(DETAIL_ZOOM - 1)
+        worst = dict(zip(clusters["items"], clusters["worst_status"]))
+        assert worst[2] == "Low Stock"
+        assert worst[1] == "Available"
+        assert set(clusters.loc[clusters["items"] == 0, "worst_status"]) == {""}
+
+    def test_viewport_filter(self, pool):
+        """Test that clusters outside the viewport are dropped."""
+        index = self._index(pool)
+        clusters = index.clusters(DETAIL_ZOOM - 1, Viewport(south=33.0, west=-113.0, north=34.0, east=-111.0))
+        assert list(clusters["items"]) == [2]
+
+    def test_save_is_applied_incrementally(self, pool):
+        """Test that an app save moves a line between cells without a rebuild."""
+        index = self._index(pool)
+        index.clusters(3)
+        tiers = index._tiers
+        assert self._save(pool, index, supply_record("S-2", location="Chicago", status="Out of Stock"))
+        assert index._tiers is tiers
+
+        rebuilt = self._index(pool)
+        for zoom in (3, DETAIL_ZOOM - 1):
+            incremental = index.clusters(zoom).sort_values(["lat", "lon"]).reset_index(drop=True)
+            expected = rebuilt.clusters(zoom).sort_values(["lat", "lon"]).reset_index(drop=True)
+            assert incremental.equals(expected)
+
+    def test_new_line_is_added(self, pool):
+        """Test that inserting a line adds it to its cell."""
+        index = self._index(pool)
+        assert self._save(pool, index, supply_record("S-9", location="Houston", status="Reserved"))
+        clusters = index.clusters(DETAIL_ZOOM - 1, Viewport(south=29.0, west=-96.0, north=30.0, east=-95.0))
+        assert list(clusters["worst_status"]) == ["Reserved"]
+
+    def test_stale_index_rebuilds(self, pool):
+        """Test that changes made elsewhere are picked up by the next refresh."""
+        index = self._index(pool)
+        pool.transaction(lambda conn: save_location(conn, "Phoenix", 51.5, -0.1))
+        assert not self._save(pool, index, supply_record("S-1", location="Phoenix", status="Reserved"))
+        with pool.connection() as conn:
+            index.refresh(conn)
+        assert index.clusters(DETAIL_ZOOM - 1, CONTINENTAL_US)["items"].sum() == 1
+
+    def test_grid_cells_are_vectorized(self):
+        """Test that nearby points share a cell and distant ones do not."""
+        keys = grid_cells(np.array([10.0, 10.01, -40.0]), np.array([20.0, 20.01, 100.0]), cell_size(5))
+        assert keys[0] == keys[1] != keys[2]
@@ -0,0 +1,114 @@
+"""
+Unit tests for the shared SQLite connection pool.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.pool import ConnectionPool, PoolTimeout
+
+
+class TestConnectionPool:
+    """Test class for connection pool behaviour."""
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        """Create a pool over a temporary database file."""
+        events = []
+        pool = ConnectionPool(tmp_path / "test.db", max_size=2, timeout=0.5,
+                              metrics_hook=lambda event, value: events.append(event))
+        pool.events = events
+        yield pool
+        pool.close()
+
+    def test_connections_use_wal_and_tuned_pragmas(self, pool):
+        """Test that new connections are configured with WAL and busy timeout."""
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_connections_are_reused(self, pool):
+        """Test that a returned connection is handed out again as a pool hit."""
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+
+        stats = pool.stats()
+        assert stats.created == 1
+        assert stats.hits == 1
+        assert pool.events == ["miss", "hit"]
+
+    def test_nested_checkout_reuses_thread_connection(self, pool):
+        """Test that nested checkouts on one thread share a connection."""
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                assert inner is outer
+        assert pool.stats().created == 1
+
+    def test_exhausted_pool_times_out(self, pool):
+        """Test that waiting for a connection past the timeout raises."""
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.connection():
+                held.set()
+                release.wait()
+
+        threads = [threading.Thread(target=hold) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            held.wait()
+            held.clear()
+
+        with pytest.raises(PoolTimeout):
+            with pool.connection():
+                pass
+
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_transaction_commits_and_rolls_back(self, pool):
+        """Test that transactions commit on success and roll back on error."""
+        pool.transaction(lambda conn: conn.execute("CREATE TABLE t (x INTEGER)"))
+        pool.transaction(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+
+        def failing(conn):
+            conn.execute("INSERT INTO t VALUES (2)")
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            pool.transaction(failing)
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+
+    def test_transaction_retries_when_database_is_locked(self, pool, tmp_path):
+        """Test that a locked database is retried rather than failing the write."""
+        pool.transaction(lambda conn: conn.execute("CREATE TABLE t (x INTEGER)"))
+
+        blocker = sqlite3.connect(tmp_path / "test.db", isolation_level=None,
+                                  check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        timer = threading.Timer(0.1, lambda: blocker.execute("COMMIT"))
+        timer.start()
+        try:
+            with pool.connection() as conn:
+                conn.execute("PRAGMA busy_timeout=0")
+                pool.transaction(lambda c: c.execute("INSERT INTO t VALUES (1)"))
+        finally:
+            timer.join()
+            blocker.close()
+
+        assert pool.stats().lock_retries >= 1
+        assert "lock_retry" in pool.events
@@ -0,0 +1,127 @@
+"""
+Unit tests for the in-process change event broker and the app's use of it.
+"""
+
+import os
+import sys
+
+import pytest
+import streamlit as st
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import app
+from logistics.auth import save_user
+from logistics.events import ChangeBroker
+from logistics.repository import DB_PATH_ENV
+
+
+class TestChangeEvents:
+    """Test class for change publishing and debounced polling."""
+
+    @pytest.fixture
+    def broker(self):
+        """Create an empty broker."""
+        return ChangeBroker()
+
+    def test_nothing_published(self, broker):
+        """Test that a fresh subscription has nothing to refresh."""
+        assert broker.subscribe().poll(now=100.0) == set()
+
+    def test_subscription_starts_at_current_event(self, broker):
+        """Test that events before subscribing are not reported."""
+        broker.publish("supply", now=0.0)
+        assert broker.subscribe().poll(now=100.0) == set()
+
+    def test_change_reported_after_quiet_period(self, broker):
+        """Test that a change is held back until the debounce window passes."""
+        subscription = broker.subscribe()
+        broker.publish("supply", now=10.0)
+        assert subscription.poll(debounce=1.0, now=10.5) == set()
+        assert subscription.poll(debounce=1.0, now=11.0) == {"supply"}
+        assert subscription.poll(debounce=1.0, now=20.0) == set()
+
+    def test_burst_is_batched(self, broker):
+        """Test that a burst of changes to several topics yields one refresh."""
+        subscription = broker.subscribe()
+        for i in range(5):
+            broker.publish("supply", now=10.0 + i * 0.5)
+        broker.publish("personnel", now=12.0)
+        assert subscription.poll(debounce=1.0, max_delay=10.0, now=12.5) == set()
+        assert subscription.poll(debounce=1.0, max_delay=10.0, now=13.0) == {"supply", "personnel"}
+
+    def test_max_delay_bounds_a_continuous_stream(self, broker):
+        """Test that a never-quiet stream is still reported after max_delay."""
+        subscription = broker.subscribe()
+        for i in range(10):
+            broker.publish("supply", now=10.0 + i * 0.5)
+        assert subscription.poll(debounce=1.0, max_delay=4.0, now=14.5) == {"supply"}
+
+    def test_own_events_are_skipped(self, broker):
+        """Test that a publisher already showing its change is not asked to refresh."""
+        writer, reader = broker.subscribe(), broker.subscribe()
+        broker.publish("supply", origin=writer.token, now=10.0)
+        assert writer.poll(now=20.0) == set()
+        assert reader.poll(now=20.0) == {"supply"}
+
+    def test_topic_filter(self, broker):
+        """Test that uninteresting topics are ignored and consumed."""
+        subscription = broker.subscribe()
+        broker.publish("personnel", now=10.0)
+        assert subscription.poll(topics={"supply"}, now=20.0) == set()
+        assert subscription.seen == broker.seq
+
+    def test_catch_up(self, broker):
+        """Test that catching up discards pending events."""
+        subscription = broker.subscribe()
+        broker.publish("supply", now=10.0)
+        subscription.catch_up()
+        assert subscription.poll(now=20.0) == set()
+
+    def test_lagging_subscription_refreshes_everything(self):
+        """Test that falling behind the bounded log forces a full refresh."""
+        broker = ChangeBroker(max_events=2)
+        subscription = broker.subscribe()
+        for topic in ("supply", "personnel", "locations"):
+            broker.publish(topic, now=10.0)
+        assert subscription.poll(now=20.0) == {"*"}
+        assert subscription.poll(now=30.0) == set()
+
+
+class TestLiveUpdates:
+    """Test class for which saves refresh the saving session's other fragments."""
+
+    @pytest.fixture(autouse=True)
+    def database(self, tmp_path, monkeypatch):
+        """Point the app at a scratch database, signed in as an admin."""
+        monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "logistics.db"))
+        st.cache_resource.clear()
+        app.init_schema()
+        app.get_repository().transaction(lambda conn: save_user(conn, "grace", "hunter2", "Admin"))
+        st.session_state["session_token"] = app.get_session_store().issue("grace", "Admin")
+        st.session_state.pop("live_subscription", None)
+        yield
+        st.session_state.pop("session_token", None)
+        st.session_state.pop("live_subscription", None)
+        app.get_snapshot_store().flush()
+        st.cache_resource.clear()
+
+    def test_own_supply_save_refreshes_dependent_fragments(self):
+        """Test that after a supply save, the saving session polls its own change to redraw the map."""
+        subscription = app.get_subscription()
+        assert app.save_supply_data({
+            "supply_id": "S-1", "supply_name": "Diesel", "supply_class": "Fuel",
+            "supply_type": "Consumable", "quantity": 5, "unit": "Gallon",
+            "status": "Available", "priority": "Medium", "location": "Depot 000",
+            "supplier": "", "notes": "", "updated_at": "2024-03-10T12:00:00",
+        }) == "inserted"
+        assert subscription.poll(now=1e12) == {"supply"}
+
+    def test_fragment_local_save_is_not_repeated(self):
+        """Test that a station save, drawn only by the fragment making it, reruns nothing else."""
+        subscription = app.get_subscription()
+        other = app.get_change_broker().subscribe()
+        app.publish_change("readiness")
+        assert subscription.poll(now=1e12) == set()
+        assert other.poll(now=1e12) == {"readiness"}
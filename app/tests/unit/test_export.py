@@ -0,0 +1,69 @@
+"""
+Unit tests for streaming table export.
+"""
+
+import io
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics import export
+from logistics.export import export_table, export_to_tempfile, iter_chunks
+
+
+class TestExport:
+    """Test class for export functionality."""
+
+    @pytest.fixture
+    def pool(self, pool):
+        """Seed the migrated logistics database with 25 rows."""
+        pool.transaction(lambda conn: conn.executemany(
+            "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, unit, "
+            "status, priority, notes) VALUES (?, ?, 'Fuel', 'Consumable', ?, 'Gallon', 'Available', 'Low', ?)",
+            [(f"S-{i}", f"Fuel, lot {i}", i, None if i % 2 else "note") for i in range(25)],
+        ))
+        return pool
+
+    def test_rows_are_fetched_in_fixed_chunks(self, pool):
+        """Test that the cursor is drained in chunks of the requested size."""
+        with pool.connection() as conn:
+            sizes = [len(rows) for _, rows in iter_chunks(conn, "supply", chunk_size=10)]
+        assert sizes == [10, 10, 5]
+
+    def test_csv_export(self, pool):
+        """Test that CSV export round-trips every row, including quoted commas."""
+        out = io.BytesIO()
+        assert export_table(pool, "supply", "csv", out, chunk_size=7) == 25
+
+        df = pd.read_csv(io.BytesIO(out.getvalue()))
+        assert len(df) == 25
+        assert df.loc[3, "supply_name"] == "Fuel, lot 3"
+
+    def test_jsonl_export(self, pool):
+        """Test that each JSON line is one record."""
+        out = io.BytesIO()
+        export_table(pool, "supply", "jsonl", out, chunk_size=7)
+
+        records = [json.loads(line) for line in out.getvalue().decode().splitlines()]
+        assert len(records) == 25
+        assert records[0]["quantity"] == 0 and records[1]["notes"] is None
+
+    def test_parquet_export(self, pool):
+        """Test that Parquet export keeps integer columns typed."""
+        spool = export_to_tempfile(pool, "supply", "parquet", chunk_size=7)
+        df = pd.read_parquet(spool)
+
+        assert len(df) == 25
+        assert str(df["quantity"].dtype) == "int64"
+
+    def test_command_line_writes_file(self, pool, tmp_path):
+        """Test the CLI entry point."""
+        output = tmp_path / "supply.csv"
+        assert export.main(["supply", "--db", pool.path, "-o", str(output)]) == 0
+        assert len(pd.read_csv(output)) == 25
@@ -0,0 +1,139 @@
+"""
+Unit tests for the consumption forecasts.
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.forecast import ConsumptionForecast, ForecastMetrics, forecast_metrics, stockout_view
+from logistics.history import day_weights
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+NOW = datetime(2024, 3, 10, 12)
+
+INSERT_EVENT = '''
+    INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority, recorded_at)
+    VALUES (?, 'update', ?, ?, 'Available', 'Medium', ?)
+'''
+
+
+class TestConsumptionForecast:
+    """Test class for burn rates, days of supply and incremental refreshes."""
+
+    @pytest.fixture
+    def repository(self, repository):
+        """Seed the migrated database with two lines drawn down daily and one idle line."""
+
+        def seed(conn):
+            for supply_id, quantity in (("S-1", 20), ("S-2", 1000), ("S-3", 5)):
+                upsert_record(conn, "supply", supply_record(supply_id, quantity=quantity))
+            # Ten units a day from S-1 and S-2 over the last week
+            for day in range(4, 11):
+                for supply_id in ("S-1", "S-2"):
+                    conn.execute(INSERT_EVENT, (supply_id, 0, 10, f"2024-03-{day:02d} 08:00:00"))
+
+        repository.transaction(seed)
+        return repository
+
+    def _refresh(self, repository, forecast, now=NOW):
+        with repository.connection() as conn:
+            return forecast.refresh(conn, now)
+
+    def test_steady_consumption(self, repository):
+        """Test that a steady draw down gives the same rate whatever the decay."""
+        forecast = ConsumptionForecast(window_days=7, half_life_days=3)
+        frame = self._refresh(repository, forecast)
+
+        assert sorted(frame.index) == ["S-1", "S-2"]  # S-3 consumes nothing
+        assert frame.loc["S-1", "burn_rate"] == pytest.approx(10.0)
+        assert frame.loc["S-1", "days_of_supply"] == pytest.approx(2.0)
+        assert frame.loc["S-1", "stockout_date"] == pd.Timestamp("2024-03-12")
+        assert frame.loc["S-2", "days_of_supply"] == pytest.approx(100.0)
+        assert frame.loc["S-1", "consumed"] == 70
+
+    def test_recent_consumption_weighs_more(self, repository):
+        """Test that days without consumption lower the rate, old ones least."""
+        forecast = ConsumptionForecast(window_days=14, half_life_days=7)
+        frame = self._refresh(repository, forecast)
+        weights = [weight for _, weight in day_weights(NOW.date(), 14, 7)]
+        assert frame.loc["S-1", "burn_rate"] == pytest.approx(10 * sum(weights[:7]) / sum(weights))
+        assert 5 < frame.loc["S-1", "burn_rate"] < 10
+
+    def test_refresh_recomputes_only_touched_lines(self, repository):
+        """Test that a save re-reads just the line it changed."""
+        forecast = ConsumptionForecast(window_days=7)
+        self._refresh(repository, forecast)
+        assert forecast.stats.full
+
+        repository.transaction(lambda conn: upsert_record(conn, "supply", supply_record("S-2", quantity=40)))
+        frame = self._refresh(repository, forecast)
+        assert not forecast.stats.full
+        assert forecast.stats.recomputed == 1
+        assert frame.loc["S-2", "quantity"] == 40
+        # Unchanged history: nothing to do
+        assert self._refresh(repository, forecast) is frame
+
+    def test_deleted_lines_drop_out(self, repository):
+        """Test that a deleted line is no longer forecast."""
+        forecast = ConsumptionForecast(window_days=7)
+        self._refresh(repository, forecast)
+        repository.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-1'"))
+        assert list(self._refresh(repository, forecast).index) == ["S-2"]
+
+    def test_new_day_recomputes_everything(self, repository):
+        """Test that the window moving on triggers a full pass."""
+        forecast = ConsumptionForecast(window_days=7)
+        self._refresh(repository, forecast)
+        frame = self._refresh(repository, forecast, now=datetime(2024, 3, 20))
+        assert forecast.stats.full
+        assert frame.empty
+
+    def test_bulk_changes_recompute_everything(self, repository):
+        """Test that touching more than ``max_changes`` lines takes the full path."""
+        forecast = ConsumptionForecast(window_days=7, max_changes=1)
+        self._refresh(repository, forecast)
+        repository.transaction(lambda conn: [
+            upsert_record(conn, "supply", supply_record(supply_id, quantity=1)) for supply_id in ("S-1", "S-2")
+        ])
+        self._refresh(repository, forecast)
+        assert forecast.stats.full
+
+    def test_many_events_recompute_everything(self, repository):
+        """Test that a burst of saves to one line also counts as a bulk change."""
+        forecast = ConsumptionForecast(window_days=7, max_changes=1)
+        self._refresh(repository, forecast)
+        repository.transaction(lambda conn: [
+            upsert_record(conn, "supply", supply_record("S-2", quantity=quantity)) for quantity in range(900, 905)
+        ])
+        frame = self._refresh(repository, forecast)
+        assert forecast.stats.full
+        assert frame.loc["S-2", "quantity"] == 904
+
+    def test_stockout_view_and_metrics(self, repository):
+        """Test the projected stock-out table and tiles."""
+        forecast = ConsumptionForecast(window_days=7)
+        frame = self._refresh(repository, forecast)
+        with repository.connection() as conn:
+            soon = stockout_view(conn, frame, 7)
+        assert soon["supply_id"].tolist() == ["S-1"]
+        assert soon["supply_name"].tolist() == ["Item S-1"]
+
+        metrics = forecast_metrics(frame)
+        assert (metrics.consuming, metrics.within_week, metrics.within_month) == (2, 1, 1)
+        assert metrics.next_stockout == pd.Timestamp("2024-03-12")
+        assert forecast_metrics(frame.iloc[:0]) == ForecastMetrics()
+
+    def test_day_weights(self):
+        """Test the window's bucket keys and halving weights."""
+        weights = day_weights(date(2024, 3, 10), 3, 1)
+        assert weights == [
+            ("2024-03-10 00:00:00", 1.0), ("2024-03-09 00:00:00", 0.5), ("2024-03-08 00:00:00", 0.25),
+        ]
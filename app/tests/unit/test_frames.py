@@ -0,0 +1,92 @@
+"""
+Unit tests for the compact dtypes of loaded tables.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.changes import load_frame, refresh_frame
+from logistics.domain import SUPPLY_STATUSES
+from logistics.frames import apply_dtypes, concat_frames
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+
+class TestFrameDtypes:
+    """Test class for categorical, numeric and datetime columns in table frames."""
+
+    @pytest.fixture
+    def pool(self, pool):
+        """Seed the migrated logistics database with two rows."""
+        self._save(pool, supply_record("S-1", updated_at="2024-01-01T00:00:00"))
+        self._save(pool, supply_record("S-2", updated_at="2024-01-02 00:00:00"))
+        return pool
+
+    def _save(self, pool, record):
+        return pool.transaction(lambda conn: upsert_record(conn, "supply", record))
+
+    def _load(self, pool):
+        with pool.connection() as conn:
+            return load_frame(conn, "supply")
+
+    def test_loaded_columns_are_typed(self, pool):
+        """Test that enumerated columns are Categoricals over the full domain list."""
+        frame = self._load(pool).frame
+        assert list(frame["status"].cat.categories) == SUPPLY_STATUSES
+        assert list(frame["location"].cat.categories) == ["Depot"]
+        assert pd.api.types.is_integer_dtype(frame["quantity"])
+        assert pd.api.types.is_datetime64_any_dtype(frame["updated_at"])
+        assert pd.api.types.is_datetime64_any_dtype(frame["created_at"])
+        # Both timestamp spellings parse, and the newest row still comes first
+        assert list(frame["supply_id"]) == ["S-2", "S-1"]
+
+    def test_values_outside_the_domain_are_kept(self):
+        """Test that stored values missing from the domain list become extra categories."""
+        frame = apply_dtypes(pd.DataFrame({"status": ["Available", "Backordered", None]}), "supply")
+        assert list(frame["status"].cat.categories) == SUPPLY_STATUSES + ["Backordered"]
+        assert frame["status"].tolist()[:2] == ["Available", "Backordered"]
+        assert pd.isna(frame["status"].iloc[2])
+
+    def test_unparseable_values_become_missing(self):
+        """Test that a bad quantity or timestamp does not fail the whole load."""
+        frame = apply_dtypes(
+            pd.DataFrame({"quantity": ["3", "lots"], "updated_at": ["2024-01-01", "soon"]}), "supply"
+        )
+        assert frame["quantity"].tolist()[0] == 3
+        assert pd.isna(frame["quantity"].iloc[1])
+        assert pd.isna(frame["updated_at"].iloc[1])
+
+    def test_concat_unions_categories(self):
+        """Test that concatenating parts with different categories stays categorical."""
+        first = apply_dtypes(pd.DataFrame({"location": ["Depot"]}), "supply")
+        second = apply_dtypes(pd.DataFrame({"location": ["Cache", "Depot"]}), "supply")
+        combined = concat_frames([first, second])
+        assert isinstance(combined["location"].dtype, pd.CategoricalDtype)
+        # The larger part's categories come first, so its codes are unchanged
+        assert list(combined["location"].cat.categories) == ["Cache", "Depot"]
+        assert combined["location"].tolist() == ["Depot", "Cache", "Depot"]
+
+    def test_refresh_keeps_dtypes(self, pool):
+        """Test that rows merged in by a refresh keep the frame's dtypes."""
+        live = self._load(pool)
+        self._save(pool, supply_record("S-3", location="Forward Cache", updated_at="2024-01-03T00:00:00"))
+        with pool.connection() as conn:
+            refreshed = refresh_frame(conn, live)
+        assert refreshed.frame.dtypes.equals(self._load(pool).frame.dtypes)
+        assert list(refreshed.frame["location"].cat.categories) == ["Depot", "Forward Cache"]
+        assert refreshed.frame["location"].iloc[0] == "Forward Cache"
+
+    def test_typed_frame_is_smaller(self, pool):
+        """Test that the compact dtypes take less memory than the rows as read."""
+        for i in range(200):
+            self._save(pool, supply_record(f"S-{i + 10}", quantity=i))
+        with pool.connection() as conn:
+            raw = pd.read_sql_query("SELECT * FROM supply", conn).astype(object)
+        typed = apply_dtypes(raw, "supply")
+        assert typed.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum() / 2
@@ -0,0 +1,93 @@
+"""
+Unit tests for geotagged locations and viewport-bounded map queries.
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.geo import Viewport, fetch_points, save_location, viewport_bounds
+from logistics.schema import SAMPLE_LOCATIONS
+
+INSERT_SUPPLY = (
+    "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, "
+    "unit, status, priority, location) VALUES (?, 'Item', 'Fuel', 'Consumable', 1, 'Each', "
+    "'Available', 'Medium', ?)"
+)
+
+CONTINENTAL_US = Viewport(south=24.0, west=-125.0, north=50.0, east=-66.0)
+
+
+class TestGeo:
+    """Test class for the locations R*Tree."""
+
+    def _points(self, pool, viewport, limit=100):
+        with pool.connection() as conn:
+            return fetch_points(conn, viewport, limit)
+
+    def test_sample_locations_are_seeded(self, pool):
+        """Test that the migration seeds the sample sites into the R*Tree."""
+        points, truncated = self._points(pool, CONTINENTAL_US)
+        assert sorted(points["location"]) == sorted(name for name, *_ in SAMPLE_LOCATIONS)
+        assert not truncated
+
+    def test_viewport_excludes_points_outside(self, pool):
+        """Test that only locations inside the box are returned."""
+        points, _ = self._points(pool, Viewport(south=38.0, west=-90.0, north=45.0, east=-70.0))
+        assert sorted(points["location"]) == ["Chicago", "New York"]
+
+    def test_moving_a_location_updates_the_index(self, pool):
+        """Test that the update trigger keeps the R*Tree in step with lat/lon."""
+        pool.transaction(lambda conn: save_location(conn, "Chicago", 51.5, -0.1))
+        points, _ = self._points(pool, CONTINENTAL_US)
+        assert "Chicago" not in set(points["location"])
+        points, _ = self._points(pool, Viewport(south=50.0, west=-1.0, north=52.0, east=1.0))
+        assert list(points["location"]) == ["Chicago"]
+
+    def test_deleting_a_location_removes_it_from_the_index(self, pool):
+        """Test that the delete trigger removes the R*Tree entry."""
+        pool.transaction(lambda conn: conn.execute("DELETE FROM locations WHERE name = 'Houston'"))
+        with pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM locations_rtree").fetchone()[0]
+        assert count == len(SAMPLE_LOCATIONS) - 1
+
+    def test_supply_lines_join_to_their_location(self, pool):
+        """Test that each supply line at a location is returned as a point."""
+        pool.transaction(lambda conn: conn.executemany(
+            INSERT_SUPPLY, [("S-1", "Phoenix"), ("S-2", "Phoenix"), ("S-3", "Nowhere")]
+        ))
+        points, _ = self._points(pool, Viewport(south=33.0, west=-113.0, north=34.0, east=-111.0))
+        assert sorted(points["supply_id"]) == ["S-1", "S-2"]
+
+    def test_antimeridian_viewport(self, pool):
+        """Test that a box crossing the antimeridian finds points on both sides."""
+        pool.transaction(lambda conn: save_location(conn, "Fiji", -17.7, 178.0))
+        pool.transaction(lambda conn: save_location(conn, "Samoa", -13.8, -172.0))
+        points, _ = self._points(pool, Viewport(south=-20.0, west=170.0, north=-10.0, east=-170.0))
+        assert sorted(points["location"]) == ["Fiji", "Samoa"]
+
+    def test_truncation_is_reported(self, pool):
+        """Test that results beyond the limit are cut off and flagged."""
+        points, truncated = self._points(pool, CONTINENTAL_US, limit=2)
+        assert len(points) == 2
+        assert truncated
+
+    def test_viewport_bounds_narrow_with_zoom(self):
+        """Test that zooming in shrinks the box around the centre."""
+        wide = viewport_bounds(40.0, -100.0, 4)
+        close = viewport_bounds(40.0, -100.0, 8)
+        assert wide.south < close.south < 40.0 < close.north < wide.north
+        assert wide.west < close.west < -100.0 < close.east < wide.east
+
+    def test_viewport_bounds_wrap_the_antimeridian(self):
+        """Test that a view centred near 180 degrees wraps to a crossing box."""
+        viewport = viewport_bounds(0.0, 179.0, 4)
+        assert viewport.west > viewport.east
+        assert len(viewport.boxes()) == 2
+
+    def test_world_view_covers_every_longitude(self):
+        """Test that a fully zoomed-out view is not split."""
+        viewport = viewport_bounds(20.0, 0.0, 0)
+        assert (viewport.west, viewport.east) == (-180.0, 180.0)
@@ -0,0 +1,148 @@
+"""
+Unit tests for the supply quantity history and its rollups.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.history import bucket_start, burn_rates, quantity_trend, rollup_table, supply_history
+from logistics.repository import LogisticsRepository
+from logistics.schema import MIGRATIONS, migrate
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+INSERT_EVENT = '''
+    INSERT INTO supply_history (supply_id, op, quantity, previous_quantity, status, priority, recorded_at)
+    VALUES (?, ?, ?, ?, 'Available', 'Medium', ?)
+'''
+
+
+class TestSupplyHistory:
+    """Test class for the append-only history and its hourly and daily rollups."""
+
+    def _save(self, repository, record):
+        return repository.transaction(lambda conn: upsert_record(conn, "supply", record))
+
+    def _events(self, repository, *events):
+        """Append history events with explicit timestamps: (supply_id, op, quantity, previous, at)."""
+        repository.transaction(lambda conn: conn.executemany(INSERT_EVENT, events))
+
+    def test_saves_append_events(self, repository):
+        """Test that inserts, changes and deletes are recorded, and unchanged saves are not."""
+        self._save(repository, supply_record("S-1", quantity=10))
+        self._save(repository, supply_record("S-1", quantity=7))
+        self._save(repository, supply_record("S-1", quantity=7, status="Low Stock"))
+        self._save(repository, supply_record("S-1", quantity=7, status="Low Stock"))
+        repository.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-1'"))
+
+        with repository.connection() as conn:
+            events = supply_history(conn, "S-1")
+        events = events.iloc[::-1].fillna({"previous_quantity": -1})
+        assert events[["op", "quantity", "previous_quantity"]].values.tolist() == [
+            ["insert", 10, -1], ["update", 7, 10], ["update", 7, 7], ["delete", 0, 7],
+        ]
+        assert events["status"].tolist() == ["Available", "Available", "Low Stock", "Low Stock"]
+
+    def test_history_is_append_only(self, repository):
+        """Test that recorded events cannot be rewritten or removed."""
+        self._save(repository, supply_record("S-1", quantity=10))
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            repository.transaction(lambda conn: conn.execute("UPDATE supply_history SET quantity = 1"))
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            repository.transaction(lambda conn: conn.execute("DELETE FROM supply_history"))
+
+    def test_rollups_fold_events_per_bucket(self, repository):
+        """Test opening, closing, low, high, consumed and received per hour and per day."""
+        self._events(
+            repository,
+            ("S-1", "insert", 100, None, "2024-03-01 08:05:00"),
+            ("S-1", "update", 60, 100, "2024-03-01 08:40:00"),
+            ("S-1", "update", 80, 60, "2024-03-01 09:10:00"),
+            ("S-1", "update", 30, 80, "2024-03-02 10:00:00"),
+        )
+        with repository.connection() as conn:
+            hourly = quantity_trend(conn, "hourly", supply_id="S-1")
+            daily = quantity_trend(conn, "daily", supply_id="S-1")
+
+        assert hourly["bucket"].tolist() == [
+            datetime(2024, 3, 1, 8), datetime(2024, 3, 1, 9), datetime(2024, 3, 2, 10),
+        ]
+        columns = ["opening_quantity", "closing_quantity", "min_quantity", "max_quantity", "consumed", "received"]
+        assert hourly[columns].values.tolist() == [
+            [0, 60, 0, 100, 40, 100], [60, 80, 60, 80, 0, 20], [80, 30, 30, 80, 50, 0],
+        ]
+        assert daily[columns].values.tolist() == [[0, 80, 0, 100, 40, 120], [80, 30, 30, 80, 50, 0]]
+        assert daily["changes"].tolist() == [3, 1]
+
+    def test_inventory_trend_sums_lines(self, repository):
+        """Test that the all-lines trend adds up every line's movement per bucket."""
+        self._events(
+            repository,
+            ("S-1", "update", 5, 10, "2024-03-01 08:00:00"),
+            ("S-2", "update", 1, 4, "2024-03-01 12:00:00"),
+            ("S-2", "update", 0, 1, "2024-03-03 12:00:00"),
+        )
+        with repository.connection() as conn:
+            trend = quantity_trend(conn, "daily")
+            recent = quantity_trend(conn, "daily", since=datetime(2024, 3, 2, 18))
+        assert trend[["consumed", "lines"]].values.tolist() == [[8, 2], [1, 1]]
+        assert recent["bucket"].tolist() == [datetime(2024, 3, 3)]
+
+    def test_burn_rates(self, repository):
+        """Test average daily consumption over a trailing window, ignoring deletes."""
+        self._events(
+            repository,
+            ("S-1", "update", 70, 100, "2024-02-01 00:00:00"),  # outside the window
+            ("S-1", "update", 40, 70, "2024-03-01 00:00:00"),
+            ("S-1", "update", 10, 40, "2024-03-10 00:00:00"),
+            ("S-2", "delete", 0, 50, "2024-03-10 00:00:00"),
+        )
+        with repository.connection() as conn:
+            rates = burn_rates(conn, days=10, now=datetime(2024, 3, 10, 12)).set_index("supply_id")
+        assert rates.loc["S-1", "consumed"] == 60
+        assert rates.loc["S-1", "burn_rate"] == 6.0
+        assert rates.loc["S-2", "consumed"] == 0
+
+    def test_weighted_burn_rates_of_some_lines(self, repository):
+        """Test that a half-life weighs recent days more and ``supply_ids`` narrows the read."""
+        self._events(
+            repository,
+            ("S-1", "update", 90, 100, "2024-03-09 00:00:00"),
+            ("S-1", "update", 80, 90, "2024-03-10 00:00:00"),
+            ("S-2", "update", 10, 40, "2024-03-09 00:00:00"),
+        )
+        with repository.connection() as conn:
+            rates = burn_rates(conn, days=2, now=datetime(2024, 3, 10), half_life_days=1, supply_ids=["S-2"])
+        assert rates["supply_id"].tolist() == ["S-2"]
+        # 30 units yesterday, at half the weight of today
+        assert rates.loc[0, "burn_rate"] == pytest.approx(30 * 0.5 / 1.5)
+
+    def test_existing_rows_seed_a_baseline(self, tmp_path):
+        """Test that lines on record before history existed start from a baseline event."""
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        history = next(m.version for m in MIGRATIONS if "quantity history" in m.description)
+        migrate(repository.pool, [m for m in MIGRATIONS if m.version < history])
+        self._save(repository, supply_record("S-1", quantity=12))
+        repository.migrate()
+
+        with repository.connection() as conn:
+            events = supply_history(conn, "S-1")
+            daily = quantity_trend(conn, "daily", supply_id="S-1")
+        repository.close()
+        assert events[["op", "quantity", "previous_quantity"]].values.tolist() == [["baseline", 12, 12]]
+        assert daily[["opening_quantity", "closing_quantity", "consumed", "received"]].values.tolist() == [[12, 12, 0, 0]]
+
+    def test_bucket_start(self):
+        """Test the bucket keys used as range bounds."""
+        moment = datetime(2024, 3, 1, 8, 45, 12)
+        assert bucket_start(moment, "hourly") == "2024-03-01 08:00:00"
+        assert bucket_start(moment, "daily") == "2024-03-01 00:00:00"
+        with pytest.raises(ValueError):
+            rollup_table("weekly")
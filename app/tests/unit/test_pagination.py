@@ -0,0 +1,72 @@
+"""
+Unit tests for keyset pagination of the personnel and supply grids.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.queries import build_page_query, fetch_page
+
+
+class TestPagination:
+    """Test class for server-side pagination."""
+
+    @pytest.fixture
+    def pool(self, pool):
+        """Seed the migrated logistics database with 25 rows, some sharing a timestamp."""
+        rows = [
+            (f"S-{i:03d}", f"Item {i}", "Fuel" if i % 2 else "Food", "Consumable", i, "Each",
+             "Low Stock" if i % 5 == 0 else "Available", "High", f"Depot {i % 3}",
+             f"2024-01-01T00:00:{i // 2:02d}")
+            for i in range(25)
+        ]
+        pool.transaction(lambda conn: conn.executemany(
+            "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, unit, "
+            "status, priority, location, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        ))
+        return pool
+
+    def _all_pages(self, conn, **kwargs):
+        pages, cursor = [], None
+        while True:
+            page = fetch_page(conn, "supply", cursor=cursor, page_size=10, **kwargs)
+            pages.append(page)
+            if not page.has_more:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_in_order(self, pool):
+        """Test that walking the cursor visits each row exactly once, newest first."""
+        with pool.connection() as conn:
+            pages = self._all_pages(conn)
+
+        assert [len(p.rows) for p in pages] == [10, 10, 5]
+        ids = [i for p in pages for i in p.rows["id"]]
+        assert sorted(ids) == list(range(1, 26))
+        keys = [(u, i) for p in pages for u, i in zip(p.rows["updated_at"], p.rows["id"])]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_ascending_order(self, pool):
+        """Test that the oldest-first order is pushed into SQL."""
+        with pool.connection() as conn:
+            page = fetch_page(conn, "supply", descending=False, page_size=3)
+        assert list(page.rows["supply_id"]) == ["S-000", "S-001", "S-002"]
+
+    def test_filters_are_applied_in_sql(self, pool):
+        """Test that filters restrict the rows fetched."""
+        with pool.connection() as conn:
+            pages = self._all_pages(conn, filters={"status": "Low Stock", "supply_class": ["Food", "Fuel"]})
+        rows = pages[0].rows
+        assert len(pages) == 1
+        assert set(rows["status"]) == {"Low Stock"}
+        assert len(rows) == 5
+
+    def test_unknown_filter_column_is_rejected(self):
+        """Test that only allow-listed columns can be filtered."""
+        with pytest.raises(ValueError):
+            build_page_query("supply", {"notes; DROP TABLE supply": "x"})
@@ -0,0 +1,354 @@
+"""
+Unit tests for the PostgreSQL storage backend.
+
+The SQL translation tests always run. The backend tests start a throwaway
+PostgreSQL server in a temporary directory (``initdb``/``pg_ctl`` from the
+PATH or ``pg_config --bindir``) and are skipped when psycopg or the server
+binaries are not installed.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.auth import SessionStore, authenticate, save_user, session_key
+from logistics.cache import table_version
+from logistics.changes import load_frame, refresh_frame
+from logistics.export import iter_chunks
+from logistics.forecast import ConsumptionForecast
+from logistics.geo import Viewport, fetch_points
+from logistics.history import burn_rates, quantity_trend
+from logistics.metrics import breakdown, supply_metrics
+from logistics.postgres import POSTGRES_MIGRATIONS, psycopg, redact_url, translate_sql
+from logistics.queries import fetch_page
+from logistics.readiness import readiness_cube
+from logistics.search import search
+from logistics.repository import LogisticsRepository, station_unit
+from logistics.upsert import INSERTED, UNCHANGED, UPDATED, upsert_many, upsert_record
+from logistics.write_queue import WriteQueue
+from tests.unit.conftest import supply_record
+
+
+def personnel_record(**overrides):
+    record = {
+        "personnel_id": "P-1", "first_name": "Ada", "last_name": "Lovelace",
+        "personnel_class": "Officer", "rank": "", "unit": "1st SFG",
+        "clearance_level": "Secret", "status": "Active", "notes": "",
+        "updated_at": "2024-01-01 00:00:00",
+    }
+    record.update(overrides)
+    return record
+
+
+class TestTranslateSql:
+    """Test class for rewriting SQLite statements for PostgreSQL."""
+
+    def test_parameters(self):
+        """Test that positional and named parameters become psycopg placeholders."""
+        assert translate_sql("SELECT * FROM t WHERE a = ? AND b = :name") == (
+            "SELECT * FROM t WHERE a = %s AND b = %(name)s"
+        )
+
+    def test_literals_and_casts_are_left_alone(self):
+        """Test that string literals, casts and $$ bodies are not rewritten."""
+        sql = "SELECT '?:x', a::text, $$ IS NOT ? $$ FROM t WHERE b = ?"
+        assert translate_sql(sql) == "SELECT '?:x', a::text, $$ IS NOT ? $$ FROM t WHERE b = %s"
+
+    def test_percent_is_escaped_only_when_binding(self):
+        """Test that a literal % survives psycopg's parameter parsing."""
+        assert translate_sql("SELECT 'a%' WHERE b = ?") == "SELECT 'a%%' WHERE b = %s"
+        assert translate_sql("SELECT 'a%'", bind=False) == "SELECT 'a%'"
+
+    def test_is_not_comparison(self):
+        """Test that IS NOT between values becomes IS DISTINCT FROM, but IS NOT NULL stays."""
+        sql = "WHERE t.a IS NOT excluded.a AND t.b IS NOT NULL"
+        assert translate_sql(sql, bind=False) == "WHERE t.a IS DISTINCT FROM excluded.a AND t.b IS NOT NULL"
+
+    def test_current_timestamp(self):
+        """Test that timestamps keep SQLite's second precision."""
+        assert translate_sql("SET updated_at = CURRENT_TIMESTAMP", bind=False) == (
+            "SET updated_at = LOCALTIMESTAMP(0)"
+        )
+
+    def test_snapshot_begin(self):
+        """Test that read snapshots run at repeatable read."""
+        assert translate_sql("BEGIN", bind=False) == "BEGIN ISOLATION LEVEL REPEATABLE READ"
+
+    def test_redact_url(self):
+        """Test that passwords never reach diagnostics."""
+        assert redact_url("postgresql://app:secret@db:5432/logistics") == "postgresql://app:***@db:5432/logistics"
+        assert redact_url("postgresql://db/logistics") == "postgresql://db/logistics"
+
+
+def _server_binary(name):
+    found = shutil.which(name)
+    if found:
+        return found
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        bindir = subprocess.run([pg_config, "--bindir"], capture_output=True, text=True).stdout.strip()
+        candidate = os.path.join(bindir, name)
+        if os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def postgres_server(tmp_path_factory):
+    """Start a local PostgreSQL server on a Unix socket in a temporary directory."""
+    if psycopg is None:
+        pytest.skip("psycopg is not installed")
+    initdb, pg_ctl = _server_binary("initdb"), _server_binary("pg_ctl")
+    if not (initdb and pg_ctl):
+        pytest.skip("PostgreSQL server binaries are not installed")
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        pytest.skip("PostgreSQL refuses to run as root")
+
+    root = tmp_path_factory.mktemp("postgres")
+    data, sockets = root / "data", root / "sockets"
+    sockets.mkdir()
+    port = _free_port()
+    subprocess.run(
+        [initdb, "-D", str(data), "-U", "postgres", "-E", "UTF8", "--auth=trust", "--no-sync"],
+        check=True, capture_output=True,
+    )
+    subprocess.run(
+        [pg_ctl, "-D", str(data), "-l", str(root / "server.log"), "-w",
+         "-o", f"-p {port} -k {sockets} -c listen_addresses='' -c fsync=off", "start"],
+        check=True, capture_output=True,
+    )
+    try:
+        yield f"postgresql://postgres@/{{}}?host={sockets}&port={port}"
+    finally:
+        subprocess.run([pg_ctl, "-D", str(data), "-m", "immediate", "stop"], capture_output=True)
+
+
+class TestPostgresBackend:
+    """Test class for the repository and data modules on PostgreSQL."""
+
+    @pytest.fixture
+    def repository(self, postgres_server, request):
+        """Create a fresh, migrated database on the test server."""
+        name = request.node.name
+        with psycopg.connect(postgres_server.format("postgres"), autocommit=True) as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS {name}")
+            admin.execute(f"CREATE DATABASE {name}")
+        repository = LogisticsRepository(postgres_server.format(name))
+        repository.migrate()
+        yield repository
+        repository.close()
+        with psycopg.connect(postgres_server.format("postgres"), autocommit=True) as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+
+    def _save(self, repository, table, record):
+        return repository.transaction(lambda conn: upsert_record(conn, table, record))
+
+    def test_migrate_is_idempotent(self, repository):
+        """Test that a migrated database is left alone by a second migrate."""
+        assert repository.migrate() == []
+        with repository.connection() as conn:
+            assert conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()[0] == len(
+                POSTGRES_MIGRATIONS
+            )
+
+    def test_concurrent_migrations_apply_once(self, repository):
+        """Test that replicas starting together do not apply a migration twice."""
+        replicas = [LogisticsRepository(repository.pool.url) for _ in range(3)]
+        with repository.connection() as conn:
+            conn.execute("DELETE FROM schema_migrations WHERE version = ?", (len(POSTGRES_MIGRATIONS),))
+        applied = []
+        threads = [threading.Thread(target=lambda r=r: applied.append(r.migrate())) for r in replicas]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for replica in replicas:
+            replica.close()
+        assert sorted(map(len, applied)) == [0, 0, 1]
+
+    def test_upsert_outcomes_and_versions(self, repository):
+        """Test inserts, updates and no-op saves, and that only real writes bump the version."""
+        with repository.connection() as conn:
+            start = table_version(conn, "supply")
+        assert self._save(repository, "supply", supply_record()) == INSERTED
+        assert self._save(repository, "supply", supply_record()) == UNCHANGED
+        with repository.connection() as conn:
+            after_unchanged = table_version(conn, "supply")
+        assert self._save(repository, "supply", supply_record(quantity=3)) == UPDATED
+        with repository.connection() as conn:
+            assert after_unchanged == start + 1
+            assert table_version(conn, "supply") == start + 2
+            assert conn.execute("SELECT quantity FROM supply").fetchone()[0] == 3
+
+    def test_upsert_many_counts_written_rows(self, repository):
+        """Test that bulk upserts report only rows actually written."""
+        records = [supply_record(supply_id=f"S-{i}") for i in range(5)]
+        assert repository.transaction(lambda conn: upsert_many(conn, "supply", records)) == 5
+        assert repository.transaction(lambda conn: upsert_many(conn, "supply", records)) == 0
+
+    def test_supply_metrics_follow_writes(self, repository):
+        """Test that the trigger-maintained counters track inserts, updates and deletes."""
+        self._save(repository, "supply", supply_record(supply_id="S-1", status="Low Stock"))
+        self._save(repository, "supply", supply_record(supply_id="S-2", priority="Critical"))
+        self._save(repository, "supply", supply_record(supply_id="S-1", status="Out of Stock"))
+        repository.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-2'"))
+        with repository.connection() as conn:
+            metrics = supply_metrics(conn)
+        assert (metrics.total_items, metrics.low_stock, metrics.out_of_stock, metrics.critical) == (1, 0, 1, 0)
+
+    def test_history_rollups_follow_writes(self, repository):
+        """Test that supply saves are logged and rolled up by the PL/pgSQL triggers."""
+        for quantity in (10, 4, 6):
+            self._save(repository, "supply", supply_record(quantity=quantity))
+        with repository.connection() as conn:
+            trend = quantity_trend(conn, "hourly", supply_id="S-1")
+            rates = burn_rates(conn)
+        assert trend[["opening_quantity", "closing_quantity", "min_quantity", "max_quantity"]].values.tolist() == [[0, 6, 0, 10]]
+        assert trend[["consumed", "received", "changes"]].values.tolist() == [[6, 12, 3]]
+        assert rates[["supply_id", "consumed"]].values.tolist() == [["S-1", 6]]
+
+    def test_forecast_reads_weighted_totals(self, repository):
+        """Test the bound day weights and the per-line totals on PostgreSQL."""
+        for quantity in (10, 4):
+            self._save(repository, "supply", supply_record(quantity=quantity))
+        forecast = ConsumptionForecast(window_days=1)
+        with repository.connection() as conn:
+            frame = forecast.refresh(conn)
+        assert frame.loc["S-1", "burn_rate"] == 6.0
+        assert frame.loc["S-1", "days_of_supply"] == pytest.approx(4 / 6)
+
+    def test_keyset_pages_cover_every_row_once(self, repository):
+        """Test that paging with cursors returns each row exactly once."""
+        records = [
+            supply_record(supply_id=f"S-{i:03d}", updated_at=f"2024-01-01 00:{i // 60:02d}:{i % 60:02d}")
+            for i in range(120)
+        ]
+        repository.transaction(lambda conn: upsert_many(conn, "supply", records))
+        seen, cursor = [], None
+        with repository.connection() as conn:
+            while True:
+                page = fetch_page(conn, "supply", {"status": "Available"}, cursor)
+                seen.extend(page.rows["supply_id"])
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+        assert sorted(seen) == sorted(r["supply_id"] for r in records)
+        assert len(seen) == len(set(seen))
+
+    def test_change_log_refreshes_frames(self, repository):
+        """Test that a live frame picks up another writer's change from the log."""
+        self._save(repository, "personnel", personnel_record())
+        with repository.connection() as conn:
+            live = load_frame(conn, "personnel")
+        self._save(repository, "personnel", personnel_record(status="Reserve", updated_at="2024-01-02 00:00:00"))
+        with repository.connection() as conn:
+            fresh = refresh_frame(conn, live)
+        assert fresh.seq > live.seq
+        assert list(fresh.frame["status"]) == ["Reserve"]
+
+    def test_viewport_points(self, repository):
+        """Test that the viewport query runs over the locations view."""
+        self._save(repository, "supply", supply_record(location="New York"))
+        with repository.connection() as conn:
+            points, truncated = fetch_points(conn, Viewport(40.0, -75.0, 41.0, -73.0))
+        assert list(points["location"]) == ["New York"]
+        assert list(points["supply_id"]) == ["S-1"]
+        assert not truncated
+
+    def test_unit_readiness(self, repository):
+        """Test the readiness view after stationing a unit."""
+        self._save(repository, "personnel", personnel_record())
+        self._save(repository, "supply", supply_record(priority="Critical", location="New York"))
+        repository.transaction(lambda conn: station_unit(conn, "1st SFG", "New York"))
+        [row] = repository.unit_readiness().to_dict("records")
+        assert (row["unit"], row["location"], row["personnel"], row["supply_lines"], row["critical"]) == (
+            "1st SFG", "New York", 1, 1, 1
+        )
+
+    def test_readiness_cube_follows_writes(self, repository):
+        """Test that the PL/pgSQL triggers keep the readiness totals current."""
+        self._save(repository, "personnel", personnel_record())
+        self._save(repository, "supply", supply_record(location="New York"))
+        self._save(repository, "supply", supply_record(supply_id="S-2", quantity=5, location="New York"))
+        repository.transaction(lambda conn: station_unit(conn, "1st SFG", "New York"))
+        self._save(repository, "supply", supply_record(supply_id="S-2", quantity=0, status="Out of Stock", location="New York"))
+        with repository.connection() as conn:
+            cube = readiness_cube(conn)
+        assert cube[["unit", "status", "lines", "quantity", "personnel"]].values.tolist() == [
+            ["1st SFG", "Available", 1, 1, 1], ["1st SFG", "Out of Stock", 1, 0, 1],
+        ]
+
+    def test_breakdowns_read_the_totals(self, repository):
+        """Test the class and status counts behind the breakdown charts."""
+        self._save(repository, "personnel", personnel_record())
+        self._save(repository, "supply", supply_record())
+        self._save(repository, "supply", supply_record(supply_id="S-2", location="Boston"))
+        self._save(repository, "supply", supply_record(supply_id="S-3", status="Reserved"))
+        with repository.connection() as conn:
+            supply = breakdown(conn, "supply").set_index(["supply_class", "status"])["count"]
+            personnel = breakdown(conn, "personnel").set_index(["personnel_class", "status"])["count"]
+        assert supply[supply > 0].to_dict() == {("Fuel", "Available"): 2, ("Fuel", "Reserved"): 1}
+        assert personnel[personnel > 0].to_dict() == {("Officer", "Active"): 1}
+
+    def test_full_text_search(self, repository):
+        """Test ranked prefix search over the tsvector index and its trigger."""
+        self._save(repository, "supply", supply_record(supply_name="Diesel fuel", location="Depot 042"))
+        self._save(repository, "supply", supply_record(supply_id="S-2", notes="Diesel spill kit", location="Depot 117"))
+        with repository.connection() as conn:
+            assert list(search(conn, "supply", "dies").rows["supply_id"]) == ["S-1", "S-2"]
+            assert list(search(conn, "supply", "depot 04").rows["supply_id"]) == ["S-1"]
+            assert search(conn, "supply", "o'brien").rows.empty
+        self._save(repository, "supply", supply_record(supply_name="Water", location="Depot 042"))
+        with repository.connection() as conn:
+            assert list(search(conn, "supply", "diesel").rows["supply_id"]) == ["S-2"]
+
+    def test_sign_in(self, repository):
+        """Test accounts and the shared session key on PostgreSQL."""
+        repository.transaction(lambda conn: save_user(conn, "ada", "correct horse", "Logistician"))
+        repository.transaction(lambda conn: save_user(conn, "ada", "new horse", "Admin"))
+        with repository.connection() as conn:
+            assert authenticate(conn, "ada", "correct horse") is None
+            assert authenticate(conn, "Ada", "new horse") == ("Admin", 1)
+            key = session_key(conn)
+            replica = SessionStore(key)
+            replica.sync(conn)
+        stale = SessionStore(key).issue("ada", "Logistician", 0)
+        token = SessionStore(key).issue("ada", "Admin", 1)
+        assert len(key) == 32
+        assert replica.resolve(token).role == "Admin"
+        assert replica.resolve(stale) is None
+
+    def test_export_streams_in_chunks(self, repository):
+        """Test that exports read through a server-side cursor one chunk at a time."""
+        records = [supply_record(supply_id=f"S-{i:02d}") for i in range(25)]
+        repository.transaction(lambda conn: upsert_many(conn, "supply", records))
+        with repository.connection() as conn:
+            sizes = [len(rows) for _, rows in iter_chunks(conn, "supply", chunk_size=10)]
+            assert not conn.in_transaction
+        assert sizes == [10, 10, 5]
+
+    def test_write_queue(self, repository):
+        """Test that queued writes commit in shared transactions on PostgreSQL."""
+        writes = WriteQueue(repository.pool)
+        futures = [
+            writes.submit(lambda conn, i=i: upsert_record(conn, "supply", supply_record(supply_id=f"S-{i}")))
+            for i in range(20)
+        ]
+        assert [future.result(timeout=10) for future in futures] == [INSERTED] * 20
+        writes.close()
+        with repository.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM supply").fetchone()[0] == 20
@@ -0,0 +1,56 @@
+"""
+Unit tests for the query plan check and the supporting indexes.
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics import query_plan
+from logistics.query_plan import PlannedQuery, check_query_plans, plan_problems
+
+
+class TestQueryPlan:
+    """Test class for query plan diagnostics."""
+
+    def test_no_app_query_scans_a_table(self, pool):
+        """Test that every query the app issues is served by an index."""
+        failures = [(q.name, problems) for q, _, problems in check_query_plans(pool) if problems]
+        assert failures == []
+
+    def test_full_scan_and_sort_are_reported(self, pool):
+        """Test that an unindexed query is flagged."""
+        query = PlannedQuery("notes", "SELECT * FROM supply WHERE notes = ? ORDER BY quantity", ("x",))
+        [(_, _, problems)] = check_query_plans(pool, [query])
+
+        assert any("full table scan" in p for p in problems)
+        assert any("unindexed sort" in p for p in problems)
+
+    def test_limited_index_scans_are_not_flagged(self):
+        """Test that walking an index in order is accepted when a LIMIT stops it."""
+        assert plan_problems(["SCAN supply USING INDEX idx_supply_updated_at"], limited=True) == []
+        assert plan_problems(["SCAN supply"], allow_scan=True) == []
+        assert plan_problems(["SCAN supply"], limited=True) != []
+        assert plan_problems(["SCAN r VIRTUAL TABLE INDEX 2:D1B0D3B2"]) == []
+        assert plan_problems(["MATERIALIZE window_days", "SCAN 30 CONSTANT ROWS", "SCAN window_days"]) == []
+        assert plan_problems(["MATERIALIZE window_days", "SCAN supply"]) != []
+
+    def test_whole_index_walks_are_flagged(self, pool):
+        """Test that reading every row through an index counts as a full scan."""
+        assert plan_problems(["SCAN supply USING COVERING INDEX idx_supply_location_status"]) != []
+        query = PlannedQuery("by location", "SELECT location, COUNT(*) FROM supply GROUP BY location")
+        [(_, details, problems)] = check_query_plans(pool, [query])
+        assert details[0].startswith("SCAN supply USING COVERING INDEX")
+        assert any("full table scan" in p for p in problems)
+
+    def test_allowed_sorts_are_not_flagged(self):
+        """Test that a query may opt in to sorting through a temporary B-tree."""
+        assert plan_problems(["USE TEMP B-TREE FOR GROUP BY"]) != []
+        assert plan_problems(["USE TEMP B-TREE FOR GROUP BY"], allow_sort=True) == []
+
+    def test_command_line_passes_on_current_schema(self, capsys):
+        """Test that the diagnostic command exits cleanly."""
+        assert query_plan.main([]) == 0
+        assert "queries use indexes" in capsys.readouterr().out
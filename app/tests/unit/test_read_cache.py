@@ -0,0 +1,77 @@
+"""
+Unit tests for the version-keyed read cache.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.cache import ReadCache, table_version
+
+
+class TestReadCache:
+    """Test class for read cache behaviour."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small cache."""
+        return ReadCache(max_entries=2)
+
+    def test_unchanged_version_is_served_from_memory(self, cache):
+        """Test that a repeated read at the same version does not reload."""
+        loads = []
+        loader = lambda: loads.append(1) or len(loads)
+
+        assert cache.get_or_load("supply", "all", 1, loader) == 1
+        assert cache.get_or_load("supply", "all", 1, loader) == 1
+        assert cache.get_or_load("supply", "all", 2, loader) == 2
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 2)
+
+    def test_cache_is_bounded(self, cache):
+        """Test that the least recently used entry is evicted."""
+        cache.get_or_load("supply", "a", 1, lambda: "a")
+        cache.get_or_load("supply", "b", 1, lambda: "b")
+        cache.get_or_load("supply", "a", 1, lambda: "unused")
+        cache.get_or_load("supply", "c", 1, lambda: "c")
+
+        assert cache.get_or_load("supply", "a", 1, lambda: "reloaded") == "a"
+        assert cache.get_or_load("supply", "b", 1, lambda: "reloaded") == "reloaded"
+        assert cache.stats().evictions >= 1
+
+    def test_invalidate_drops_only_that_table(self, cache):
+        """Test that explicit invalidation is scoped to one table."""
+        cache.get_or_load("supply", "all", 1, lambda: "supply")
+        cache.get_or_load("personnel", "all", 1, lambda: "personnel")
+        cache.invalidate("supply")
+
+        assert cache.get_or_load("supply", "all", 1, lambda: "fresh") == "fresh"
+        assert cache.get_or_load("personnel", "all", 1, lambda: "fresh") == "personnel"
+
+    def test_peek_ignores_version(self, cache):
+        """Test that peek returns the stored value whatever its version, without counting."""
+        assert cache.peek("supply", "live") is None
+        cache.get_or_load("supply", "live", 1, lambda: "stale")
+        assert cache.peek("supply", "live") == "stale"
+        assert cache.stats().hits == 0
+
+    def test_table_version_changes_on_every_write(self, pool):
+        """Test that the version triggers fire on insert, update and delete."""
+        versions = []
+        with pool.connection() as conn:
+            versions.append(table_version(conn, "supply"))
+            for statement in (
+                "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, unit, status, priority) "
+                "VALUES ('S-1', 'Water', 'Food', 'Consumable', 10, 'Each', 'Available', 'Low')",
+                "UPDATE supply SET quantity = 5 WHERE supply_id = 'S-1'",
+                "DELETE FROM supply WHERE supply_id = 'S-1'",
+            ):
+                pool.transaction(lambda c: c.execute(statement))
+                versions.append(table_version(conn, "supply"))
+
+        assert versions == [0, 1, 2, 3]
@@ -0,0 +1,143 @@
+"""
+Unit tests for the readiness cube and its trigger-maintained totals.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.readiness import readiness_cube, readiness_grid
+from logistics.repository import LogisticsRepository, station_unit
+from logistics.schema import MIGRATIONS, migrate
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+# The cube recomputed from the base tables, to check the totals against
+EXPECTED_CUBE_QUERY = '''
+    SELECT unit_stations.unit, unit_stations.location, supply.supply_class, supply.status,
+           COUNT(*) AS lines, SUM(supply.quantity) AS quantity,
+           (SELECT COUNT(*) FROM personnel WHERE personnel.unit = unit_stations.unit) AS personnel,
+           (SELECT COUNT(*) FROM personnel
+            WHERE personnel.unit = unit_stations.unit AND personnel.status = 'Active') AS active_personnel
+    FROM unit_stations
+    JOIN supply ON supply.location = unit_stations.location
+    GROUP BY 1, 2, 3, 4
+'''
+
+
+def personnel_record(personnel_id, unit, status="Active"):
+    """Build a complete personnel record for ``upsert_record``."""
+    return {
+        "personnel_id": personnel_id, "first_name": "Ada", "last_name": "Lovelace",
+        "personnel_class": "Officer", "rank": "", "unit": unit,
+        "clearance_level": "Secret", "status": status, "notes": "",
+    }
+
+
+class TestReadinessCube:
+    """Test class for the unit x supply class x status cube."""
+
+    @pytest.fixture
+    def repository(self, repository):
+        """Seed the migrated database with two units, one stationed at a stocked location."""
+
+        def seed(conn):
+            upsert_record(conn, "personnel", personnel_record("P-1", "1st SFG"))
+            upsert_record(conn, "personnel", personnel_record("P-2", "1st SFG", status="Reserve"))
+            upsert_record(conn, "personnel", personnel_record("P-3", "2nd SFG"))
+            upsert_record(conn, "supply", supply_record("S-1", quantity=40))
+            upsert_record(conn, "supply", supply_record("S-2", quantity=0, status="Out of Stock"))
+            upsert_record(conn, "supply", supply_record("S-3", quantity=12, supply_class="Medical"))
+            upsert_record(conn, "supply", supply_record("S-4", quantity=99, location="FOB Bravo"))
+            station_unit(conn, "1st SFG", "Depot")
+
+        repository.transaction(seed)
+        return repository
+
+    def _save(self, repository, table, record):
+        return repository.transaction(lambda conn: upsert_record(conn, table, record))
+
+    def _cube(self, repository):
+        with repository.connection() as conn:
+            return readiness_cube(conn)
+
+    def _assert_matches_base_tables(self, repository):
+        with repository.connection() as conn:
+            expected = pd.read_sql_query(EXPECTED_CUBE_QUERY, conn)
+        expected = expected.sort_values(["unit", "supply_class", "status"], ignore_index=True)
+        pd.testing.assert_frame_equal(self._cube(repository), expected, check_dtype=False)
+
+    def test_cube_joins_stock_and_strength(self, repository):
+        """Test one row per unit, class and status with the unit's strength."""
+        cube = self._cube(repository)
+        assert cube[["unit", "supply_class", "status", "lines", "quantity"]].values.tolist() == [
+            ["1st SFG", "Fuel", "Available", 1, 40],
+            ["1st SFG", "Fuel", "Out of Stock", 1, 0],
+            ["1st SFG", "Medical", "Available", 1, 12],
+        ]
+        assert set(cube["personnel"]) == {2}
+        assert set(cube["active_personnel"]) == {1}
+        self._assert_matches_base_tables(repository)
+
+    def test_saves_move_totals_between_cells(self, repository):
+        """Test that status, class, location and quantity changes and deletes keep the cube exact."""
+        self._save(repository, "supply", supply_record("S-1", quantity=5, status="Low Stock"))
+        self._save(repository, "supply", supply_record("S-3", quantity=12, supply_class="Food"))
+        self._save(repository, "supply", supply_record("S-4", quantity=99))  # moved to the Depot
+        self._save(repository, "personnel", personnel_record("P-3", "1st SFG"))
+        repository.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-2'"))
+        self._assert_matches_base_tables(repository)
+
+        cube = self._cube(repository)
+        assert "Medical" not in set(cube["supply_class"])  # emptied cells are dropped
+        assert set(cube["personnel"]) == {3}
+
+    def test_restationing_needs_no_recount(self, repository):
+        """Test that moving a unit reads the new location's totals straight away."""
+        repository.transaction(lambda conn: station_unit(conn, "1st SFG", "FOB Bravo"))
+        repository.transaction(lambda conn: station_unit(conn, "2nd SFG", "Depot"))
+        cube = self._cube(repository)
+        first = cube[cube["unit"] == "1st SFG"]
+        assert first[["location", "lines", "quantity"]].values.tolist() == [["FOB Bravo", 1, 99]]
+        self._assert_matches_base_tables(repository)
+
+    def test_totals_are_backfilled(self, tmp_path):
+        """Test that rows saved before the totals existed are counted."""
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        totals = next(m.version for m in MIGRATIONS if "readiness cube" in m.description)
+        migrate(repository.pool, [m for m in MIGRATIONS if m.version < totals])
+        repository.transaction(lambda conn: (
+            upsert_record(conn, "personnel", personnel_record("P-1", "1st SFG")),
+            upsert_record(conn, "supply", supply_record("S-1", quantity=40)),
+            station_unit(conn, "1st SFG", "Depot"),
+        ))
+        repository.migrate()
+        cube = self._cube(repository)
+        repository.close()
+        assert cube[["unit", "lines", "quantity", "personnel"]].values.tolist() == [["1st SFG", 1, 40, 1]]
+
+    def test_readiness_grid(self, repository):
+        """Test the heatmap cells for each measure."""
+        cube = self._cube(repository)
+        ready = readiness_grid(cube).set_index("supply_class")
+        assert ready.loc["Fuel", "ready"] == 0.5
+        assert ready.loc["Medical", "ready"] == 1.0
+        assert ready.loc["Fuel", "location"] == "Depot"
+        assert ready.loc["Fuel", "personnel"] == 2
+
+        quantity = readiness_grid(cube, "quantity").set_index("supply_class")["quantity"]
+        assert quantity.to_dict() == {"Fuel": 40, "Medical": 12}
+        out = readiness_grid(cube, "lines", status="Out of Stock")
+        assert out[["supply_class", "lines"]].values.tolist() == [["Fuel", 1]]
+
+    def test_empty_cube_and_unknown_measure(self):
+        """Test the empty grid and the measure check."""
+        empty = readiness_grid(pd.DataFrame(columns=["unit", "supply_class"]))
+        assert empty.empty and "ready" in empty.columns
+        with pytest.raises(ValueError):
+            readiness_grid(pd.DataFrame(), "heads")
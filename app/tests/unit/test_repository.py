@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared logistics database and repository.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.pool import ConnectionPool
+from logistics.repository import DB_PATH_ENV, LogisticsRepository, database_path, station_unit
+from logistics.schema import (
+    MIGRATIONS, PERSONNEL_MIGRATIONS, SUPPLY_MIGRATIONS, Migration, chain, migrate,
+)
+
+INSERT_PERSONNEL = '''
+    INSERT INTO personnel (personnel_id, first_name, last_name, personnel_class, unit, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+INSERT_SUPPLY = '''
+    INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, unit,
+                        status, priority, location)
+    VALUES (?, ?, 'Class I', 'Rations', ?, 'cases', ?, ?, ?)
+'''
+
+
+class TestRepository:
+    """Test class for the consolidated database."""
+
+    def test_explicit_path_wins(self, tmp_path, monkeypatch):
+        """Test that an explicit path overrides the environment."""
+        monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "env.db"))
+        assert database_path(tmp_path / "explicit.db") == (tmp_path / "explicit.db").resolve()
+
+    def test_environment_path(self, tmp_path, monkeypatch):
+        """Test that $LOGISTICS_DB is used when no path is given."""
+        monkeypatch.setenv(DB_PATH_ENV, str(tmp_path / "env.db"))
+        assert database_path() == (tmp_path / "env.db").resolve()
+
+    def test_default_path_is_absolute(self, tmp_path, monkeypatch):
+        """Test that the default does not depend on the working directory."""
+        monkeypatch.delenv(DB_PATH_ENV, raising=False)
+        monkeypatch.chdir(tmp_path)
+        path = database_path()
+        assert path.is_absolute()
+        assert path.name == "logistics.db"
+        assert path.parent != tmp_path.resolve()
+
+    def test_chain_renumbers(self):
+        """Test that chained groups get one consecutive version sequence."""
+        first = (Migration(1, "a", ()), Migration(2, "b", ()))
+        second = (Migration(1, "c", ()),)
+        chained = chain(first, second)
+        assert [(m.version, m.description) for m in chained] == [(1, "a"), (2, "b"), (3, "c")]
+        assert [m.version for m in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
+
+    def test_legacy_databases_are_imported(self, tmp_path):
+        """Test that rows from personnel.db and supply.db beside the file are copied in."""
+        personnel = ConnectionPool(tmp_path / "personnel.db")
+        migrate(personnel, PERSONNEL_MIGRATIONS)
+        personnel.transaction(lambda conn: conn.execute(
+            INSERT_PERSONNEL, ("P-1", "Ada", "Lovelace", "Officer", "1st SFG", "Active")
+        ))
+        personnel.close()
+        supply = ConnectionPool(tmp_path / "supply.db")
+        migrate(supply, SUPPLY_MIGRATIONS)
+        supply.transaction(lambda conn: conn.execute(
+            INSERT_SUPPLY, ("S-1", "MRE", 40, "Available", "High", "FOB Alpha")
+        ))
+        supply.close()
+
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        repository.migrate()
+        with repository.connection() as conn:
+            assert conn.execute("SELECT personnel_id FROM personnel").fetchall() == [("P-1",)]
+            assert conn.execute("SELECT supply_id, quantity FROM supply").fetchall() == [("S-1", 40)]
+        # Applied once: a second migrate is a no-op
+        assert repository.migrate() == []
+        repository.close()
+
+    def test_unit_readiness_joins_station_stock(self, repository):
+        """Test that a stationed unit sees the stock at its location."""
+        def seed(conn):
+            conn.execute(INSERT_PERSONNEL, ("P-1", "Ada", "Lovelace", "Officer", "1st SFG", "Active"))
+            conn.execute(INSERT_PERSONNEL, ("P-2", "Alan", "Turing", "Enlisted", "1st SFG", "Leave"))
+            conn.execute(INSERT_PERSONNEL, ("P-3", "Grace", "Hopper", "Officer", "2nd SFG", "Active"))
+            conn.execute(INSERT_SUPPLY, ("S-1", "MRE", 40, "Available", "Critical", "FOB Alpha"))
+            conn.execute(INSERT_SUPPLY, ("S-2", "Water", 0, "Out of Stock", "High", "FOB Alpha"))
+            station_unit(conn, "1st SFG", "FOB Alpha")
+
+        repository.transaction(seed)
+        readiness = repository.unit_readiness().set_index("unit")
+
+        first = readiness.loc["1st SFG"]
+        assert first["location"] == "FOB Alpha"
+        assert (first["personnel"], first["active_personnel"]) == (2, 1)
+        assert (first["supply_lines"], first["available"], first["out_of_stock"], first["critical"]) == (2, 1, 1, 1)
+        second = readiness.loc["2nd SFG"]
+        assert pd.isna(second["location"])
+        assert second["supply_lines"] == 0
+
+    def test_restationing_moves_the_unit(self, repository):
+        """Test that stationing a unit again replaces its location."""
+        repository.transaction(lambda conn: station_unit(conn, "1st SFG", "FOB Alpha"))
+        repository.transaction(lambda conn: station_unit(conn, "1st SFG", "FOB Bravo"))
+        with repository.connection() as conn:
+            assert conn.execute("SELECT unit, location FROM unit_stations").fetchall() == [("1st SFG", "FOB Bravo")]
+
+    def test_units_and_locations(self, repository):
+        """Test the choices offered by the stationing form."""
+        repository.transaction(lambda conn: conn.execute(
+            INSERT_PERSONNEL, ("P-1", "Ada", "Lovelace", "Officer", "1st SFG", "Active")
+        ))
+        assert repository.units() == ["1st SFG"]
+        assert repository.location_names() == sorted(repository.location_names())
@@ -0,0 +1,75 @@
+"""
+Unit tests for the versioned schema migrations.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.pool import ConnectionPool
+from logistics.schema import (
+    PERSONNEL_MIGRATIONS,
+    SUPPLY_MIGRATIONS,
+    Migration,
+    add_column,
+    current_version,
+    migrate,
+)
+
+
+class TestSchemaMigrations:
+    """Test class for schema migration behaviour."""
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        """Create a pool over a temporary database file."""
+        pool = ConnectionPool(tmp_path / "test.db")
+        yield pool
+        pool.close()
+
+    def test_fresh_database_is_migrated_to_latest(self, pool):
+        """Test that all migrations apply to an empty database."""
+        applied = migrate(pool, SUPPLY_MIGRATIONS)
+
+        assert applied == [m.version for m in SUPPLY_MIGRATIONS]
+        with pool.connection() as conn:
+            assert current_version(conn) == SUPPLY_MIGRATIONS[-1].version
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(supply)")}
+        assert "idx_supply_updated_at" in indexes
+
+    def test_current_database_is_not_migrated_again(self, pool):
+        """Test that a second run applies nothing."""
+        migrate(pool, PERSONNEL_MIGRATIONS)
+        assert migrate(pool, PERSONNEL_MIGRATIONS) == []
+
+    def test_legacy_database_is_upgraded_in_place(self, pool):
+        """Test that a pre-migration database keeps its rows and gains the metadata table."""
+        create_personnel = PERSONNEL_MIGRATIONS[0].steps[0]
+        pool.transaction(lambda conn: conn.execute(create_personnel))
+        pool.transaction(lambda conn: conn.execute(
+            "INSERT INTO personnel (personnel_id, first_name, last_name, personnel_class) "
+            "VALUES ('P-1', 'Ada', 'Lovelace', 'Civilian')"
+        ))
+
+        migrate(pool, PERSONNEL_MIGRATIONS)
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM personnel").fetchone()[0] == 1
+            assert current_version(conn) == PERSONNEL_MIGRATIONS[-1].version
+
+    def test_forward_migration_adds_column(self, pool):
+        """Test that a later migration can add a column exactly once."""
+        migrations = SUPPLY_MIGRATIONS + (
+            Migration(100, "Add reorder point", (add_column("supply", "reorder_point", "INTEGER"),)),
+        )
+        migrate(pool, migrations)
+
+        with pool.connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(supply)")]
+            add_column("supply", "reorder_point", "INTEGER")(conn)
+        assert columns.count("reorder_point") == 1
+        assert migrate(pool, migrations) == []
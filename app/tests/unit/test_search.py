@@ -0,0 +1,116 @@
+"""
+Unit tests for full-text search over personnel and supply records.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.repository import LogisticsRepository
+from logistics.schema import MIGRATIONS, migrate
+from logistics.search import MAX_TERMS, search, search_terms
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+
+def personnel_record(personnel_id, first_name, last_name, unit="1st SFG", notes=""):
+    """Build a complete personnel record for ``upsert_record``."""
+    return {
+        "personnel_id": personnel_id, "first_name": first_name, "last_name": last_name,
+        "personnel_class": "Officer", "rank": "", "unit": unit,
+        "clearance_level": "Secret", "status": "Active", "notes": notes,
+    }
+
+
+class TestSearch:
+    """Test class for the full-text indexes and ranked, paginated search."""
+
+    def _save(self, repository, table, *records):
+        repository.transaction(lambda conn: [upsert_record(conn, table, record) for record in records])
+
+    def _search(self, repository, table, text, **options):
+        with repository.connection() as conn:
+            return search(conn, table, text, **options)
+
+    def _ids(self, repository, table, text, **options):
+        rows = self._search(repository, table, text, **options).rows
+        return list(rows[f"{table}_id"]) if len(rows) else []
+
+    def test_last_word_matches_as_a_prefix(self, repository):
+        """Test that the word being typed matches any word it starts, earlier words whole."""
+        self._save(repository, "supply",
+                   supply_record("S-1", supply_name="Diesel fuel", location="Depot 042"),
+                   supply_record("S-2", supply_name="Water", location="Depot 117"))
+        assert self._ids(repository, "supply", "depot 04") == ["S-1"]
+        assert self._ids(repository, "supply", "Dies") == ["S-1"]
+        assert self._ids(repository, "supply", "dep 042") == []
+        assert sorted(self._ids(repository, "supply", "DEPOT")) == ["S-1", "S-2"]
+
+    def test_names_outrank_notes(self, repository):
+        """Test that hits are ordered by weighted relevance, not recency."""
+        self._save(repository, "supply",
+                   supply_record("S-1", supply_name="Water", notes="Stored beside the generator"),
+                   supply_record("S-2", supply_name="Generator parts"))
+        page = self._search(repository, "supply", "generator")
+        assert list(page.rows["supply_id"]) == ["S-2", "S-1"]
+        assert page.rows["score"].is_monotonic_decreasing
+
+    def test_index_follows_saves_and_deletes(self, repository):
+        """Test that the triggers re-index changed text and drop deleted rows."""
+        self._save(repository, "supply", supply_record("S-1", supply_name="Water"))
+        self._save(repository, "supply", supply_record("S-1", supply_name="Rations", supplier="Globex"))
+        assert self._ids(repository, "supply", "water") == []
+        assert self._ids(repository, "supply", "globex rations") == ["S-1"]
+
+        repository.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-1'"))
+        assert self._ids(repository, "supply", "rations") == []
+
+    def test_personnel_fields(self, repository):
+        """Test that personnel are found by name, unit and notes."""
+        self._save(repository, "personnel",
+                   personnel_record("P-1", "Ada", "Lovelace", unit="3rd SFG"),
+                   personnel_record("P-2", "Alan", "Turing", notes="Cipher school instructor"))
+        assert self._ids(repository, "personnel", "love") == ["P-1"]
+        assert self._ids(repository, "personnel", "3rd") == ["P-1"]
+        assert self._ids(repository, "personnel", "cipher") == ["P-2"]
+        assert self._ids(repository, "personnel", "ada turing") == []
+
+    def test_pages_cover_every_hit_once(self, repository):
+        """Test that paging through equally ranked hits returns each once, newest first."""
+        self._save(repository, "supply", *[supply_record(f"S-{i}", supply_name="Water") for i in range(5)])
+        seen, page_number = [], 0
+        while page_number is not None:
+            page = self._search(repository, "supply", "water", page=page_number, page_size=2)
+            seen.extend(page.rows["supply_id"])
+            page_number = page.next_cursor
+        assert seen == ["S-4", "S-3", "S-2", "S-1", "S-0"]
+
+    def test_only_the_newest_candidates_are_ranked(self, repository):
+        """Test that a broad search ranks the most recently added matches."""
+        self._save(repository, "supply", *[supply_record(f"S-{i}", supply_name="Water") for i in range(5)])
+        page = self._search(repository, "supply", "water", candidates=3)
+        assert list(page.rows["supply_id"]) == ["S-4", "S-3", "S-2"]
+        assert not page.has_more
+
+    def test_existing_rows_are_indexed(self, tmp_path):
+        """Test that rows saved before the index existed are found."""
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        search_version = next(m.version for m in MIGRATIONS if "full-text search" in m.description)
+        migrate(repository.pool, [m for m in MIGRATIONS if m.version < search_version])
+        self._save(repository, "supply", supply_record("S-1", supply_name="Water"))
+        repository.migrate()
+        assert self._ids(repository, "supply", "wat") == ["S-1"]
+        repository.close()
+
+    def test_search_terms(self, repository):
+        """Test that only letters and digits reach the index."""
+        assert search_terms('S-0042 "depot" AND_or*') == ["s", "0042", "depot", "and", "or"]
+        assert len(search_terms("w " * 20)) == MAX_TERMS
+        page = self._search(repository, "supply", " -*- ")
+        assert page.rows.empty and not page.has_more
+        with pytest.raises(ValueError):
+            self._search(repository, "locations", "depot")
@@ -0,0 +1,122 @@
+"""
+Unit tests for the columnar table snapshots.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.changes import load_frame, refresh_frame
+from logistics.schema import current_version
+from logistics.snapshot import SnapshotStore, database_id
+from logistics.upsert import upsert_record
+from tests.unit.conftest import supply_record
+
+
+class TestSnapshotStore:
+    """Test class for saving and loading table snapshots."""
+
+    @pytest.fixture
+    def repository(self, repository):
+        """Seed the migrated logistics database with two supply rows."""
+        self._save(repository, supply_record("S-1", updated_at="2024-01-01T00:00:00"))
+        self._save(repository, supply_record("S-2", status="Low Stock", updated_at="2024-01-02T00:00:00"))
+        return repository
+
+    @pytest.fixture
+    def store(self, repository):
+        """Create a snapshot store for the repository's database."""
+        return self._store(repository)
+
+    def _store(self, repository, **kwargs):
+        with repository.connection() as conn:
+            return SnapshotStore(
+                repository.snapshot_dir, database_id(conn), current_version(conn), **kwargs
+            )
+
+    def _save(self, repository, record):
+        return repository.transaction(lambda conn: upsert_record(conn, "supply", record))
+
+    def _load(self, repository):
+        with repository.connection() as conn:
+            return load_frame(conn, "supply")
+
+    def test_database_id_is_stable(self, repository):
+        """Test that every connection sees the id the database was created with."""
+        with repository.connection() as conn:
+            first = database_id(conn)
+        repository.migrate()
+        with repository.connection() as conn:
+            assert database_id(conn) == first
+        assert len(first) == 32
+
+    def test_round_trip(self, repository, store):
+        """Test that a loaded snapshot matches the frame it was written from."""
+        live = self._load(repository)
+        store.save(live)
+
+        loaded = store.load("supply")
+        assert loaded.seq == live.seq
+        assert isinstance(loaded.frame["status"].dtype, pd.CategoricalDtype)
+        assert loaded.frame.astype(object).equals(live.frame.astype(object))
+
+    def test_missing_snapshot(self, store):
+        """Test that a table without a snapshot loads as None."""
+        assert store.load("supply") is None
+
+    def test_other_database_is_ignored(self, repository, store, tmp_path):
+        """Test that snapshots from a different database or schema version are not used."""
+        store.save(self._load(repository))
+        other = SnapshotStore(store.directory, "another-database", store.schema_version)
+        assert other.load("supply") is None
+        older = SnapshotStore(store.directory, store.database_id, store.schema_version - 1)
+        assert older.load("supply") is None
+
+    def test_unreadable_snapshot_is_ignored(self, store):
+        """Test that a corrupt file is treated as no snapshot."""
+        store.directory.mkdir(parents=True)
+        store.path("supply").write_bytes(b"not arrow")
+        assert store.load("supply") is None
+
+    def test_snapshot_catches_up_from_change_log(self, repository, store):
+        """Test that a stale snapshot is brought up to date by the change log."""
+        store.save(self._load(repository))
+        self._save(repository, supply_record("S-1", quantity=9, updated_at="2024-01-03T00:00:00"))
+        self._save(repository, supply_record("S-3", updated_at="2024-01-04T00:00:00"))
+
+        with repository.connection() as conn:
+            refreshed = refresh_frame(conn, store.load("supply"))
+        expected = self._load(repository)
+        assert refreshed.seq == expected.seq
+        assert list(refreshed.frame["supply_id"]) == ["S-3", "S-1", "S-2"]
+        assert refreshed.frame.astype(object).equals(expected.frame.astype(object))
+
+    def test_background_saves_are_throttled(self, repository):
+        """Test that a table is snapshotted at most once per interval, and only when it changed."""
+        store = self._store(repository, interval=3600)
+        live = self._load(repository)
+        assert store.save_in_background(live)
+        store.flush()
+        assert store.load("supply").seq == live.seq
+        # Unchanged, then changed but within the interval
+        assert not store.save_in_background(live)
+        self._save(repository, supply_record("S-3"))
+        assert not store.save_in_background(self._load(repository))
+
+        store.interval = 0
+        assert store.save_in_background(self._load(repository))
+        store.flush()
+        assert len(store.load("supply").frame) == 3
+
+    def test_save_replaces_atomically(self, repository, store):
+        """Test that saving leaves only the finished snapshot in the directory."""
+        store.save(self._load(repository))
+        self._save(repository, supply_record("S-3"))
+        store.save(self._load(repository))
+        assert [path.name for path in store.directory.iterdir()] == ["supply.arrow"]
+        assert len(store.load("supply").frame) == 3
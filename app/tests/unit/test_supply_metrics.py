@@ -0,0 +1,69 @@
+"""
+Unit tests for the trigger-maintained supply metric counts.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.metrics import SupplyMetrics, count_by, supply_metrics
+from logistics.repository import LogisticsRepository
+from logistics.schema import MIGRATIONS, migrate
+
+INSERT_SUPPLY = (
+    "INSERT OR REPLACE INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, "
+    "unit, status, priority) VALUES (?, 'Item', 'Fuel', 'Consumable', 1, 'Each', ?, ?)"
+)
+
+
+class TestSupplyMetrics:
+    """Test class for supply metric tiles."""
+
+    def _metrics(self, pool):
+        with pool.connection() as conn:
+            return supply_metrics(conn)
+
+    def test_empty_inventory(self, pool):
+        """Test that an empty table reports zero everywhere."""
+        assert self._metrics(pool) == SupplyMetrics()
+
+    def test_counts_follow_inserts_updates_and_deletes(self, pool):
+        """Test that the counters track every kind of write."""
+        pool.transaction(lambda conn: conn.executemany(INSERT_SUPPLY, [
+            ("S-1", "Low Stock", "Critical"),
+            ("S-2", "Out of Stock", "High"),
+            ("S-3", "Available", "Critical"),
+        ]))
+        assert self._metrics(pool) == SupplyMetrics(3, 1, 1, 2)
+
+        pool.transaction(lambda conn: conn.execute(INSERT_SUPPLY, ("S-1", "Available", "Low")))
+        assert self._metrics(pool) == SupplyMetrics(3, 0, 1, 1)
+
+        pool.transaction(lambda conn: conn.execute(
+            "UPDATE supply SET status = 'Low Stock' WHERE supply_id = 'S-3'"
+        ))
+        assert self._metrics(pool) == SupplyMetrics(3, 1, 1, 1)
+
+        pool.transaction(lambda conn: conn.execute("DELETE FROM supply WHERE supply_id = 'S-2'"))
+        assert self._metrics(pool) == SupplyMetrics(2, 1, 0, 1)
+
+    def test_existing_rows_are_backfilled(self, tmp_path):
+        """Test that the counter migration counts rows written before it."""
+        repository = LogisticsRepository(tmp_path / "logistics.db")
+        counts = next(m.version for m in MIGRATIONS if "status and priority counts" in m.description)
+        migrate(repository.pool, [m for m in MIGRATIONS if m.version < counts])
+        repository.transaction(lambda conn: conn.execute(INSERT_SUPPLY, ("S-1", "Low Stock", "Critical")))
+        repository.migrate()
+
+        assert self._metrics(repository.pool) == SupplyMetrics(1, 1, 0, 1)
+        repository.close()
+
+    def test_count_by_single_pass(self):
+        """Test that in-memory frames are summarized by value."""
+        df = pd.DataFrame({"status": ["Available", "Critical", "Available"]})
+        assert count_by(df, "status") == {"Available": 2, "Critical": 1}
+        assert count_by(pd.DataFrame(), "status") == {}
@@ -0,0 +1,59 @@
+"""
+Unit tests for identity-preserving upserts.
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.cache import table_version
+from logistics.upsert import INSERTED, UNCHANGED, UPDATED, upsert_many, upsert_record
+from tests.unit.conftest import supply_record
+
+
+class TestUpsert:
+    """Test class for upsert behaviour."""
+
+    def _save(self, pool, record):
+        return pool.transaction(lambda conn: upsert_record(conn, "supply", record))
+
+    def _row(self, pool):
+        with pool.connection() as conn:
+            return conn.execute(
+                "SELECT id, created_at, updated_at, quantity FROM supply WHERE supply_id = 'S-1'"
+            ).fetchone()
+
+    def test_insert_then_update_preserves_identity(self, pool):
+        """Test that an update keeps id and created_at and moves updated_at."""
+        pool.transaction(lambda conn: conn.execute(
+            "INSERT INTO supply (supply_id, supply_name, supply_class, supply_type, quantity, unit, "
+            "status, priority) VALUES ('S-0', 'Other', 'Fuel', 'Consumable', 1, 'Each', 'Available', 'Low')"
+        ))
+        assert self._save(pool, supply_record()) == INSERTED
+        row_id, created_at, _, _ = self._row(pool)
+
+        assert self._save(pool, supply_record(quantity=4, updated_at="2024-01-02T00:00:00")) == UPDATED
+        assert self._row(pool) == (row_id, created_at, "2024-01-02T00:00:00", 4)
+
+    def test_identical_submission_writes_nothing(self, pool):
+        """Test that a no-op resubmission leaves the row and table version alone."""
+        self._save(pool, supply_record())
+        with pool.connection() as conn:
+            version = table_version(conn, "supply")
+
+        assert self._save(pool, supply_record(updated_at="2024-02-01T00:00:00")) == UNCHANGED
+        with pool.connection() as conn:
+            assert table_version(conn, "supply") == version
+        assert self._row(pool)[2] == "2024-01-01T00:00:00"
+
+    def test_batch_upsert_counts_only_written_rows(self, pool):
+        """Test that executemany skips unchanged rows."""
+        records = [supply_record(supply_id=f"S-{i}") for i in range(3)]
+        assert pool.transaction(lambda conn: upsert_many(conn, "supply", records)) == 3
+
+        records[1]["quantity"] = 99
+        assert pool.transaction(lambda conn: upsert_many(conn, "supply", records)) == 1
+        with pool.connection() as conn:
+            assert conn.execute("SELECT MAX(id) FROM supply").fetchone()[0] == 3
@@ -0,0 +1,113 @@
+"""
+Unit tests for the group-commit write queue.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logistics.pool import ConnectionPool
+from logistics.write_queue import WriteQueue
+
+INSERT_ITEM = "INSERT INTO items (name) VALUES (?)"
+
+
+class TestWriteQueue:
+    """Test class for queued, batched writes."""
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        """Create a database with a single table."""
+        pool = ConnectionPool(tmp_path / "queue.db")
+        pool.transaction(lambda conn: conn.execute(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"
+        ))
+        yield pool
+        pool.close()
+
+    def _names(self, pool):
+        with pool.connection() as conn:
+            return sorted(row[0] for row in conn.execute("SELECT name FROM items"))
+
+    def test_future_resolves_to_result(self, pool):
+        """Test that a submitted write commits and returns its result."""
+        writes = WriteQueue(pool)
+        future = writes.submit(lambda conn: conn.execute(INSERT_ITEM, ("a",)).lastrowid)
+        assert future.result(timeout=5) == 1
+        writes.close()
+        assert self._names(pool) == ["a"]
+
+    def test_queued_writes_share_a_commit(self, pool):
+        """Test that writes queued while the writer is busy commit as one batch."""
+        writes = WriteQueue(pool)
+        release = threading.Event()
+        blocker = writes.submit(lambda conn: release.wait(5))
+        futures = [writes.submit(lambda conn, i=i: conn.execute(INSERT_ITEM, (f"n{i}",))) for i in range(20)]
+        release.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+        stats = writes.stats()
+        writes.close()
+
+        assert len(self._names(pool)) == 20
+        assert stats.committed == 21
+        assert stats.batches < 21
+        assert stats.max_batch > 1
+        assert stats.depth == 0
+
+    def test_failing_write_is_rolled_back_alone(self, pool):
+        """Test that one failing write does not undo the rest of its batch."""
+        writes = WriteQueue(pool)
+        release = threading.Event()
+        writes.submit(lambda conn: release.wait(5))
+        good = writes.submit(lambda conn: conn.execute(INSERT_ITEM, ("good",)))
+
+        def fails(conn):
+            conn.execute(INSERT_ITEM, ("partial",))
+            raise ValueError("bad record")
+
+        bad = writes.submit(fails)
+        release.set()
+        good.result(timeout=5)
+        with pytest.raises(ValueError, match="bad record"):
+            bad.result(timeout=5)
+        stats = writes.stats()
+        writes.close()
+
+        assert self._names(pool) == ["good"]
+        assert stats.failed == 1
+
+    def test_max_batch(self, pool):
+        """Test that batches never exceed max_batch writes."""
+        writes = WriteQueue(pool, max_batch=3)
+        release = threading.Event()
+        writes.submit(lambda conn: release.wait(5))
+        futures = [writes.submit(lambda conn, i=i: conn.execute(INSERT_ITEM, (f"n{i}",))) for i in range(10)]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        stats = writes.stats()
+        writes.close()
+        assert stats.max_batch <= 3
+
+    def test_metrics_hook(self, pool):
+        """Test that batch sizes and commit times are reported."""
+        events = []
+        writes = WriteQueue(pool, metrics_hook=lambda event, value: events.append((event, value)))
+        writes.submit(lambda conn: conn.execute(INSERT_ITEM, ("a",))).result(timeout=5)
+        writes.close()
+        assert ("batch", 1) in events
+        assert any(event == "commit" and value >= 0 for event, value in events)
+
+    def test_closed_queue_rejects_writes(self, pool):
+        """Test that a closed queue refuses new writes."""
+        writes = WriteQueue(pool)
+        writes.close()
+        with pytest.raises(RuntimeError):
+            writes.submit(lambda conn: None)